@@ -0,0 +1,54 @@
+"""
+Применение миграций схемы БД
+
+    python -m app.cmd.migrate           # применить неприменённые миграции
+    python -m app.cmd.migrate --status  # показать неприменённые миграции
+"""
+
+import argparse
+import os
+import sys
+
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Миграции схемы PostgreSQL")
+    parser.add_argument("--status", action="store_true", help="только показать неприменённые")
+    args = parser.parse_args()
+
+    db_name = os.getenv("DB_NAME")
+    db_user = os.getenv("DB_USER")
+    db_password = os.getenv("DB_PASSWORD")
+
+    if not all([db_name, db_user, db_password]):
+        raise ValueError(
+            "Необходимые переменные окружения для БД не установлены: DB_NAME, DB_USER, DB_PASSWORD"
+        )
+
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "postgres"),
+        int(os.getenv("DB_PORT", "5432")),
+        db_name,
+        db_user,
+        db_password,
+        pool_size=1,
+        max_overflow=1,
+    )
+    migrator = Migrator(db_manager)
+
+    if args.status:
+        for migration in migrator.pending():
+            print(f"pending {migration.version} {migration.name}")
+        return 0
+
+    for migration in migrator.apply():
+        print(f"applied {migration.version} {migration.name}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
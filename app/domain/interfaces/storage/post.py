@@ -1,7 +1,10 @@
 import abc
 import uuid
+from datetime import datetime as Datetime
+from typing import AsyncIterator, Iterator, Optional
 
-from app.domain.models.post import Post
+from app.domain.models.cursor import PostCursor, SearchCursor
+from app.domain.models.post import Post, PostPage, PostVersion
 from app.domain.models.post_tag import PostTag
 
 
@@ -10,26 +13,178 @@ class PostRepository(abc.ABC):
     def create_post(self, post: Post) -> None:
         pass
 
+    @abc.abstractmethod
+    def bulk_create_posts(self, posts: list[Post]) -> None:
+        pass
+
     @abc.abstractmethod
     def get_post_by_id(self, id_: uuid.UUID) -> Post:
         pass
 
+    @abc.abstractmethod
+    def get_post_version(self, id_: uuid.UUID) -> PostVersion:
+        pass
+
     @abc.abstractmethod
     def update_post(self, post: Post) -> None:
         pass
 
+    @abc.abstractmethod
+    def update_post_fields(
+        self, id_: uuid.UUID, fields: dict, expected_updated_at: Optional[Datetime] = None
+    ) -> Post:
+        pass
+
+    @abc.abstractmethod
+    def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[list[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> list[uuid.UUID]:
+        pass
+
     @abc.abstractmethod
     def list_posts_by_filters(self, *args, **kwargs) -> list[Post]:
         pass
 
+    @abc.abstractmethod
+    def list_posts_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> PostPage:
+        pass
+
+    @abc.abstractmethod
+    def list_post_versions_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> list[PostVersion]:
+        pass
+
+    @abc.abstractmethod
+    def search_posts(
+        self, query: str, limit: int, after: Optional[SearchCursor] = None, **filters
+    ) -> PostPage:
+        pass
+
+    @abc.abstractmethod
+    def export_posts(
+        self, after: Optional[PostCursor] = None, batch_size: int = 1000, **filters
+    ) -> Iterator[list[Post]]:
+        pass
+
     @abc.abstractmethod
     def delete_post_by_id(self, id_: uuid.UUID) -> None:
         pass
 
+    def add_tags(self, id_: uuid.UUID, tags: list[PostTag], session=None) -> None:
+        """Привязать теги к посту по объектам тегов, без изменения updated_at"""
+        return self.attach_tags(id_, [tag.id_ for tag in tags], session=session)
+
+    def remove_tags(self, id_: uuid.UUID, tags: list[PostTag], session=None) -> None:
+        """Отвязать теги от поста по объектам тегов, без изменения updated_at"""
+        return self.detach_tags(id_, [tag.id_ for tag in tags], session=session)
+
+    @abc.abstractmethod
+    def attach_tags(
+        self, id_: uuid.UUID, tag_ids: list[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def detach_tags(
+        self, id_: uuid.UUID, tag_ids: list[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
+        pass
+
+
+class AsyncPostRepository(abc.ABC):
+    @abc.abstractmethod
+    async def create_post(self, post: Post) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def bulk_create_posts(self, posts: list[Post]) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def get_post_by_id(self, id_: uuid.UUID) -> Post:
+        pass
+
+    @abc.abstractmethod
+    async def get_post_version(self, id_: uuid.UUID) -> PostVersion:
+        pass
+
+    @abc.abstractmethod
+    async def update_post(self, post: Post) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def update_post_fields(
+        self, id_: uuid.UUID, fields: dict, expected_updated_at: Optional[Datetime] = None
+    ) -> Post:
+        pass
+
+    @abc.abstractmethod
+    async def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[list[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> list[uuid.UUID]:
+        pass
+
+    @abc.abstractmethod
+    async def list_posts_by_filters(self, *args, **kwargs) -> list[Post]:
+        pass
+
+    @abc.abstractmethod
+    async def list_posts_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> PostPage:
+        pass
+
+    @abc.abstractmethod
+    async def list_post_versions_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> list[PostVersion]:
+        pass
+
+    @abc.abstractmethod
+    async def search_posts(
+        self, query: str, limit: int, after: Optional[SearchCursor] = None, **filters
+    ) -> PostPage:
+        pass
+
+    @abc.abstractmethod
+    def export_posts(
+        self, after: Optional[PostCursor] = None, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[list[Post]]:
+        pass
+
+    @abc.abstractmethod
+    async def delete_post_by_id(self, id_: uuid.UUID) -> None:
+        pass
+
+    async def add_tags(self, id_: uuid.UUID, tags: list[PostTag]) -> None:
+        """Привязать теги к посту по объектам тегов, без изменения updated_at"""
+        return await self.attach_tags(id_, [tag.id_ for tag in tags])
+
+    async def remove_tags(self, id_: uuid.UUID, tags: list[PostTag]) -> None:
+        """Отвязать теги от поста по объектам тегов, без изменения updated_at"""
+        return await self.detach_tags(id_, [tag.id_ for tag in tags])
+
     @abc.abstractmethod
-    def add_tags(self, id_: uuid.UUID, tags: list[PostTag]) -> None:
+    async def attach_tags(
+        self, id_: uuid.UUID, tag_ids: list[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
         pass
 
     @abc.abstractmethod
-    def remove_tags(self, id_: uuid.UUID, tags: list[PostTag]) -> None:
+    async def detach_tags(
+        self, id_: uuid.UUID, tag_ids: list[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
         pass
@@ -1,7 +1,9 @@
 import abc
 import uuid
+from datetime import datetime as Datetime
+from typing import Optional
 
-from app.domain.models.post_tag import PostTag
+from app.domain.models.post_tag import PostTag, PostTagChange
 
 
 class PostTagRepository(abc.ABC):
@@ -14,7 +16,10 @@ class PostTagRepository(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def update_post_tag(self, post_tag: PostTag) -> None:
+    def update_post_tag(
+        self, post_tag: PostTag, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Переименовать тег; вернуть прежнее имя и ID постов с этим тегом"""
         pass
 
     @abc.abstractmethod
@@ -22,5 +27,44 @@ class PostTagRepository(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def delete_post_tag_by_id(self, id_: uuid.UUID) -> None:
+    def delete_post_tag_by_id(
+        self, id_: uuid.UUID, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Удалить тег; вернуть его имя и ID постов, от которых он отвязан"""
+        pass
+
+    @abc.abstractmethod
+    def get_or_create_post_tags(self, names: list[str]) -> list[PostTag]:
+        pass
+
+
+class AsyncPostTagRepository(abc.ABC):
+    @abc.abstractmethod
+    async def create_post_tag(self, post_tag: PostTag) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def get_post_tag_by_id(self, id_: uuid.UUID) -> PostTag:
+        pass
+
+    @abc.abstractmethod
+    async def update_post_tag(
+        self, post_tag: PostTag, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Переименовать тег; вернуть прежнее имя и ID постов с этим тегом"""
+        pass
+
+    @abc.abstractmethod
+    async def list_post_tags_by_filters(self, *args, **kwargs) -> list[PostTag]:
+        pass
+
+    @abc.abstractmethod
+    async def delete_post_tag_by_id(
+        self, id_: uuid.UUID, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Удалить тег; вернуть его имя и ID постов, от которых он отвязан"""
+        pass
+
+    @abc.abstractmethod
+    async def get_or_create_post_tags(self, names: list[str]) -> list[PostTag]:
         pass
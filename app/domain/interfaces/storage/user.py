@@ -8,3 +8,9 @@ class UserRepository(abc.ABC):
     @abc.abstractmethod
     def get_user_by_id(self, id_: uuid.UUID) -> User:
         pass
+
+
+class AsyncUserRepository(abc.ABC):
+    @abc.abstractmethod
+    async def get_user_by_id(self, id_: uuid.UUID) -> User:
+        pass
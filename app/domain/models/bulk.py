@@ -0,0 +1,19 @@
+import uuid
+from typing import Optional
+
+
+class BulkItemResult:
+    """Результат обработки одного элемента массовой операции"""
+
+    index: int
+    id_: Optional[uuid.UUID]
+    error: Optional[str]
+
+    def __init__(self, index: int, id_: Optional[uuid.UUID] = None, error: Optional[str] = None):
+        self.index = index
+        self.id_ = id_
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
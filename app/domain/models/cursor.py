@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime as Datetime
+
+from app.domain.models.errors.domain import ValidationError
+
+
+class PostCursor:
+    """Позиция в ленте постов, упорядоченной по (created_at, id)"""
+
+    created_at: Datetime
+    id_: uuid.UUID
+
+    def __init__(self, created_at: Datetime, id_: uuid.UUID):
+        self.created_at = created_at
+        self.id_ = id_
+
+    def encode(self) -> str:
+        """Непрозрачное представление курсора для клиентов"""
+        raw = json.dumps([self.created_at.isoformat(), str(self.id_)]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "PostCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            created_at, id_ = json.loads(raw)
+            return cls(created_at=Datetime.fromisoformat(created_at), id_=uuid.UUID(id_))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValidationError("Invalid cursor")
+
+
+class SearchCursor:
+    """Позиция в результатах поиска, упорядоченных по (rank, id)"""
+
+    rank: float
+    id_: uuid.UUID
+
+    def __init__(self, rank: float, id_: uuid.UUID):
+        self.rank = rank
+        self.id_ = id_
+
+    def encode(self) -> str:
+        """Непрозрачное представление курсора для клиентов"""
+        raw = json.dumps([self.rank, str(self.id_)]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "SearchCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            rank, id_ = json.loads(raw)
+            return cls(rank=float(rank), id_=uuid.UUID(id_))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValidationError("Invalid cursor")
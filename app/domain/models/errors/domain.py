@@ -1,3 +1,8 @@
+def _type_name(instance_type) -> str:
+    """Имя типа без пути модуля: сообщения ошибок уходят клиентам API"""
+    return getattr(instance_type, "__name__", str(instance_type))
+
+
 class DomainError(Exception):
     message: str
 
@@ -31,6 +36,21 @@ class NotFoundError(DomainError):
             self.message = self.NOT_FOUND_ERROR_TEMPLATE.format(instance_type=instance_type)
 
 
+class ConflictError(DomainError):
+    CONFLICT_ERROR_TEMPLATE: str = "{instance_type} was modified concurrently"
+    UNSPECIFIED_MESSAGE: str = "unspecified conflict error"
+
+    instance_type: object
+
+    def __init__(self, instance_type=None):
+        if instance_type is None:
+            self.message = self.UNSPECIFIED_MESSAGE
+        else:
+            self.message = self.CONFLICT_ERROR_TEMPLATE.format(
+                instance_type=_type_name(instance_type)
+            )
+
+
 class AlreadyExistsError(DomainError):
     ALREADY_EXISTS_ERROR_TEMPLATE: str = "{instance_type} already exists"
     UNSPECIFIED_MESSAGE: str = "unspecified already_exists error"
@@ -43,7 +63,9 @@ class AlreadyExistsError(DomainError):
         if instance_type is None:
             self.message = self.UNSPECIFIED_MESSAGE
         else:
-            self.message = self.ALREADY_EXISTS_ERROR_TEMPLATE.format(instance_type=instance_type)
+            self.message = self.ALREADY_EXISTS_ERROR_TEMPLATE.format(
+                instance_type=_type_name(instance_type)
+            )
 
         self.instance_type = instance_type
         self.field_name = field_name
@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime as Datetime
 
+from app.domain.models.cursor import PostCursor, SearchCursor
 from app.domain.models.post_tag import PostTag
 
 POST_STATUS_DRAFT = "draft"
@@ -17,6 +18,9 @@ _allowed_statuses = [
 
 
 class Post:
+    # Без __dict__: списки постов держат в памяти сотни тысяч объектов
+    __slots__ = ("id_", "title", "body", "status", "created_at", "updated_at", "tags")
+
     id_: uuid.UUID
     title: str
     body: str
@@ -42,3 +46,29 @@ class Post:
         self.created_at = created_at
         self.updated_at = updated_at
         self.tags = tags
+
+
+class PostVersion:
+    """Версия поста для условных запросов: то, от чего зависят ETag и Cache-Control"""
+
+    __slots__ = ("id_", "status", "updated_at")
+
+    id_: uuid.UUID
+    status: str
+    updated_at: Datetime
+
+    def __init__(self, id_: uuid.UUID, status: str, updated_at: Datetime):
+        self.id_ = id_
+        self.status = status
+        self.updated_at = updated_at
+
+
+class PostPage:
+    """Страница ленты постов и курсор для получения следующей"""
+
+    items: list[Post]
+    next_cursor: PostCursor | SearchCursor | None
+
+    def __init__(self, items: list[Post], next_cursor: PostCursor | SearchCursor | None = None):
+        self.items = items
+        self.next_cursor = next_cursor
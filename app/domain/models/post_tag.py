@@ -1,10 +1,25 @@
 import uuid
+from typing import List
 
 
 class PostTag:
+    # Один объект тега может быть общим для всех постов выборки, поэтому его не изменяют
+    __slots__ = ("id_", "name")
+
     id_: uuid.UUID
     name: str
 
     def __init__(self, id_: uuid.UUID, name: str) -> None:
         self.id_ = id_
         self.name = name
+
+
+class PostTagChange:
+    """Результат переименования или удаления тега: имя до изменения и посты с этим тегом"""
+
+    old_name: str
+    post_ids: List[uuid.UUID]
+
+    def __init__(self, old_name: str, post_ids: List[uuid.UUID]) -> None:
+        self.old_name = old_name
+        self.post_ids = post_ids
@@ -2,6 +2,8 @@ import uuid
 
 
 class User:
+    __slots__ = ("id_", "username")
+
     id_: uuid.UUID
     username: str
 
@@ -1,29 +1,56 @@
 import logging
 import uuid
 from datetime import datetime as DateTime
+from typing import AsyncIterator, Optional
 
-from app.domain.interfaces.storage.post import PostRepository
-from app.domain.interfaces.storage.post_tag import PostTagRepository
+from app.domain.interfaces.storage.post import AsyncPostRepository
+from app.domain.interfaces.storage.post_tag import AsyncPostTagRepository
+from app.domain.models.bulk import BulkItemResult
+from app.domain.models.cursor import PostCursor, SearchCursor
 from app.domain.models.errors.domain import ValidationError
-from app.domain.models.post import Post
+from app.domain.models.post import POST_STATUS_DRAFT, Post, PostPage, PostVersion, _allowed_statuses
+from app.domain.models.post_tag import PostTag
+from app.domain.services.post_tag import validate_tag_name
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+MAX_BULK_SIZE = 100_000
+MAX_SEARCH_QUERY_LENGTH = 256
+MAX_BULK_STATUS_SIZE = 10_000
+MAX_TAGS_PER_REQUEST = 1000
+
+# Фильтры, по которым можно выбрать посты для массовой смены статуса
+_bulk_status_filters = ("status", "created_after", "created_before")
+
+# Фильтры выгрузки постов
+_export_filters = ("status", "created_after", "created_before")
+
 
 class PostService:
-    def __init__(self, post_repository: PostRepository, post_tag_repository: PostTagRepository):
+    def __init__(
+        self, post_repository: AsyncPostRepository, post_tag_repository: AsyncPostTagRepository
+    ):
         self.post_repository = post_repository
         self.post_tag_repository = post_tag_repository
 
-    def get_post(self, id_: uuid.UUID) -> Post:
-        return self.post_repository.get_post_by_id(id_)
+        self.posts_created = 0
+        self.posts_bulk_created = 0
 
-    def create_post(self, title: str, body: str, status: str) -> uuid.UUID:
-        if len(title) > 255:
-            raise ValidationError("Title is too long")
+    def stats(self) -> dict:
+        """Счетчики созданных постов для внутреннего API и метрик"""
+        return {"posts_created": self.posts_created, "posts_bulk_created": self.posts_bulk_created}
 
-        if len(body) > 4095:
-            raise ValidationError("Body is too long")
+    async def get_post(self, id_: uuid.UUID) -> Post:
+        return await self.post_repository.get_post_by_id(id_)
+
+    async def get_post_version(self, id_: uuid.UUID) -> PostVersion:
+        """Статус и updated_at поста для проверки условного запроса без чтения всего поста"""
+        return await self.post_repository.get_post_version(id_)
+
+    async def create_post(self, title: str, body: str, status: str) -> uuid.UUID:
+        self._validate_content(title, body)
 
         post = Post(
             id_=uuid.uuid4(),
@@ -34,16 +61,135 @@ class PostService:
             updated_at=DateTime.now(),
         )
 
-        self.post_repository.create_post(post)
+        await self.post_repository.create_post(post)
+        self.posts_created += 1
         logger.info(f"Created new post with ID: {post.id_}")
 
         return post.id_
 
-    def list_posts(self) -> list[Post]:
-        return self.post_repository.list_posts_by_filters()
+    async def bulk_create_posts(self, items: list) -> list[BulkItemResult]:
+        """Создать посты пачкой; некорректные элементы пропускаются с ошибкой в результате"""
+        if len(items) > MAX_BULK_SIZE:
+            raise ValidationError(f"Too many posts in one request, max is {MAX_BULK_SIZE}")
+
+        now = DateTime.now()
+        posts = []
+        results = []
+
+        for index, item in enumerate(items):
+            try:
+                post = self._build_bulk_post(item, now)
+            except ValidationError as error:
+                results.append(BulkItemResult(index=index, error=error.message))
+                continue
+
+            posts.append(post)
+            results.append(BulkItemResult(index=index, id_=post.id_))
+
+        if posts:
+            await self.post_repository.bulk_create_posts(posts)
+            self.posts_bulk_created += len(posts)
+            logger.info(f"Bulk created {len(posts)} posts")
+
+        return results
+
+    def _build_bulk_post(self, item, now: DateTime) -> Post:
+        if not isinstance(item, dict):
+            raise ValidationError("Item must be a JSON object")
+
+        title = item.get("title")
+        body = item.get("body")
+        status = item.get("status", POST_STATUS_DRAFT)
+        tags = item.get("tags", [])
+
+        if not isinstance(title, str) or not isinstance(body, str):
+            raise ValidationError("Title and body are required")
 
-    def update_post(self, id_: uuid.UUID, **kwargs):
-        post = self.post_repository.get_post_by_id(id_)
+        self._validate_content(title, body)
+
+        if status not in _allowed_statuses:
+            raise ValidationError("Unknown status")
+
+        if not isinstance(tags, list):
+            raise ValidationError("Tags must be a list of names")
+
+        # Те же правила, что у POST /post_tag: иначе ошибка БД обрывает весь пакет
+        tags = [validate_tag_name(name) for name in tags]
+
+        return Post(
+            id_=uuid.uuid4(),
+            title=title,
+            body=body,
+            status=status,
+            created_at=now,
+            updated_at=now,
+            tags=[PostTag(id_=uuid.uuid4(), name=name) for name in tags],
+        )
+
+    @staticmethod
+    def _validate_content(title: str, body: str) -> None:
+        if len(title) > 255:
+            raise ValidationError("Title is too long")
+
+        if len(body) > 4095:
+            raise ValidationError("Body is too long")
+
+    async def list_posts(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, **filters
+    ) -> PostPage:
+        after = PostCursor.decode(cursor) if cursor else None
+
+        return await self.post_repository.list_posts_page(
+            limit=max(1, min(limit, MAX_PAGE_SIZE)), after=after, **filters
+        )
+
+    async def list_post_versions(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, **filters
+    ) -> list[PostVersion]:
+        """Версии постов страницы `list_posts` с теми же параметрами и первого поста следующей"""
+        after = PostCursor.decode(cursor) if cursor else None
+
+        return await self.post_repository.list_post_versions_page(
+            limit=max(1, min(limit, MAX_PAGE_SIZE)), after=after, **filters
+        )
+
+    async def search_posts(
+        self, query: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, **filters
+    ) -> PostPage:
+        query = query.strip()
+        if not query:
+            raise ValidationError("Search query is empty")
+
+        if len(query) > MAX_SEARCH_QUERY_LENGTH:
+            raise ValidationError("Search query is too long")
+
+        after = SearchCursor.decode(cursor) if cursor else None
+
+        return await self.post_repository.search_posts(
+            query, limit=max(1, min(limit, MAX_PAGE_SIZE)), after=after, **filters
+        )
+
+    async def export_posts(
+        self, cursor: Optional[str] = None, **filters
+    ) -> AsyncIterator[list[Post]]:
+        """Пачки постов для потоковой выгрузки, от старых к новым
+
+        Параметры проверяются до начала выгрузки. `cursor` — курсор последнего полученного
+        поста, с ним прерванная выгрузка продолжается без повторов.
+        """
+        unknown = set(filters) - set(_export_filters)
+        if unknown:
+            raise ValidationError(f"Unknown filters: {', '.join(sorted(unknown))}")
+
+        if "status" in filters and filters["status"] not in _allowed_statuses:
+            raise ValidationError("Unknown status")
+
+        after = PostCursor.decode(cursor) if cursor else None
+
+        return self.post_repository.export_posts(after=after, **filters)
+
+    async def update_post(self, id_: uuid.UUID, **kwargs):
+        post = await self.post_repository.get_post_by_id(id_)
 
         for key, value in kwargs.items():
             if key not in ["id_", "created_at", "updated_at"]:
@@ -51,21 +197,104 @@ class PostService:
 
         post.updated_at = DateTime.now()
 
-        return self.post_repository.update_post(post)
+        return await self.post_repository.update_post(post)
+
+    async def update_post_fields(
+        self, id_: uuid.UUID, expected_updated_at: Optional[DateTime] = None, **fields
+    ) -> Post:
+        """Изменить поля поста одним UPDATE без предварительного чтения; пост возвращается с тегами
+
+        expected_updated_at: значение `updated_at`, которое видел клиент; если пост успел
+        измениться, будет ConflictError
+        """
+        unknown = set(fields) - {"title", "body", "status"}
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        if "status" in fields and fields["status"] not in _allowed_statuses:
+            raise ValidationError("Unknown status")
+
+        self._validate_content(fields.get("title", ""), fields.get("body", ""))
+
+        return await self.post_repository.update_post_fields(
+            id_, {**fields, "updated_at": DateTime.now()}, expected_updated_at
+        )
+
+    async def change_posts_status(
+        self,
+        status: str,
+        ids: Optional[list[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: int = MAX_BULK_STATUS_SIZE,
+    ) -> list[BulkItemResult]:
+        """Перевести в статус `status` посты из `ids` или выбранные фильтрами
+
+        Для `ids` результат содержит исход по каждому ID в порядке запроса.
+        По фильтрам меняется не больше `limit` постов; если результат равен `limit`,
+        подходящие посты могли остаться и запрос стоит повторить.
+        """
+        if status not in _allowed_statuses:
+            raise ValidationError("Unknown status")
+
+        filters = filters or {}
+        if (ids is None) == (not filters):
+            raise ValidationError("Either ids or filters must be given")
+
+        unknown = set(filters) - set(_bulk_status_filters)
+        if unknown:
+            raise ValidationError(f"Unknown filters: {', '.join(sorted(unknown))}")
+
+        if "status" in filters and filters["status"] not in _allowed_statuses:
+            raise ValidationError("Unknown status")
+
+        if ids is not None and len(ids) > MAX_BULK_STATUS_SIZE:
+            raise ValidationError(f"Too many posts in one request, max is {MAX_BULK_STATUS_SIZE}")
+
+        updated = await self.post_repository.update_posts_status(
+            status,
+            DateTime.now(),
+            ids=ids,
+            filters=filters,
+            limit=None if ids is not None else max(1, min(limit, MAX_BULK_STATUS_SIZE)),
+        )
+        logger.info(f"Changed status of {len(updated)} posts to {status}")
+
+        if ids is None:
+            return [BulkItemResult(index=index, id_=id_) for index, id_ in enumerate(updated)]
+
+        updated = set(updated)
+        return [
+            (
+                BulkItemResult(index=index, id_=id_)
+                if id_ in updated
+                else BulkItemResult(index=index, id_=id_, error="Post not found")
+            )
+            for index, id_ in enumerate(ids)
+        ]
+
+    async def delete_post(self, id_: uuid.UUID):
+        return await self.post_repository.delete_post_by_id(id_)
+
+    async def add_tags(self, id_: uuid.UUID, tags_ids: list[uuid.UUID]) -> None:
+        """Привязать теги к посту; пост и все теги проверяются в одной транзакции
 
-    def delete_post(self, id_: uuid.UUID):
-        return self.post_repository.delete_post_by_id(id_)
+        Если привязки изменились, у поста обновляется updated_at: от него зависит ETag.
+        """
+        self._validate_tags_ids(tags_ids)
+        await self.post_repository.attach_tags(id_, tags_ids, updated_at=DateTime.now())
 
-    def add_tags(self, id_: uuid.UUID, tags_ids: list[uuid.UUID]) -> None:
-        tags = []
-        for id_ in tags_ids:
-            tags.append(self.post_tag_repository.get_post_tag_by_id(id_))
+    async def remove_tags(self, id_: uuid.UUID, tags_ids: list[uuid.UUID]) -> None:
+        """Отвязать теги от поста; пост и все теги проверяются в одной транзакции
 
-        self.post_repository.add_tags(id_, tags)
+        Если привязки изменились, у поста обновляется updated_at: от него зависит ETag.
+        """
+        self._validate_tags_ids(tags_ids)
+        await self.post_repository.detach_tags(id_, tags_ids, updated_at=DateTime.now())
 
-    def remove_tags(self, id_: uuid.UUID, tags_ids: list[uuid.UUID]) -> None:
-        tags = []
-        for id_ in tags_ids:
-            tags.append(self.post_tag_repository.get_post_tag_by_id(id_))
+    @staticmethod
+    def _validate_tags_ids(tags_ids: list[uuid.UUID]) -> None:
+        if not tags_ids:
+            raise ValidationError("No tags given")
 
-        self.post_repository.remove_tags(id_, tags)
+        if len(tags_ids) > MAX_TAGS_PER_REQUEST:
+            raise ValidationError(f"Too many tags in one request, max is {MAX_TAGS_PER_REQUEST}")
@@ -1,34 +1,79 @@
+import asyncio
 import uuid
+from datetime import datetime as DateTime
+from typing import Optional
 
-from app.domain.interfaces.storage.post_tag import PostTagRepository
+from app.domain.interfaces.storage.post_tag import AsyncPostTagRepository
+from app.domain.models.errors.domain import ValidationError
 from app.domain.models.post_tag import PostTag
+from app.domain.services.tag_index import TagNameIndex
+
+MAX_TAG_NAME_LENGTH = 100
+DEFAULT_SUGGEST_SIZE = 10
+MAX_SUGGEST_SIZE = 50
+
+
+def validate_tag_name(name) -> str:
+    """Имя тега без пробелов по краям; общее правило для тегов и тегов в постах"""
+    if not isinstance(name, str) or not name.strip():
+        raise ValidationError("Tag name is required")
+
+    name = name.strip()
+    if len(name) > MAX_TAG_NAME_LENGTH:
+        raise ValidationError("Tag name is too long")
+
+    return name
 
 
 class PostTagService:
-    def __init__(self, post_tag_repository: PostTagRepository):
+    def __init__(
+        self,
+        post_tag_repository: AsyncPostTagRepository,
+        tag_index: Optional[TagNameIndex] = None,
+    ):
         self.post_tag_repository = post_tag_repository
+        self.tag_index = tag_index if tag_index is not None else TagNameIndex()
+        # Один запрос перезагружает устаревший индекс, остальные ждут его
+        self._index_lock = asyncio.Lock()
+
+    async def get_post_tag(self, id_: uuid.UUID) -> PostTag:
+        return await self.post_tag_repository.get_post_tag_by_id(id_)
+
+    async def create_post_tag(self, name) -> uuid.UUID:
+        post_tag = PostTag(id_=uuid.uuid4(), name=validate_tag_name(name))
 
-    def get_post_tag(self, id_: uuid.UUID) -> PostTag:
-        return self.post_tag_repository.get_post_tag_by_id(id_)
+        await self.post_tag_repository.create_post_tag(post_tag)
+        self.tag_index.put(post_tag)
 
-    def create_post_tag(self, data: dict):
-        post_tag = PostTag(**data)
+        return post_tag.id_
 
-        post_tag.id_ = uuid.uuid4()
+    async def list_post_tags(self, limit: Optional[int] = None, offset: int = 0) -> list[PostTag]:
+        return await self.post_tag_repository.list_post_tags_by_filters(limit=limit, offset=offset)
 
-        return self.post_tag_repository.create_post_tag(post_tag)
+    async def update_post_tag(self, id_: uuid.UUID, name) -> PostTag:
+        """Переименовать тег; у постов с ним обновляется updated_at: от него зависит ETag"""
+        post_tag = PostTag(id_=id_, name=validate_tag_name(name))
 
-    def list_post_tags(self) -> list[PostTag]:
-        return self.post_tag_repository.list_post_tags_by_filters()
+        await self.post_tag_repository.update_post_tag(post_tag, updated_at=DateTime.now())
+        self.tag_index.put(post_tag)
 
-    def update_post_tag(self, id_: uuid.UUID, data: dict):
-        post = self.post_tag_repository.get_post_tag_by_id(id_)
+        return post_tag
 
-        for key, value in data.items():
-            if key != "id_":
-                setattr(post, key, value)
+    async def delete_post_tag(self, id_: uuid.UUID):
+        """Удалить тег; у постов, от которых он отвязан, обновляется updated_at"""
+        await self.post_tag_repository.delete_post_tag_by_id(id_, updated_at=DateTime.now())
+        self.tag_index.remove(id_)
 
-        return self.post_tag_repository.update_post_tag(post)
+    async def suggest_post_tags(
+        self, prefix: str, limit: int = DEFAULT_SUGGEST_SIZE
+    ) -> list[PostTag]:
+        """Теги по началу имени из индекса в памяти; БД читается только при устаревшем индексе"""
+        if self.tag_index.stale:
+            async with self._index_lock:
+                if self.tag_index.stale:
+                    # Теги, созданные и измененные во время чтения, не теряются при загрузке
+                    version = self.tag_index.version
+                    tags = await self.post_tag_repository.list_post_tags_by_filters()
+                    self.tag_index.load(tags, version)
 
-    def delete_post_tag(self, id_: uuid.UUID):
-        return self.post_tag_repository.delete_post_tag_by_id(id_)
+        return self.tag_index.suggest(prefix, max(1, min(limit, MAX_SUGGEST_SIZE)))
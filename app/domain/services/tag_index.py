@@ -0,0 +1,112 @@
+import bisect
+import threading
+import time
+import uuid
+from typing import Callable, Iterable, Optional
+
+from app.domain.models.post_tag import PostTag
+
+
+class TagNameIndex:
+    """Отсортированный индекс имен тегов в памяти воркера для подсказок по префиксу
+
+    Поиск — бинарный по отсортированному списку, без обращения к БД. Индекс считается
+    устаревшим через `ttl_seconds` после загрузки: изменения тегов в других воркерах
+    попадают в него при следующей полной загрузке.
+
+    `put` и `remove` увеличивают `version`. Загрузка, начатая при версии `version`,
+    сохраняет изменения, сделанные во время чтения из БД: снимок мог их не увидеть.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, clock: Callable[[], float] = time.monotonic):
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (имя без учета регистра, ID числом) в порядке сортировки и теги по ID числом
+        self._keys: list[tuple[str, int]] = []
+        self._tags: dict[int, PostTag] = {}
+        self._loaded_at: float | None = None
+        # Изменения с последней загрузки: ID числом -> (версия, тег или None для удаления)
+        self._version = 0
+        self._changes: dict[int, tuple[int, Optional[PostTag]]] = {}
+
+    @property
+    def stale(self) -> bool:
+        return self._loaded_at is None or self._clock() - self._loaded_at >= self._ttl_seconds
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def load(self, tags: Iterable[PostTag], version: Optional[int] = None) -> None:
+        """Полностью заменить содержимое индекса
+
+        `version` — значение `version` до чтения `tags` из БД: более поздние `put`
+        и `remove` применяются поверх снимка.
+        """
+        tags = {tag.id_.int: PostTag(id_=tag.id_, name=tag.name) for tag in tags}
+
+        with self._lock:
+            if version is not None:
+                for id_, (changed_at, tag) in self._changes.items():
+                    if changed_at <= version:
+                        continue
+                    if tag is None:
+                        tags.pop(id_, None)
+                    else:
+                        tags[id_] = tag
+
+            self._tags = tags
+            self._keys = sorted(self._key(tag) for tag in tags.values())
+            self._changes = {}
+            self._loaded_at = self._clock()
+
+    def put(self, tag: PostTag) -> None:
+        """Добавить тег или обновить его имя"""
+        tag = PostTag(id_=tag.id_, name=tag.name)
+        with self._lock:
+            self._remove_locked(tag.id_)
+            self._tags[tag.id_.int] = tag
+            bisect.insort(self._keys, self._key(tag))
+            self._record_locked(tag.id_, tag)
+
+    def remove(self, id_: uuid.UUID) -> None:
+        with self._lock:
+            self._remove_locked(id_)
+            self._record_locked(id_, None)
+
+    def suggest(self, prefix: str, limit: int) -> list[PostTag]:
+        """Теги, имя которых начинается с `prefix` (без учета регистра), по алфавиту"""
+        prefix = prefix.casefold()
+
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (prefix, -1))
+            result = []
+            for name, id_ in self._keys[start : start + limit]:
+                if not name.startswith(prefix):
+                    break
+                tag = self._tags[id_]
+                result.append(PostTag(id_=tag.id_, name=tag.name))
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _record_locked(self, id_: uuid.UUID, tag: Optional[PostTag]) -> None:
+        self._version += 1
+        self._changes[id_.int] = (self._version, tag)
+
+    def _remove_locked(self, id_: uuid.UUID) -> None:
+        tag = self._tags.pop(id_.int, None)
+        if tag is None:
+            return
+
+        key = self._key(tag)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    @staticmethod
+    def _key(tag: PostTag) -> tuple[str, int]:
+        return tag.name.casefold(), tag.id_.int
@@ -0,0 +1,298 @@
+import copy
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime as Datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.domain.interfaces.storage.post import PostRepository as PostRepositoryInterface
+from app.domain.models.cursor import PostCursor, SearchCursor
+from app.domain.models.post import Post, PostPage, PostVersion
+from app.storage.cache.lru import LRUCache
+from app.storage.cache.tiers import CacheTier
+
+# Сколько поколений сброса накопить при непрерывных чтениях, прежде чем чистить старые
+_EVICTED_AT_PRUNE_SIZE = 1024
+
+
+class CachedPostRepository(PostRepositoryInterface):
+    """Read-through кэш постов по ID поверх любого репозитория постов
+
+    Записи сбрасываются при изменении поста. Если изменение выполняется
+    во внешней транзакции (передан `session`), сброс откладывается до ее commit,
+    а чтения этого поста в той же транзакции идут мимо кэша.
+
+    Чтение мимо кэша не кладет пост в кэш, если за время чтения запись этого поста
+    сбросили: иначе прочитанная до изменения версия жила бы в кэше весь TTL.
+    Для этого сброс увеличивает счетчик поколений и, пока есть незавершенные чтения,
+    запоминает поколение сброса по ID.
+    """
+
+    def __init__(
+        self,
+        repository: PostRepositoryInterface,
+        cache: LRUCache,
+        second_tier: Optional[CacheTier] = None,
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._second_tier = second_tier
+        self._pending_key = f"post_cache_pending:{id(self)}"
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Поколение последнего сброса по ID; нужно, только пока есть незавершенные чтения
+        self._evicted_at: dict[uuid.UUID, int] = {}
+        # Число незавершенных чтений мимо кэша по поколению их начала
+        self._reads: Counter[int] = Counter()
+
+        self.second_tier_hits = 0
+        self.stale_fills_skipped = 0
+
+    def stats(self) -> dict:
+        """Счетчики кэша для внутреннего API"""
+        return {
+            **self._cache.stats(),
+            "second_tier_hits": self.second_tier_hits,
+            "stale_fills_skipped": self.stale_fills_skipped,
+        }
+
+    def create_post(self, post: Post, session: Optional[Session] = None) -> None:
+        return self._repository.create_post(post, session=session)
+
+    def bulk_create_posts(self, posts: List[Post], session: Optional[Session] = None) -> None:
+        return self._repository.bulk_create_posts(posts, session=session)
+
+    def get_post_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> Post:
+        if session is not None and id_ in session.info.get(self._pending_key, ()):
+            # Пост изменен в текущей транзакции: кэш не видит незакоммиченных данных
+            return self._repository.get_post_by_id(id_, session=session)
+
+        post = self._cache.get(id_)
+        if post is None:
+            post = self._load(id_, session)
+
+        return self._copy(post)
+
+    def get_post_version(self, id_: uuid.UUID, session: Optional[Session] = None) -> PostVersion:
+        """Версия закэшированного поста без запроса к БД, иначе версия из репозитория"""
+        if session is None or id_ not in session.info.get(self._pending_key, ()):
+            post = self._cache.get(id_)
+            if post is not None:
+                return PostVersion(post.id_, post.status, post.updated_at)
+
+        return self._repository.get_post_version(id_, session=session)
+
+    def update_post(self, post: Post, session: Optional[Session] = None) -> None:
+        result = self._repository.update_post(post, session=session)
+        self._invalidate(post.id_, session)
+        return result
+
+    def update_post_fields(
+        self,
+        id_: uuid.UUID,
+        fields: dict,
+        expected_updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> Post:
+        result = self._repository.update_post_fields(
+            id_, fields, expected_updated_at, session=session
+        )
+        self._invalidate(id_, session)
+        return result
+
+    def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+        session: Optional[Session] = None,
+    ) -> List[uuid.UUID]:
+        updated = self._repository.update_posts_status(
+            status, updated_at, ids, filters, limit, session=session
+        )
+        for id_ in updated:
+            self._invalidate(id_, session)
+        return updated
+
+    def list_posts_by_filters(
+        self, *args, session: Optional[Session] = None, **kwargs
+    ) -> List[Post]:
+        return self._repository.list_posts_by_filters(*args, session=session, **kwargs)
+
+    def list_posts_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> PostPage:
+        return self._repository.list_posts_page(limit, after, session=session, **filters)
+
+    def list_post_versions_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> List[PostVersion]:
+        return self._repository.list_post_versions_page(limit, after, session=session, **filters)
+
+    def search_posts(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[SearchCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> PostPage:
+        return self._repository.search_posts(query, limit, after, session=session, **filters)
+
+    def export_posts(
+        self,
+        after: Optional[PostCursor] = None,
+        batch_size: int = 1000,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> Iterator[List[Post]]:
+        return self._repository.export_posts(after, batch_size, session=session, **filters)
+
+    def delete_post_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> None:
+        result = self._repository.delete_post_by_id(id_, session=session)
+        self._invalidate(id_, session)
+        return result
+
+    def attach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> None:
+        result = self._repository.attach_tags(id_, tag_ids, updated_at, session=session)
+        self._invalidate(id_, session)
+        return result
+
+    def detach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> None:
+        result = self._repository.detach_tags(id_, tag_ids, updated_at, session=session)
+        self._invalidate(id_, session)
+        return result
+
+    def invalidate_posts(self, ids: List[uuid.UUID], session: Optional[Session] = None) -> None:
+        """Сбросить записи постов, измененных в обход этого репозитория (например, тегами)"""
+        for id_ in ids:
+            self._invalidate(id_, session)
+
+    def _invalidate(self, id_: uuid.UUID, session: Optional[Session]) -> None:
+        """Сбросить запись сразу или после commit внешней транзакции"""
+        if session is None:
+            self._evict(id_)
+            return
+
+        pending = session.info.get(self._pending_key)
+        if pending is None:
+            pending = session.info[self._pending_key] = set()
+            event.listen(session, "after_commit", self._on_commit)
+            event.listen(session, "after_rollback", self._on_rollback)
+
+        pending.add(id_)
+
+    def _on_commit(self, session: Session) -> None:
+        pending = session.info[self._pending_key]
+        for id_ in pending:
+            self._evict(id_)
+        pending.clear()
+
+    def _on_rollback(self, session: Session) -> None:
+        # Данные в БД не изменились, кэш остается корректным
+        session.info[self._pending_key].clear()
+
+    def _evict(self, id_: uuid.UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._reads:
+                self._evicted_at[id_] = self._generation
+            self._cache.delete(id_)
+
+        if self._second_tier is not None:
+            self._second_tier.delete(id_)
+
+    def _begin_read(self) -> int:
+        with self._lock:
+            self._reads[self._generation] += 1
+            return self._generation
+
+    def _end_read(self, started: int) -> None:
+        with self._lock:
+            self._reads[started] -= 1
+            if not self._reads[started]:
+                del self._reads[started]
+
+            if not self._reads:
+                self._evicted_at.clear()
+            elif len(self._evicted_at) > _EVICTED_AT_PRUNE_SIZE:
+                # Сбросы не позже начала самого старого чтения уже никому не нужны
+                oldest = min(self._reads)
+                self._evicted_at = {
+                    id_: generation
+                    for id_, generation in self._evicted_at.items()
+                    if generation > oldest
+                }
+
+    def _evicted_since(self, id_: uuid.UUID, started: int) -> bool:
+        with self._lock:
+            return self._evicted_at.get(id_, -1) > started
+
+    def _fill(self, id_: uuid.UUID, post: Post, started: int) -> bool:
+        """Положить пост в кэш, если его не сбрасывали с начала чтения"""
+        with self._lock:
+            if self._evicted_at.get(id_, -1) > started:
+                self.stale_fills_skipped += 1
+                return False
+
+            self._cache.set(id_, post)
+            return True
+
+    def _load(self, id_: uuid.UUID, session: Optional[Session]) -> Post:
+        """Прочитать пост со второго уровня или из репозитория и заполнить кэш"""
+        started = self._begin_read()
+        try:
+            post = None
+            if self._second_tier is not None:
+                post = self._second_tier.get(id_)
+                if post is not None:
+                    self.second_tier_hits += 1
+
+            from_second_tier = post is not None
+            if post is None:
+                post = self._repository.get_post_by_id(id_, session=session)
+
+            filled = self._fill(id_, post, started)
+            if filled and not from_second_tier and self._second_tier is not None:
+                self._second_tier.set(id_, post, self._cache.ttl_seconds)
+                # Сброс между проверкой и записью во второй уровень мог ее не застать
+                if self._evicted_since(id_, started):
+                    self._second_tier.delete(id_)
+
+            return post
+        finally:
+            self._end_read(started)
+
+    @staticmethod
+    def _copy(post: Post) -> Post:
+        """Копия поста, чтобы изменения вызывающего кода не портили кэш"""
+        result = copy.copy(post)
+        if post.tags is not None:
+            result.tags = list(post.tags)
+        return result
@@ -0,0 +1,136 @@
+import uuid
+from datetime import datetime as Datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.domain.interfaces.storage.post_tag import PostTagRepository as PostTagRepositoryInterface
+from app.domain.models.post_tag import PostTag, PostTagChange
+from app.storage.cache.lru import LRUCache
+
+
+class CachedPostTagRepository(PostTagRepositoryInterface):
+    """Кэш соответствия имени тега его ID перед `get_or_create_post_tags`
+
+    Уже известные имена не требуют запросов к БД. Имена, найденные или созданные
+    во внешней транзакции, попадают в кэш только после ее commit. Переименование
+    и удаление тега сбрасывают запись по старому имени в этом процессе;
+    в других процессах запись живет до истечения TTL кэша.
+
+    `on_posts_changed` получает ID постов, чьи теги переименованы или удалены,
+    и сессию внешней транзакции: так сбрасываются записи кэша постов.
+    """
+
+    def __init__(
+        self,
+        repository: PostTagRepositoryInterface,
+        cache: LRUCache,
+        on_posts_changed: Optional[Callable[[List[uuid.UUID], Optional[Session]], None]] = None,
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._on_posts_changed = on_posts_changed
+        # Изменения кэша, ожидающие commit внешней транзакции: имя -> ID или None для сброса
+        self._pending_key = f"tag_name_cache_pending:{id(self)}"
+
+    def stats(self) -> dict:
+        """Счетчики кэша для внутреннего API"""
+        return self._cache.stats()
+
+    def create_post_tag(self, post_tag: PostTag, session: Optional[Session] = None) -> None:
+        return self._repository.create_post_tag(post_tag, session=session)
+
+    def get_post_tag_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> PostTag:
+        return self._repository.get_post_tag_by_id(id_, session=session)
+
+    def update_post_tag(
+        self,
+        post_tag: PostTag,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> PostTagChange:
+        # Прежнее имя возвращает сама запись: отдельное чтение вне ее транзакции
+        # могло бы увидеть имя до параллельного переименования
+        change = self._repository.update_post_tag(post_tag, updated_at, session=session)
+        self._remember(change.old_name, None, session)
+        self._posts_changed(change.post_ids, session)
+        return change
+
+    def list_post_tags_by_filters(
+        self, *args, session: Optional[Session] = None, **kwargs
+    ) -> List[PostTag]:
+        return self._repository.list_post_tags_by_filters(*args, session=session, **kwargs)
+
+    def delete_post_tag_by_id(
+        self,
+        id_: uuid.UUID,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> PostTagChange:
+        change = self._repository.delete_post_tag_by_id(id_, updated_at, session=session)
+        self._remember(change.old_name, None, session)
+        self._posts_changed(change.post_ids, session)
+        return change
+
+    def get_or_create_post_tag(self, name: str, session: Optional[Session] = None) -> PostTag:
+        return self.get_or_create_post_tags([name], session=session)[0]
+
+    def get_or_create_post_tags(
+        self, names: List[str], session: Optional[Session] = None
+    ) -> List[PostTag]:
+        names = list(dict.fromkeys(names))
+        pending = session.info.get(self._pending_key, {}) if session is not None else {}
+
+        tag_ids = {}
+        missing = []
+        for name in names:
+            # Имя изменено в текущей транзакции: кэш не видит незакоммиченных данных
+            id_ = self._cache.get(name) if name not in pending else None
+            if id_ is None:
+                missing.append(name)
+            else:
+                tag_ids[name] = id_
+
+        if missing:
+            for tag in self._repository.get_or_create_post_tags(missing, session=session):
+                tag_ids[tag.name] = tag.id_
+                self._remember(tag.name, tag.id_, session)
+
+        return [PostTag(id_=tag_ids[name], name=name) for name in names]
+
+    def _posts_changed(self, post_ids: List[uuid.UUID], session: Optional[Session]) -> None:
+        if self._on_posts_changed is not None and post_ids:
+            self._on_posts_changed(post_ids, session)
+
+    def _remember(self, name: str, id_: Optional[uuid.UUID], session: Optional[Session]) -> None:
+        """Записать или сбросить имя сразу или после commit внешней транзакции"""
+        if session is None:
+            self._apply(name, id_)
+            return
+
+        pending = session.info.get(self._pending_key)
+        if pending is None:
+            pending = session.info[self._pending_key] = {}
+            event.listen(session, "after_commit", self._on_commit)
+            event.listen(session, "after_rollback", self._on_rollback)
+
+        # Сброс сильнее записи: имя, освобожденное в транзакции, не кэшируется до commit
+        if id_ is None or pending.get(name, id_) is not None:
+            pending[name] = id_
+
+    def _on_commit(self, session: Session) -> None:
+        pending = session.info[self._pending_key]
+        for name, id_ in pending.items():
+            self._apply(name, id_)
+        pending.clear()
+
+    def _on_rollback(self, session: Session) -> None:
+        # Созданные в транзакции теги откатились, кэшировать их нельзя
+        session.info[self._pending_key].clear()
+
+    def _apply(self, name: str, id_: Optional[uuid.UUID]) -> None:
+        if id_ is None:
+            self._cache.delete(name)
+        else:
+            self._cache.set(name, id_)
@@ -0,0 +1,50 @@
+import abc
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheTier(abc.ABC):
+    """Второй уровень кэша, общий для воркеров (например, Redis или memcached)"""
+
+    @abc.abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: Hashable) -> None:
+        pass
+
+
+class LocalCacheTier(CacheTier):
+    """Локальная замена второго уровня кэша для разработки и тестов"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl_seconds, value)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,624 @@
+import itertools
+import re
+import uuid
+from datetime import datetime as Datetime
+from typing import Iterator, List, Optional
+
+from app.domain.interfaces.storage.post import PostRepository as PostRepositoryInterface
+from app.domain.models.cursor import PostCursor, SearchCursor
+from app.domain.models.errors.domain import ConflictError, NotFoundError
+from app.domain.models.post import Post, PostPage, PostVersion
+from app.domain.models.post_tag import PostTag
+from app.storage.memory.store import MemorySession, MemoryStore
+
+# Поля поста, которые можно менять частичным обновлением
+UPDATABLE_POST_FIELDS = ("title", "body", "status", "updated_at")
+
+# Размер пачки выгрузки по умолчанию
+EXPORT_BATCH_SIZE = 1000
+
+# Веса вхождений для ранжирования поиска, как веса A и B у ts_rank_cd
+SEARCH_TITLE_WEIGHT = 1.0
+SEARCH_BODY_WEIGHT = 0.4
+
+# Слова для поиска, как у парсера конфигурации `simple`: буквы и цифры без учета регистра
+_WORD_RE = re.compile(r"\w+")
+# Элементы запроса websearch_to_tsquery: "фраза", -исключение или слово
+_QUERY_ITEM_RE = re.compile(r'(-?)"([^"]*)"?|(-?)([^\s"]+)')
+
+# Колонки сортировки `list_posts_by_filters`, кроме created_at: ее порядок дает индекс
+_ORDER_COLUMNS = {
+    "id": lambda post: post.id_,
+    "title": lambda post: post.title,
+    "body": lambda post: post.body,
+    "status": lambda post: post.status,
+    "updated_at": lambda post: post.updated_at,
+}
+
+
+class PostRepository(PostRepositoryInterface):
+    """In-memory репозиторий для постов
+
+    Фильтры, порядок и keyset-пагинация те же, что у PostgreSQL репозитория; списки
+    читаются по индексам (created_at, id) — общему или статуса. Поиск проходит по
+    постам выборки: слова запроса сначала ищутся подстрокой, разбор на слова
+    и ранжирование — только у найденных.
+    """
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    def create_post(self, post: Post, session: Optional[MemorySession] = None) -> None:
+        """Создать новый пост; теги поста, как и в PostgreSQL репозитории, не сохраняются"""
+        if session is not None:
+            return self._create_post_with_session(session, post)
+
+        with self._store.get_session() as session:
+            return self._create_post_with_session(session, post)
+
+    def _create_post_with_session(self, session: MemorySession, post: Post) -> None:
+        """Внутренний метод для создания поста"""
+        session.insert_post(self._row(post))
+
+    def bulk_create_posts(self, posts: List[Post], session: Optional[MemorySession] = None) -> None:
+        """Создать посты с тегами в одной транзакции
+
+        Теги постов сопоставляются по имени; недостающие теги создаются,
+        а `post.tags` заменяются тегами с их настоящими ID.
+        """
+        if session is not None:
+            return self._bulk_create_posts_with_session(session, posts)
+
+        with self._store.get_session() as session:
+            return self._bulk_create_posts_with_session(session, posts)
+
+    def _bulk_create_posts_with_session(self, session: MemorySession, posts: List[Post]) -> None:
+        """Внутренний метод для массового создания постов"""
+        session.insert_posts([self._row(post) for post in posts])
+
+        tag_ids = self._store.tag_ids_by_name
+        for post in posts:
+            names = dict.fromkeys(tag.name for tag in post.tags or [])
+            for name in names:
+                if name not in tag_ids:
+                    session.insert_tag(PostTag(id_=uuid.uuid4(), name=name))
+                session.link(post.id_, tag_ids[name])
+
+            post.tags = [self._store.tags[tag_ids[name]] for name in names]
+
+    def get_post_by_id(self, id_: uuid.UUID, session: Optional[MemorySession] = None) -> Post:
+        """Получить пост по ID"""
+        if session is not None:
+            return self._get_post_by_id_with_session(session, id_)
+
+        with self._store.get_read_session() as session:
+            return self._get_post_by_id_with_session(session, id_)
+
+    def _get_post_by_id_with_session(self, session: MemorySession, id_: uuid.UUID) -> Post:
+        """Внутренний метод для получения поста по ID"""
+        return self._to_domain(self._get_row(id_))
+
+    def get_post_version(
+        self, id_: uuid.UUID, session: Optional[MemorySession] = None
+    ) -> PostVersion:
+        """Получить версию поста: статус и updated_at без текста и тегов"""
+        if session is not None:
+            return self._get_post_version_with_session(session, id_)
+
+        with self._store.get_read_session() as session:
+            return self._get_post_version_with_session(session, id_)
+
+    def _get_post_version_with_session(self, session: MemorySession, id_: uuid.UUID) -> PostVersion:
+        """Внутренний метод для получения версии поста"""
+        return self._to_version(self._get_row(id_))
+
+    def update_post(self, post: Post, session: Optional[MemorySession] = None) -> None:
+        """Обновить пост"""
+        if session is not None:
+            return self._update_post_with_session(session, post)
+
+        with self._store.get_session() as session:
+            return self._update_post_with_session(session, post)
+
+    def _update_post_with_session(self, session: MemorySession, post: Post) -> None:
+        """Внутренний метод для обновления поста: поля и набор тегов целиком"""
+        row = self._get_row(post.id_)
+        session.replace_post(
+            Post(row.id_, post.title, post.body, post.status, row.created_at, post.updated_at)
+        )
+
+        # Как в PostgreSQL репозитории, несуществующие теги пропускаются
+        tag_ids = [tag.id_ for tag in post.tags or [] if tag.id_ in self._store.tags]
+        for tag_id in list(self._store.post_tag_ids[post.id_]):
+            if tag_id not in tag_ids:
+                session.unlink(post.id_, tag_id)
+        for tag_id in tag_ids:
+            session.link(post.id_, tag_id)
+
+    def update_post_fields(
+        self,
+        id_: uuid.UUID,
+        fields: dict,
+        expected_updated_at: Optional[Datetime] = None,
+        session: Optional[MemorySession] = None,
+    ) -> Post:
+        """Изменить поля поста; возвращается пост с тегами
+
+        Если передан `expected_updated_at`, пост обновляется только при совпадении
+        `updated_at` (оптимистическая блокировка), иначе — ConflictError.
+        """
+        if session is not None:
+            return self._update_post_fields_with_session(session, id_, fields, expected_updated_at)
+
+        with self._store.get_session() as session:
+            return self._update_post_fields_with_session(session, id_, fields, expected_updated_at)
+
+    def _update_post_fields_with_session(
+        self,
+        session: MemorySession,
+        id_: uuid.UUID,
+        fields: dict,
+        expected_updated_at: Optional[Datetime],
+    ) -> Post:
+        """Внутренний метод для частичного обновления поста"""
+        unknown = set(fields) - set(UPDATABLE_POST_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields can not be updated: {sorted(unknown)}")
+
+        row = self._get_row(id_)
+        if expected_updated_at is not None and row.updated_at != expected_updated_at:
+            raise ConflictError(instance_type=Post)
+
+        values = {
+            "title": row.title,
+            "body": row.body,
+            "status": row.status,
+            "updated_at": row.updated_at,
+            **fields,
+        }
+        row = Post(id_=row.id_, created_at=row.created_at, **values)
+        session.replace_post(row)
+
+        return self._to_domain(row)
+
+    def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+        session: Optional[MemorySession] = None,
+    ) -> List[uuid.UUID]:
+        """Перевести посты в статус `status` и вернуть ID измененных постов
+
+        Посты выбираются по `ids` или, если они не переданы, по фильтрам списка постов
+        (не больше `limit`, по возрастанию ID). Посты уже в целевом статусе при выборе
+        по фильтрам пропускаются.
+        """
+        if session is not None:
+            return self._update_posts_status_with_session(
+                session, status, updated_at, ids, filters, limit
+            )
+
+        with self._store.get_session() as session:
+            return self._update_posts_status_with_session(
+                session, status, updated_at, ids, filters, limit
+            )
+
+    def _update_posts_status_with_session(
+        self,
+        session: MemorySession,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[List[uuid.UUID]],
+        filters: Optional[dict],
+        limit: Optional[int],
+    ) -> List[uuid.UUID]:
+        """Внутренний метод для массовой смены статуса"""
+        if ids is not None:
+            rows = [
+                self._store.posts[id_] for id_ in dict.fromkeys(ids) if id_ in self._store.posts
+            ]
+        else:
+            rows = sorted(
+                (row for row in self._filtered_rows(filters or {}) if row.status != status),
+                key=lambda row: row.id_,
+            )[:limit]
+
+        for row in rows:
+            session.replace_post(
+                Post(row.id_, row.title, row.body, status, row.created_at, updated_at)
+            )
+
+        return [row.id_ for row in rows]
+
+    def list_posts_by_filters(
+        self, *args, session: Optional[MemorySession] = None, **kwargs
+    ) -> List[Post]:
+        """Получить список постов с фильтрацией"""
+        if session is not None:
+            return self._list_posts_by_filters_with_session(session, kwargs)
+
+        with self._store.get_read_session() as session:
+            return self._list_posts_by_filters_with_session(session, kwargs)
+
+    def _list_posts_by_filters_with_session(
+        self, session: MemorySession, filters: dict
+    ) -> List[Post]:
+        """Внутренний метод для получения списка постов с фильтрацией"""
+        order_by = filters.get("order_by", "created_at")
+        descending = filters.get("order_direction", "desc") == "desc"
+
+        if order_by == "created_at":
+            # Порядок индекса: строки читаются, только пока не набран limit
+            rows = self._filtered_rows(filters, descending)
+        else:
+            rows = sorted(
+                self._filtered_rows(filters), key=_ORDER_COLUMNS[order_by], reverse=descending
+            )
+
+        # Пагинация
+        limit = filters.get("limit")
+        offset = filters.get("offset", 0)
+
+        if limit:
+            rows = itertools.islice(rows, offset, offset + limit)
+
+        return self._to_domain_list(rows)
+
+    def list_posts_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[MemorySession] = None,
+        **filters,
+    ) -> PostPage:
+        """Получить страницу постов, упорядоченных по (created_at, id) от новых к старым"""
+        if session is not None:
+            return self._list_posts_page_with_session(session, limit, after, filters)
+
+        with self._store.get_read_session() as session:
+            return self._list_posts_page_with_session(session, limit, after, filters)
+
+    def _list_posts_page_with_session(
+        self, session: MemorySession, limit: int, after: Optional[PostCursor], filters: dict
+    ) -> PostPage:
+        """Внутренний метод для keyset-пагинации постов"""
+        posts = self._to_domain_list(self._page_rows(limit, after, filters))
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            last = posts[-1]
+            next_cursor = PostCursor(created_at=last.created_at, id_=last.id_)
+
+        return PostPage(items=posts, next_cursor=next_cursor)
+
+    def list_post_versions_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[MemorySession] = None,
+        **filters,
+    ) -> List[PostVersion]:
+        """Версии постов страницы `list_posts_page` и первого поста следующей страницы
+
+        Последний элемент есть, только если есть следующая страница: от нее зависит курсор.
+        """
+        if session is not None:
+            return self._list_post_versions_page_with_session(session, limit, after, filters)
+
+        with self._store.get_read_session() as session:
+            return self._list_post_versions_page_with_session(session, limit, after, filters)
+
+    def _list_post_versions_page_with_session(
+        self, session: MemorySession, limit: int, after: Optional[PostCursor], filters: dict
+    ) -> List[PostVersion]:
+        """Внутренний метод для версий страницы"""
+        return [self._to_version(row) for row in self._page_rows(limit, after, filters)]
+
+    def _page_rows(self, limit: int, after: Optional[PostCursor], filters: dict) -> List[Post]:
+        """Строки страницы ленты от новых к старым строго после `after`; на одну больше `limit`"""
+        before = (after.created_at, after.id_) if after is not None else None
+        return list(itertools.islice(self._filtered_rows(filters, True, before), limit + 1))
+
+    def search_posts(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[SearchCursor] = None,
+        session: Optional[MemorySession] = None,
+        **filters,
+    ) -> PostPage:
+        """Поиск по заголовку и тексту, от самых релевантных к менее релевантным
+
+        `query` разбирается как в `websearch_to_tsquery`: слова, "фраза", -исключение, OR.
+        Ранг — сумма весов вхождений слов запроса: в заголовке 1.0, в тексте 0.4.
+        """
+        if session is not None:
+            return self._search_posts_with_session(session, query, limit, after, filters)
+
+        with self._store.get_read_session() as session:
+            return self._search_posts_with_session(session, query, limit, after, filters)
+
+    def _search_posts_with_session(
+        self,
+        session: MemorySession,
+        query: str,
+        limit: int,
+        after: Optional[SearchCursor],
+        filters: dict,
+    ) -> PostPage:
+        """Внутренний метод для поиска постов с keyset-пагинацией по (rank, id)"""
+        groups = _parse_search_query(query)
+        found = []
+        for row in self._filtered_rows(filters) if groups else ():
+            rank = _search_rank(groups, row)
+            if rank is not None and (after is None or (rank, row.id_) < (after.rank, after.id_)):
+                found.append((rank, row))
+
+        found.sort(key=lambda item: (item[0], item[1].id_), reverse=True)
+        found = found[: limit + 1]
+
+        next_cursor = None
+        if len(found) > limit:
+            found = found[:limit]
+            last_rank, last_row = found[-1]
+            next_cursor = SearchCursor(rank=last_rank, id_=last_row.id_)
+
+        return PostPage(
+            items=self._to_domain_list(row for _, row in found), next_cursor=next_cursor
+        )
+
+    def export_posts(
+        self,
+        after: Optional[PostCursor] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        session: Optional[MemorySession] = None,
+        **filters,
+    ) -> Iterator[List[Post]]:
+        """Выгрузить посты пачками по `batch_size`, от старых к новым по (created_at, id)
+
+        Посты выгрузки выбираются сразу, снимком; пачки строятся из снимка вне блокировки
+        хранилища, поэтому выгрузка не задерживает другие запросы.
+        `after` — позиция последнего выгруженного поста: выгрузка продолжится после него.
+        """
+        if session is not None:
+            rows = self._export_rows_with_session(session, after, filters)
+        else:
+            with self._store.get_read_session() as session:
+                rows = self._export_rows_with_session(session, after, filters)
+
+        tags = self._store.tags
+        for start in range(0, len(rows), batch_size):
+            yield [
+                self._copy(row, [tags[tag_id] for tag_id in tag_ids if tag_id in tags])
+                for row, tag_ids in rows[start : start + batch_size]
+            ]
+
+    def _export_rows_with_session(
+        self, session: MemorySession, after: Optional[PostCursor], filters: dict
+    ) -> List[tuple]:
+        """Внутренний метод: строки выгрузки с ID их тегов на момент снимка"""
+        start_after = (after.created_at, after.id_) if after is not None else None
+        return [
+            (row, tuple(self._store.post_tag_ids[row.id_]))
+            for row in self._filtered_rows(filters, False, start_after)
+        ]
+
+    def _filtered_rows(
+        self, filters: dict, descending: bool = True, bound: Optional[tuple] = None
+    ) -> Iterator[Post]:
+        """Строки по фильтрам списка постов в порядке индекса (created_at, id)
+
+        `bound` — ключ (created_at, id), строго после которого начинается выдача.
+        """
+        if "status" in filters:
+            index = self._store.status_index(filters["status"])
+        else:
+            index = self._store.posts_by_created
+
+        start, stop = index.bounds(filters.get("created_after"), filters.get("created_before"))
+        if descending:
+            keys = index.descending(start, stop, before=bound)
+        else:
+            keys = index.ascending(start, stop, after=bound)
+
+        rows = (self._store.posts[id_] for _, id_ in keys)
+        if "title_contains" in filters:
+            rows = (row for row in rows if filters["title_contains"] in row.title)
+
+        return rows
+
+    def delete_post_by_id(self, id_: uuid.UUID, session: Optional[MemorySession] = None) -> None:
+        """Удалить пост по ID"""
+        if session is not None:
+            return self._delete_post_by_id_with_session(session, id_)
+
+        with self._store.get_session() as session:
+            return self._delete_post_by_id_with_session(session, id_)
+
+    def _delete_post_by_id_with_session(self, session: MemorySession, id_: uuid.UUID) -> None:
+        """Внутренний метод для удаления поста"""
+        self._get_row(id_)
+        session.delete_post(id_)
+
+    def attach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[MemorySession] = None,
+    ) -> None:
+        """Привязать теги к посту; уже привязанные теги пропускаются
+
+        updated_at: новое время изменения поста, если привязки изменились
+        """
+        if session is not None:
+            return self._attach_tags_with_session(session, id_, tag_ids, updated_at)
+
+        with self._store.get_session() as session:
+            return self._attach_tags_with_session(session, id_, tag_ids, updated_at)
+
+    def _attach_tags_with_session(
+        self,
+        session: MemorySession,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+    ) -> None:
+        """Внутренний метод для привязки тегов"""
+        tag_ids = list(dict.fromkeys(tag_ids))
+        self._check_post_and_tags(id_, tag_ids)
+
+        changed = sum(session.link(id_, tag_id) for tag_id in tag_ids)
+        self._touch_post_with_session(session, id_, updated_at, changed)
+
+    def detach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[MemorySession] = None,
+    ) -> None:
+        """Отвязать теги от поста; не привязанные теги пропускаются
+
+        updated_at: новое время изменения поста, если привязки изменились
+        """
+        if session is not None:
+            return self._detach_tags_with_session(session, id_, tag_ids, updated_at)
+
+        with self._store.get_session() as session:
+            return self._detach_tags_with_session(session, id_, tag_ids, updated_at)
+
+    def _detach_tags_with_session(
+        self,
+        session: MemorySession,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+    ) -> None:
+        """Внутренний метод для отвязки тегов"""
+        tag_ids = list(dict.fromkeys(tag_ids))
+        self._check_post_and_tags(id_, tag_ids)
+
+        changed = sum(session.unlink(id_, tag_id) for tag_id in tag_ids)
+        self._touch_post_with_session(session, id_, updated_at, changed)
+
+    def _touch_post_with_session(
+        self,
+        session: MemorySession,
+        id_: uuid.UUID,
+        updated_at: Optional[Datetime],
+        changed: int,
+    ) -> None:
+        """Обновить updated_at поста после изменения его тегов: теги входят в ответ и ETag"""
+        if updated_at is not None and changed:
+            row = self._store.posts[id_]
+            session.replace_post(
+                Post(row.id_, row.title, row.body, row.status, row.created_at, updated_at)
+            )
+
+    def _check_post_and_tags(self, id_: uuid.UUID, tag_ids: List[uuid.UUID]) -> None:
+        """Проверить, что пост и все теги существуют"""
+        self._get_row(id_)
+
+        if any(tag_id not in self._store.tags for tag_id in tag_ids):
+            raise NotFoundError(instance_type=PostTag)
+
+    def _get_row(self, id_: uuid.UUID) -> Post:
+        row = self._store.posts.get(id_)
+        if row is None:
+            raise NotFoundError(instance_type=Post)
+
+        return row
+
+    @staticmethod
+    def _row(post: Post) -> Post:
+        """Строка хранилища: копия полей поста без тегов, вызывающий код может менять пост"""
+        return Post(post.id_, post.title, post.body, post.status, post.created_at, post.updated_at)
+
+    @staticmethod
+    def _copy(row: Post, tags: Optional[List[PostTag]] = None) -> Post:
+        return Post(row.id_, row.title, row.body, row.status, row.created_at, row.updated_at, tags)
+
+    def _to_domain(self, row: Post) -> Post:
+        """Пост с тегами; объекты тегов общие для всех постов, как в выборке из БД"""
+        tags = self._store.tags
+        return self._copy(row, [tags[tag_id] for tag_id in self._store.post_tag_ids[row.id_]])
+
+    def _to_domain_list(self, rows) -> List[Post]:
+        return [self._to_domain(row) for row in rows]
+
+    @staticmethod
+    def _to_version(row: Post) -> PostVersion:
+        return PostVersion(row.id_, row.status, row.updated_at)
+
+
+def _parse_search_query(query: str) -> List[List[tuple]]:
+    """Запрос как websearch_to_tsquery: группы через OR, в группе — условия через AND
+
+    Условие — (исключение, слова подряд). Пустой результат — запрос без слов,
+    он ничего не находит.
+    """
+    groups = [[]]
+    for match in _QUERY_ITEM_RE.finditer(query):
+        negated = bool(match.group(1) or match.group(3))
+        text = match.group(2) if match.group(2) is not None else match.group(4)
+
+        if not negated and match.group(4) is not None and text.lower() == "or":
+            groups.append([])
+            continue
+
+        words = tuple(word.lower() for word in _WORD_RE.findall(text))
+        if words:
+            groups[-1].append((negated, words))
+
+    return [group for group in groups if group]
+
+
+def _search_rank(groups: List[List[tuple]], row: Post) -> Optional[float]:
+    """Ранг поста по запросу; None — пост не подходит"""
+    title_lower = row.title.lower()
+    body_lower = row.body.lower()
+
+    # Дешевая проверка подстрокой: без нее пришлось бы разбирать на слова каждый пост
+    if not any(
+        all(
+            negated or all(word in title_lower or word in body_lower for word in words)
+            for negated, words in group
+        )
+        for group in groups
+    ):
+        return None
+
+    title = _WORD_RE.findall(title_lower)
+    body = _WORD_RE.findall(body_lower)
+    document = title + body
+
+    rank = None
+    for group in groups:
+        group_rank = 0.0
+        for negated, words in group:
+            positions = _phrase_positions(document, words)
+            if bool(positions) == negated:
+                break
+
+            for position in positions:
+                in_title = position < len(title)
+                group_rank += SEARCH_TITLE_WEIGHT if in_title else SEARCH_BODY_WEIGHT
+        else:
+            rank = max(rank or 0.0, group_rank)
+
+    return rank
+
+
+def _phrase_positions(document: List[str], words: tuple) -> List[int]:
+    """Позиции, с которых в документе идут слова `words` подряд"""
+    first, rest = words[0], words[1:]
+    return [
+        position
+        for position, word in enumerate(document)
+        if word == first and tuple(document[position + 1 : position + len(words)]) == rest
+    ]
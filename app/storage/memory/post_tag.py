@@ -0,0 +1,209 @@
+import itertools
+import uuid
+from datetime import datetime as Datetime
+from typing import List, Optional
+
+from app.domain.interfaces.storage.post_tag import PostTagRepository as PostTagRepositoryInterface
+from app.domain.models.errors.domain import NotFoundError
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag, PostTagChange
+from app.storage.memory.store import MemorySession, MemoryStore
+
+# Колонки сортировки `list_post_tags_by_filters`
+_ORDER_COLUMNS = {
+    "id": lambda tag: tag.id_,
+    "name": lambda tag: tag.name,
+}
+
+
+class PostTagRepository(PostTagRepositoryInterface):
+    """In-memory репозиторий для тегов постов"""
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    def create_post_tag(self, post_tag: PostTag, session: Optional[MemorySession] = None) -> None:
+        """Создать новый тег"""
+        if session is not None:
+            return self._create_post_tag_with_session(session, post_tag)
+
+        with self._store.get_session() as session:
+            return self._create_post_tag_with_session(session, post_tag)
+
+    def _create_post_tag_with_session(self, session: MemorySession, post_tag: PostTag) -> None:
+        """Внутренний метод для создания тега"""
+        session.insert_tag(PostTag(id_=post_tag.id_, name=post_tag.name))
+
+    def get_post_tag_by_id(
+        self, id_: uuid.UUID, session: Optional[MemorySession] = None
+    ) -> PostTag:
+        """Получить тег по ID"""
+        if session is not None:
+            return self._get_post_tag_by_id_with_session(session, id_)
+
+        with self._store.get_read_session() as session:
+            return self._get_post_tag_by_id_with_session(session, id_)
+
+    def _get_post_tag_by_id_with_session(self, session: MemorySession, id_: uuid.UUID) -> PostTag:
+        """Внутренний метод для получения тега по ID"""
+        post_tag = self._store.tags.get(id_)
+        if post_tag is None:
+            raise NotFoundError(instance_type=PostTag)
+
+        return post_tag
+
+    def update_post_tag(
+        self,
+        post_tag: PostTag,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[MemorySession] = None,
+    ) -> PostTagChange:
+        """Обновить тег; постам с ним ставится `updated_at`, если он передан"""
+        if session is not None:
+            return self._update_post_tag_with_session(session, post_tag, updated_at)
+
+        with self._store.get_session() as session:
+            return self._update_post_tag_with_session(session, post_tag, updated_at)
+
+    def _update_post_tag_with_session(
+        self, session: MemorySession, post_tag: PostTag, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Внутренний метод для обновления тега"""
+        old = self._store.tags.get(post_tag.id_)
+        if old is None:
+            raise NotFoundError(instance_type=PostTag)
+
+        # Объекты тегов общие для постов выборок: переименование заменяет объект
+        session.replace_tag(PostTag(id_=post_tag.id_, name=post_tag.name))
+
+        return PostTagChange(
+            old.name, self._touch_posts_with_session(session, post_tag.id_, updated_at)
+        )
+
+    def list_post_tags_by_filters(
+        self, *args, session: Optional[MemorySession] = None, **kwargs
+    ) -> List[PostTag]:
+        """Получить список тегов с фильтрацией"""
+        if session is not None:
+            return self._list_post_tags_by_filters_with_session(session, kwargs)
+
+        with self._store.get_read_session() as session:
+            return self._list_post_tags_by_filters_with_session(session, kwargs)
+
+    def _list_post_tags_by_filters_with_session(
+        self, session: MemorySession, filters: dict
+    ) -> List[PostTag]:
+        """Внутренний метод для получения списка тегов с фильтрацией"""
+        if "name" in filters:
+            # Точное имя — запрос по индексу имен
+            id_ = self._store.tag_ids_by_name.get(filters["name"])
+            tags = [self._store.tags[id_]] if id_ is not None else []
+        else:
+            tags = self._store.tags.values()
+
+        if "name_contains" in filters:
+            tags = [tag for tag in tags if filters["name_contains"] in tag.name]
+
+        # Сортировка
+        order_by = filters.get("order_by", "name")
+        descending = filters.get("order_direction", "asc") == "desc"
+        tags = sorted(tags, key=_ORDER_COLUMNS[order_by], reverse=descending)
+
+        # Пагинация
+        limit = filters.get("limit")
+        offset = filters.get("offset", 0)
+
+        if limit:
+            tags = list(itertools.islice(tags, offset, offset + limit))
+
+        return tags
+
+    def delete_post_tag_by_id(
+        self,
+        id_: uuid.UUID,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[MemorySession] = None,
+    ) -> PostTagChange:
+        """Удалить тег по ID; постам, от которых он отвязан, ставится `updated_at`"""
+        if session is not None:
+            return self._delete_post_tag_by_id_with_session(session, id_, updated_at)
+
+        with self._store.get_session() as session:
+            return self._delete_post_tag_by_id_with_session(session, id_, updated_at)
+
+    def _delete_post_tag_by_id_with_session(
+        self, session: MemorySession, id_: uuid.UUID, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        """Внутренний метод для удаления тега"""
+        old = self._store.tags.get(id_)
+        if old is None:
+            raise NotFoundError(instance_type=PostTag)
+
+        post_ids = self._touch_posts_with_session(session, id_, updated_at)
+        session.delete_tag(id_)
+
+        return PostTagChange(old.name, post_ids)
+
+    def _touch_posts_with_session(
+        self, session: MemorySession, id_: uuid.UUID, updated_at: Optional[Datetime]
+    ) -> List[uuid.UUID]:
+        """ID постов с тегом; с `updated_at` — еще и обновить им время изменения"""
+        post_ids = list(self._store.tag_post_ids[id_])
+        if updated_at is not None:
+            for post_id in post_ids:
+                row = self._store.posts[post_id]
+                session.replace_post(
+                    Post(row.id_, row.title, row.body, row.status, row.created_at, updated_at)
+                )
+
+        return post_ids
+
+    def get_post_tag_by_name(
+        self, name: str, session: Optional[MemorySession] = None
+    ) -> Optional[PostTag]:
+        """Получить тег по имени"""
+        if session is not None:
+            return self._get_post_tag_by_name_with_session(session, name)
+
+        with self._store.get_read_session() as session:
+            return self._get_post_tag_by_name_with_session(session, name)
+
+    def _get_post_tag_by_name_with_session(
+        self, session: MemorySession, name: str
+    ) -> Optional[PostTag]:
+        """Внутренний метод для получения тега по имени"""
+        id_ = self._store.tag_ids_by_name.get(name)
+
+        return self._store.tags[id_] if id_ is not None else None
+
+    def get_or_create_post_tag(self, name: str, session: Optional[MemorySession] = None) -> PostTag:
+        """Получить существующий тег или создать новый"""
+        return self.get_or_create_post_tags([name], session=session)[0]
+
+    def get_or_create_post_tags(
+        self, names: List[str], session: Optional[MemorySession] = None
+    ) -> List[PostTag]:
+        """Получить теги по именам, создав недостающие
+
+        Теги возвращаются в порядке первого вхождения имени, повторы убираются.
+        """
+        if session is not None:
+            return self._get_or_create_post_tags_with_session(session, names)
+
+        with self._store.get_session() as session:
+            return self._get_or_create_post_tags_with_session(session, names)
+
+    def _get_or_create_post_tags_with_session(
+        self, session: MemorySession, names: List[str]
+    ) -> List[PostTag]:
+        """Внутренний метод для получения и создания тегов по именам"""
+        post_tags = []
+        for name in dict.fromkeys(names):
+            id_ = self._store.tag_ids_by_name.get(name)
+            if id_ is None:
+                id_ = uuid.uuid4()
+                session.insert_tag(PostTag(id_=id_, name=name))
+
+            post_tags.append(self._store.tags[id_])
+
+        return post_tags
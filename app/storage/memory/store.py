@@ -0,0 +1,349 @@
+"""
+Хранилище in-memory backend: таблицы, вторичные индексы и транзакции
+
+Строки хранятся доменными объектами и не изменяются на месте: изменение заменяет
+объект целиком, поэтому снимок ссылок на строки (выгрузка) остается согласованным.
+Сессии выполняются по одной под общей блокировкой — это уровень SERIALIZABLE без
+конфликтов. Сессия записывает обратную операцию для каждого изменения; исключение
+внутри `get_session`/`transaction` или `rollback()` возвращает хранилище к снимку
+на начало транзакции.
+"""
+
+import bisect
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime as Datetime
+from typing import Callable, Iterator, Optional
+
+from app.domain.models.errors.domain import AlreadyExistsError
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.domain.models.user import User
+
+# Наибольший UUID: верхняя граница ключей (created_at, id) с заданным created_at
+_MAX_UUID = uuid.UUID(int=(1 << 128) - 1)
+
+# Начиная с такой пачки ключи добавляются в индекс одной сортировкой, а не вставками
+_BULK_INDEX_THRESHOLD = 16
+
+
+class SortedKeys:
+    """Индекс ключей (created_at, id) по возрастанию, как B-дерево `(created_at, id)` в БД"""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self):
+        self._keys: list[tuple[Datetime, uuid.UUID]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: tuple) -> None:
+        bisect.insort(self._keys, key)
+
+    def add_many(self, keys: list[tuple]) -> None:
+        if len(keys) < _BULK_INDEX_THRESHOLD:
+            for key in keys:
+                self.add(key)
+            return
+
+        # Timsort сливает уже упорядоченный индекс и отсортированную пачку за линейное время
+        self._keys.extend(keys)
+        self._keys.sort()
+
+    def remove(self, key: tuple) -> None:
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def remove_many(self, keys: set) -> None:
+        self._keys = [key for key in self._keys if key not in keys]
+
+    def bounds(
+        self, created_after: Optional[Datetime] = None, created_before: Optional[Datetime] = None
+    ) -> tuple[int, int]:
+        """Позиции ключей с created_after <= created_at <= created_before"""
+        start = 0 if created_after is None else bisect.bisect_left(self._keys, (created_after,))
+        stop = len(self._keys)
+        if created_before is not None:
+            stop = bisect.bisect_right(self._keys, (created_before, _MAX_UUID))
+        return start, stop
+
+    def descending(self, start: int, stop: int, before: Optional[tuple] = None) -> Iterator[tuple]:
+        """Ключи позиций [start, stop) от больших к меньшим, строго меньше `before`"""
+        if before is not None:
+            stop = min(stop, bisect.bisect_left(self._keys, before))
+        return (self._keys[index] for index in range(stop - 1, start - 1, -1))
+
+    def ascending(self, start: int, stop: int, after: Optional[tuple] = None) -> Iterator[tuple]:
+        """Ключи позиций [start, stop) от меньших к большим, строго больше `after`"""
+        if after is not None:
+            start = max(start, bisect.bisect_right(self._keys, after))
+        return (self._keys[index] for index in range(start, stop))
+
+
+class MemoryStore:
+    """Таблицы постов, тегов, их связей и пользователей с вторичными индексами
+
+    Индексы: посты по (created_at, id) — все и по каждому статусу, теги и пользователи —
+    по имени (уникальность), связи — в обе стороны. Изменяются только через `MemorySession`.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+        self.posts: dict[uuid.UUID, Post] = {}
+        self.posts_by_created = SortedKeys()
+        self.posts_by_status: dict[str, SortedKeys] = {}
+
+        self.tags: dict[uuid.UUID, PostTag] = {}
+        self.tag_ids_by_name: dict[str, uuid.UUID] = {}
+
+        # Связи постов и тегов; теги поста — в порядке привязки
+        self.post_tag_ids: dict[uuid.UUID, dict[uuid.UUID, None]] = {}
+        self.tag_post_ids: dict[uuid.UUID, set[uuid.UUID]] = {}
+
+        self.users: dict[uuid.UUID, User] = {}
+        self.user_ids_by_name: dict[str, uuid.UUID] = {}
+
+    @contextmanager
+    def get_session(self) -> Iterator["MemorySession"]:
+        """Сессия-транзакция: изменения применяются сразу и откатываются при исключении"""
+        with self._lock:
+            session = MemorySession(self)
+            try:
+                yield session
+            except BaseException:
+                session.rollback()
+                raise
+            finally:
+                session.commit()
+
+    @contextmanager
+    def get_read_session(self) -> Iterator["MemorySession"]:
+        """Сессия для чтения; реплик нет, это та же сессия, что и `get_session`"""
+        with self.get_session() as session:
+            yield session
+
+    @contextmanager
+    def transaction(self, isolation_level: Optional[str] = None) -> Iterator["MemorySession"]:
+        """Транзакция; уровень изоляции не учитывается: сессии и так выполняются по одной"""
+        with self.get_session() as session:
+            yield session
+
+    def stats(self) -> dict:
+        """Число строк в таблицах для внутреннего API и метрик"""
+        with self._lock:
+            return {
+                "posts": len(self.posts),
+                "post_tags": len(self.tags),
+                "posts_tags": sum(len(post_ids) for post_ids in self.tag_post_ids.values()),
+                "users": len(self.users),
+            }
+
+    def status_index(self, status: str) -> SortedKeys:
+        return self.posts_by_status.get(status) or SortedKeys()
+
+    # Изменения без журнала: их вызывает сессия и откат сессии
+
+    def _put_post(self, post: Post) -> None:
+        old = self.posts.get(post.id_)
+        self.posts[post.id_] = post
+
+        if old is not None and (old.status, old.created_at) == (post.status, post.created_at):
+            return
+
+        key = (post.created_at, post.id_)
+        if old is not None:
+            self._unindex_post(old)
+        self.posts_by_created.add(key)
+        self.posts_by_status.setdefault(post.status, SortedKeys()).add(key)
+        self.post_tag_ids.setdefault(post.id_, {})
+
+    def _put_posts(self, posts: list[Post]) -> None:
+        """Вставка пачки новых постов с одной сортировкой каждого индекса"""
+        by_status = {}
+        for post in posts:
+            self.posts[post.id_] = post
+            self.post_tag_ids[post.id_] = {}
+            by_status.setdefault(post.status, []).append((post.created_at, post.id_))
+
+        self.posts_by_created.add_many(sorted(key for keys in by_status.values() for key in keys))
+        for status, keys in by_status.items():
+            self.posts_by_status.setdefault(status, SortedKeys()).add_many(sorted(keys))
+
+    def _drop_posts(self, ids: list[uuid.UUID]) -> None:
+        """Удаление пачки постов с одним проходом по каждому индексу"""
+        keys_by_status = {}
+        for id_ in ids:
+            post = self.posts.pop(id_)
+            self.post_tag_ids.pop(id_, None)
+            keys_by_status.setdefault(post.status, set()).add((post.created_at, post.id_))
+
+        self.posts_by_created.remove_many(set().union(*keys_by_status.values()))
+        for status, keys in keys_by_status.items():
+            self.posts_by_status[status].remove_many(keys)
+
+    def _drop_post(self, id_: uuid.UUID) -> None:
+        post = self.posts.pop(id_)
+        self.post_tag_ids.pop(id_, None)
+        self._unindex_post(post)
+
+    def _unindex_post(self, post: Post) -> None:
+        key = (post.created_at, post.id_)
+        self.posts_by_created.remove(key)
+        self.posts_by_status[post.status].remove(key)
+
+    def _put_tag(self, tag: PostTag) -> None:
+        old = self.tags.get(tag.id_)
+        if old is not None:
+            del self.tag_ids_by_name[old.name]
+        self.tags[tag.id_] = tag
+        self.tag_ids_by_name[tag.name] = tag.id_
+        self.tag_post_ids.setdefault(tag.id_, set())
+
+    def _drop_tag(self, id_: uuid.UUID) -> None:
+        tag = self.tags.pop(id_)
+        del self.tag_ids_by_name[tag.name]
+        self.tag_post_ids.pop(id_, None)
+
+    def _link(self, post_id: uuid.UUID, tag_id: uuid.UUID) -> None:
+        self.post_tag_ids[post_id][tag_id] = None
+        self.tag_post_ids[tag_id].add(post_id)
+
+    def _unlink(self, post_id: uuid.UUID, tag_id: uuid.UUID) -> None:
+        del self.post_tag_ids[post_id][tag_id]
+        self.tag_post_ids[tag_id].discard(post_id)
+
+    def _put_user(self, user: User) -> None:
+        old = self.users.get(user.id_)
+        if old is not None:
+            del self.user_ids_by_name[old.username]
+        self.users[user.id_] = user
+        self.user_ids_by_name[user.username] = user.id_
+
+    def _drop_user(self, id_: uuid.UUID) -> None:
+        user = self.users.pop(id_)
+        del self.user_ids_by_name[user.username]
+
+
+class MemorySession:
+    """Транзакция `MemoryStore`: изменения с проверкой ограничений и журнал для отката
+
+    Ограничения те же, что у схемы БД: уникальные ID и имена тегов и пользователей;
+    удаление поста или тега удаляет его связи (ON DELETE CASCADE).
+    """
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+        self._undo: list[Callable[[], None]] = []
+
+    def commit(self) -> None:
+        self._undo.clear()
+
+    def rollback(self) -> None:
+        """Вернуть хранилище к состоянию на начало транзакции"""
+        while self._undo:
+            self._undo.pop()()
+
+    def insert_post(self, post: Post) -> None:
+        if post.id_ in self.store.posts:
+            raise AlreadyExistsError(instance_type=Post, field_name="id", field_value=str(post.id_))
+
+        self.store._put_post(post)
+        self._undo.append(lambda: self.store._drop_post(post.id_))
+
+    def insert_posts(self, posts: list[Post]) -> None:
+        ids = set()
+        for post in posts:
+            if post.id_ in self.store.posts or post.id_ in ids:
+                raise AlreadyExistsError(
+                    instance_type=Post, field_name="id", field_value=str(post.id_)
+                )
+            ids.add(post.id_)
+
+        self.store._put_posts(posts)
+        self._undo.append(lambda: self.store._drop_posts(list(ids)))
+
+    def replace_post(self, post: Post) -> None:
+        old = self.store.posts[post.id_]
+        self.store._put_post(post)
+        self._undo.append(lambda: self.store._put_post(old))
+
+    def delete_post(self, id_: uuid.UUID) -> None:
+        for tag_id in list(self.store.post_tag_ids[id_]):
+            self.unlink(id_, tag_id)
+
+        old = self.store.posts[id_]
+        self.store._drop_post(id_)
+        self._undo.append(lambda: self.store._put_post(old))
+
+    def insert_tag(self, tag: PostTag) -> None:
+        if tag.name in self.store.tag_ids_by_name:
+            raise AlreadyExistsError(instance_type=PostTag, field_name="name", field_value=tag.name)
+        if tag.id_ in self.store.tags:
+            raise AlreadyExistsError(
+                instance_type=PostTag, field_name="id", field_value=str(tag.id_)
+            )
+
+        self.store._put_tag(tag)
+        self._undo.append(lambda: self.store._drop_tag(tag.id_))
+
+    def replace_tag(self, tag: PostTag) -> None:
+        old = self.store.tags[tag.id_]
+        if self.store.tag_ids_by_name.get(tag.name, tag.id_) != tag.id_:
+            raise AlreadyExistsError(instance_type=PostTag, field_name="name", field_value=tag.name)
+
+        self.store._put_tag(tag)
+        self._undo.append(lambda: self.store._put_tag(old))
+
+    def delete_tag(self, id_: uuid.UUID) -> None:
+        for post_id in list(self.store.tag_post_ids[id_]):
+            self.unlink(post_id, id_)
+
+        old = self.store.tags[id_]
+        self.store._drop_tag(id_)
+        self._undo.append(lambda: self.store._put_tag(old))
+
+    def link(self, post_id: uuid.UUID, tag_id: uuid.UUID) -> bool:
+        """Привязать тег к посту; False — связь уже была"""
+        if tag_id in self.store.post_tag_ids[post_id]:
+            return False
+
+        self.store._link(post_id, tag_id)
+        self._undo.append(lambda: self.store._unlink(post_id, tag_id))
+        return True
+
+    def unlink(self, post_id: uuid.UUID, tag_id: uuid.UUID) -> bool:
+        """Отвязать тег от поста; False — связи не было"""
+        if tag_id not in self.store.post_tag_ids[post_id]:
+            return False
+
+        self.store._unlink(post_id, tag_id)
+        self._undo.append(lambda: self.store._link(post_id, tag_id))
+        return True
+
+    def insert_user(self, user: User) -> None:
+        if user.username in self.store.user_ids_by_name or user.id_ in self.store.users:
+            raise AlreadyExistsError(
+                instance_type=User, field_name="username", field_value=user.username
+            )
+
+        self.store._put_user(user)
+        self._undo.append(lambda: self.store._drop_user(user.id_))
+
+    def replace_user(self, user: User) -> None:
+        old = self.store.users[user.id_]
+        if self.store.user_ids_by_name.get(user.username, user.id_) != user.id_:
+            raise AlreadyExistsError(
+                instance_type=User, field_name="username", field_value=user.username
+            )
+
+        self.store._put_user(user)
+        self._undo.append(lambda: self.store._put_user(old))
+
+    def delete_user(self, id_: uuid.UUID) -> None:
+        old = self.store.users[id_]
+        self.store._drop_user(id_)
+        self._undo.append(lambda: self.store._put_user(old))
@@ -0,0 +1,92 @@
+import uuid
+from typing import Optional
+
+from app.domain.interfaces.storage.user import UserRepository as UserRepositoryInterface
+from app.domain.models.errors.domain import NotFoundError
+from app.domain.models.user import User
+from app.storage.memory.store import MemorySession, MemoryStore
+
+
+class UserRepository(UserRepositoryInterface):
+    """In-memory репозиторий для пользователей"""
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    def get_user_by_id(self, id_: uuid.UUID, session: Optional[MemorySession] = None) -> User:
+        """Получить пользователя по ID"""
+        if session is not None:
+            return self._get_user_by_id_with_session(session, id_)
+
+        with self._store.get_read_session() as session:
+            return self._get_user_by_id_with_session(session, id_)
+
+    def _get_user_by_id_with_session(self, session: MemorySession, id_: uuid.UUID) -> User:
+        """Внутренний метод для получения пользователя по ID"""
+        user = self._store.users.get(id_)
+        if user is None:
+            raise NotFoundError(instance_type=User)
+
+        return User(id_=user.id_, username=user.username)
+
+    def create_user(self, user: User, session: Optional[MemorySession] = None) -> None:
+        """Создать нового пользователя"""
+        if session is not None:
+            return self._create_user_with_session(session, user)
+
+        with self._store.get_session() as session:
+            return self._create_user_with_session(session, user)
+
+    def _create_user_with_session(self, session: MemorySession, user: User) -> None:
+        """Внутренний метод для создания пользователя"""
+        session.insert_user(User(id_=user.id_, username=user.username))
+
+    def update_user(self, user: User, session: Optional[MemorySession] = None) -> None:
+        """Обновить пользователя"""
+        if session is not None:
+            return self._update_user_with_session(session, user)
+
+        with self._store.get_session() as session:
+            return self._update_user_with_session(session, user)
+
+    def _update_user_with_session(self, session: MemorySession, user: User) -> None:
+        """Внутренний метод для обновления пользователя"""
+        if user.id_ not in self._store.users:
+            raise NotFoundError(instance_type=User)
+
+        session.replace_user(User(id_=user.id_, username=user.username))
+
+    def delete_user_by_id(self, id_: uuid.UUID, session: Optional[MemorySession] = None) -> None:
+        """Удалить пользователя по ID"""
+        if session is not None:
+            return self._delete_user_by_id_with_session(session, id_)
+
+        with self._store.get_session() as session:
+            return self._delete_user_by_id_with_session(session, id_)
+
+    def _delete_user_by_id_with_session(self, session: MemorySession, id_: uuid.UUID) -> None:
+        """Внутренний метод для удаления пользователя"""
+        if id_ not in self._store.users:
+            raise NotFoundError(instance_type=User)
+
+        session.delete_user(id_)
+
+    def get_user_by_username(
+        self, username: str, session: Optional[MemorySession] = None
+    ) -> Optional[User]:
+        """Получить пользователя по username"""
+        if session is not None:
+            return self._get_user_by_username_with_session(session, username)
+
+        with self._store.get_read_session() as session:
+            return self._get_user_by_username_with_session(session, username)
+
+    def _get_user_by_username_with_session(
+        self, session: MemorySession, username: str
+    ) -> Optional[User]:
+        """Внутренний метод для получения пользователя по username"""
+        id_ = self._store.user_ids_by_name.get(username)
+        if id_ is None:
+            return None
+
+        return self._get_user_by_id_with_session(session, id_)
@@ -0,0 +1,209 @@
+"""
+Асинхронные репозитории для FastAPI-обработчиков
+
+Запросы не дублируются: асинхронные репозитории вызывают методы синхронных
+репозиториев с параметром `session`. Если передан `AsyncDatabaseManager`,
+вызов выполняется через `AsyncSession.run_sync` — ввод-вывод идет через asyncpg
+и не блокирует event loop. Без него (синхронный backend) вызов уходит в пул потоков.
+Методы только для чтения идут через `_run_read`: с `AsyncDatabaseManager` их сессия
+берется из `get_read_session`, синхронный репозиторий выбирает реплику сам.
+"""
+
+import asyncio
+import functools
+import uuid
+from datetime import datetime as Datetime
+from typing import AsyncIterator, Callable, List, Optional
+
+from app.domain.interfaces.storage.post import (
+    AsyncPostRepository as AsyncPostRepositoryInterface,
+    PostRepository,
+)
+from app.domain.interfaces.storage.post_tag import (
+    AsyncPostTagRepository as AsyncPostTagRepositoryInterface,
+    PostTagRepository,
+)
+from app.domain.interfaces.storage.user import (
+    AsyncUserRepository as AsyncUserRepositoryInterface,
+    UserRepository,
+)
+from app.domain.models.cursor import PostCursor, SearchCursor
+from app.domain.models.post import Post, PostPage, PostVersion
+from app.domain.models.post_tag import PostTag, PostTagChange
+from app.domain.models.user import User
+from app.storage.postgres.db import AsyncDatabaseManager
+
+
+class _AsyncRepository:
+    """Общая логика выполнения синхронного метода репозитория без блокировки event loop"""
+
+    def __init__(self, db_manager: Optional[AsyncDatabaseManager] = None):
+        self._db_manager = db_manager
+
+    async def _run(self, method: Callable, *args, **kwargs):
+        if self._db_manager is None:
+            return await asyncio.to_thread(functools.partial(method, *args, **kwargs))
+
+        async with self._db_manager.get_session() as session:
+            return await session.run_sync(
+                lambda sync_session: method(*args, session=sync_session, **kwargs)
+            )
+
+    async def _run_read(self, method: Callable, *args, **kwargs):
+        """Как `_run`, но для метода только для чтения: сессия может быть открыта на реплике"""
+        if self._db_manager is None:
+            return await asyncio.to_thread(functools.partial(method, *args, **kwargs))
+
+        async with self._db_manager.get_read_session() as session:
+            return await session.run_sync(
+                lambda sync_session: method(*args, session=sync_session, **kwargs)
+            )
+
+    async def _iterate(self, method: Callable, *args, **kwargs) -> AsyncIterator:
+        """Выдавать элементы синхронного генератора чтения, получая каждый вне event loop"""
+        if self._db_manager is None:
+            iterator = method(*args, **kwargs)
+            try:
+                while (item := await asyncio.to_thread(next, iterator, None)) is not None:
+                    yield item
+            finally:
+                await asyncio.to_thread(iterator.close)
+            return
+
+        # Сессия открыта на всю выгрузку: каждый шаг генератора выполняется в ее run_sync
+        async with self._db_manager.get_read_session() as session:
+            iterator = await session.run_sync(
+                lambda sync_session: method(*args, session=sync_session, **kwargs)
+            )
+            try:
+                while (item := await session.run_sync(lambda _: next(iterator, None))) is not None:
+                    yield item
+            finally:
+                await session.run_sync(lambda _: iterator.close())
+
+
+class AsyncPostRepository(_AsyncRepository, AsyncPostRepositoryInterface):
+    """Асинхронный репозиторий для постов"""
+
+    def __init__(
+        self, repository: PostRepository, db_manager: Optional[AsyncDatabaseManager] = None
+    ):
+        super().__init__(db_manager)
+        self._repository = repository
+
+    async def create_post(self, post: Post) -> None:
+        return await self._run(self._repository.create_post, post)
+
+    async def bulk_create_posts(self, posts: List[Post]) -> None:
+        return await self._run(self._repository.bulk_create_posts, posts)
+
+    async def get_post_by_id(self, id_: uuid.UUID) -> Post:
+        return await self._run_read(self._repository.get_post_by_id, id_)
+
+    async def get_post_version(self, id_: uuid.UUID) -> PostVersion:
+        return await self._run_read(self._repository.get_post_version, id_)
+
+    async def update_post(self, post: Post) -> None:
+        return await self._run(self._repository.update_post, post)
+
+    async def update_post_fields(
+        self, id_: uuid.UUID, fields: dict, expected_updated_at: Optional[Datetime] = None
+    ) -> Post:
+        return await self._run(
+            self._repository.update_post_fields, id_, fields, expected_updated_at
+        )
+
+    async def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> List[uuid.UUID]:
+        return await self._run(
+            self._repository.update_posts_status, status, updated_at, ids, filters, limit
+        )
+
+    async def list_posts_by_filters(self, *args, **kwargs) -> List[Post]:
+        return await self._run_read(self._repository.list_posts_by_filters, *args, **kwargs)
+
+    async def list_posts_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> PostPage:
+        return await self._run_read(self._repository.list_posts_page, limit, after, **filters)
+
+    async def list_post_versions_page(
+        self, limit: int, after: Optional[PostCursor] = None, **filters
+    ) -> List[PostVersion]:
+        return await self._run_read(
+            self._repository.list_post_versions_page, limit, after, **filters
+        )
+
+    async def search_posts(
+        self, query: str, limit: int, after: Optional[SearchCursor] = None, **filters
+    ) -> PostPage:
+        return await self._run_read(self._repository.search_posts, query, limit, after, **filters)
+
+    def export_posts(
+        self, after: Optional[PostCursor] = None, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[List[Post]]:
+        return self._iterate(self._repository.export_posts, after, batch_size, **filters)
+
+    async def delete_post_by_id(self, id_: uuid.UUID) -> None:
+        return await self._run(self._repository.delete_post_by_id, id_)
+
+    async def attach_tags(
+        self, id_: uuid.UUID, tag_ids: List[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
+        return await self._run(self._repository.attach_tags, id_, tag_ids, updated_at)
+
+    async def detach_tags(
+        self, id_: uuid.UUID, tag_ids: List[uuid.UUID], updated_at: Optional[Datetime] = None
+    ) -> None:
+        return await self._run(self._repository.detach_tags, id_, tag_ids, updated_at)
+
+
+class AsyncPostTagRepository(_AsyncRepository, AsyncPostTagRepositoryInterface):
+    """Асинхронный репозиторий для тегов постов"""
+
+    def __init__(
+        self, repository: PostTagRepository, db_manager: Optional[AsyncDatabaseManager] = None
+    ):
+        super().__init__(db_manager)
+        self._repository = repository
+
+    async def create_post_tag(self, post_tag: PostTag) -> None:
+        return await self._run(self._repository.create_post_tag, post_tag)
+
+    async def get_post_tag_by_id(self, id_: uuid.UUID) -> PostTag:
+        return await self._run_read(self._repository.get_post_tag_by_id, id_)
+
+    async def update_post_tag(
+        self, post_tag: PostTag, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        return await self._run(self._repository.update_post_tag, post_tag, updated_at)
+
+    async def list_post_tags_by_filters(self, *args, **kwargs) -> List[PostTag]:
+        return await self._run_read(self._repository.list_post_tags_by_filters, *args, **kwargs)
+
+    async def delete_post_tag_by_id(
+        self, id_: uuid.UUID, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
+        return await self._run(self._repository.delete_post_tag_by_id, id_, updated_at)
+
+    async def get_or_create_post_tags(self, names: List[str]) -> List[PostTag]:
+        return await self._run(self._repository.get_or_create_post_tags, names)
+
+
+class AsyncUserRepository(_AsyncRepository, AsyncUserRepositoryInterface):
+    """Асинхронный репозиторий для пользователей"""
+
+    def __init__(
+        self, repository: UserRepository, db_manager: Optional[AsyncDatabaseManager] = None
+    ):
+        super().__init__(db_manager)
+        self._repository = repository
+
+    async def get_user_by_id(self, id_: uuid.UUID) -> User:
+        return await self._run_read(self._repository.get_user_by_id, id_)
@@ -1,11 +1,39 @@
-from contextlib import contextmanager
-from typing import Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Connection, Engine, create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.storage.postgres.pool import PoolStatistics
+from app.storage.postgres.replicas import ReplicaSet, mark_write, primary_pinned, replica_name
 
 Base = declarative_base()
 
+# Недоступная реплика не должна задерживать чтение дольше, чем переход на основную БД
+REPLICA_CONNECT_TIMEOUT_SECONDS = 2
+
+
+def _eject_on_disconnect(replica_set: ReplicaSet, engines: list[Engine]) -> None:
+    """Исключать реплику, соединение с которой оборвалось во время запроса"""
+    for index, engine in enumerate(engines):
+
+        def on_error(context, index=index):
+            if context.is_disconnect:
+                replica_set.eject(index)
+
+        event.listen(engine, "handle_error", on_error)
+
 
 class DatabaseManager:
     """Менеджер для работы с базой данных PostgreSQL"""
@@ -13,29 +41,91 @@ class DatabaseManager:
     def __init__(self):
         self._engine: Optional[Engine] = None
         self._session_factory: Optional[sessionmaker] = None
+        self._pool_statistics = PoolStatistics()
+        self._replica_engines: list[Engine] = []
+        self._replica_session_factories: list[sessionmaker] = []
+        self._replica_set = ReplicaSet([])
+        self._read_your_writes = True
         self._initialized = False
 
     def initialize(
-        self, db_host: str, db_port: int, db_name: str, db_user: str, db_password: str
+        self,
+        db_host: str,
+        db_port: int,
+        db_name: str,
+        db_user: str,
+        db_password: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 3600,
+        statement_timeout_ms: Optional[int] = None,
+        replica_urls: Optional[list[str]] = None,
+        replica_retry_seconds: float = 30,
+        read_your_writes: bool = True,
     ) -> None:
-        """Инициализация подключения к базе данных"""
+        """Инициализация подключения к базе данных
+
+        statement_timeout_ms: ограничение времени выполнения запроса на стороне PostgreSQL
+        replica_urls: URL реплик для `get_read_session`, пулы с теми же настройками
+        replica_retry_seconds: на сколько исключается недоступная реплика
+        read_your_writes: после записи в запросе читать его данные из основной БД
+        """
         if self._initialized:
             return
 
         # Создаем URL подключения
         database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
+        connect_args = {}
+        if statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
         # Создаем движок
         self._engine = create_engine(
             database_url,
             echo=False,  # Установите True для отладки SQL запросов
-            pool_pre_ping=True,  # Проверка соединения перед использованием
-            pool_recycle=3600,  # Переподключение каждый час
+            poolclass=self._pool_statistics.pool_class(QueuePool),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,  # Проверка соединения перед использованием
+            pool_recycle=pool_recycle,  # Переподключение по истечении времени жизни
+            connect_args=connect_args,
         )
+        self._pool_statistics.attach(self._engine.pool)
 
         # Создаем фабрику сессий
         self._session_factory = sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
 
+        replica_urls = [make_url(url) for url in replica_urls or []]
+        replica_connect_args = {**connect_args, "connect_timeout": REPLICA_CONNECT_TIMEOUT_SECONDS}
+        for url in replica_urls:
+            replica_engine = create_engine(
+                url.set(drivername="postgresql"),
+                echo=False,
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                connect_args=replica_connect_args,
+            )
+            self._replica_engines.append(replica_engine)
+            self._replica_session_factories.append(
+                sessionmaker(bind=replica_engine, autocommit=False, autoflush=False)
+            )
+        self._replica_set = ReplicaSet(
+            [replica_name(url) for url in replica_urls], retry_after_seconds=replica_retry_seconds
+        )
+        _eject_on_disconnect(self._replica_set, self._replica_engines)
+
+        self._read_your_writes = read_your_writes
+        if self._replica_engines and read_your_writes:
+            event.listen(self._engine, "after_cursor_execute", mark_write)
+
         self._initialized = True
 
     @property
@@ -45,6 +135,25 @@ class DatabaseManager:
             raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
         return self._engine
 
+    def pool_statistics(self) -> dict:
+        """Текущее состояние и статистика пула соединений"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._pool_statistics.snapshot(self._engine.pool)
+
+    @property
+    def replica_engines(self) -> list[Engine]:
+        """Движки реплик в порядке replica_urls"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._replica_engines
+
+    def replica_statistics(self) -> dict:
+        """Чтения и исключения по репликам"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._replica_set.stats()
+
     @contextmanager
     def get_session(self) -> Session:
         """Контекстный менеджер для получения сессии БД"""
@@ -61,6 +170,100 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @contextmanager
+    def get_read_session(self) -> Iterator[Session]:
+        """Сессия только для чтения: с доступной реплики, иначе с основной БД
+
+        Реплики чередуются по кругу; реплика, к которой не удалось подключиться,
+        исключается на replica_retry_seconds. После записи в текущем
+        `read_routing_scope()` чтения идут в основную БД, если включен read_your_writes.
+        """
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+
+        session = self._open_replica_session()
+        if session is None:
+            with self.get_session() as session:
+                yield session
+            return
+
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _open_replica_session(self) -> Optional[Session]:
+        if not self._replica_engines:
+            return None
+
+        if not (self._read_your_writes and primary_pinned()):
+            for index in self._replica_set.candidates():
+                session = self._replica_session_factories[index]()
+                try:
+                    # Соединение берется сразу, чтобы недоступная реплика исключалась до запросов
+                    session.connection()
+                except OperationalError:
+                    session.close()
+                    self._replica_set.eject(index)
+                    continue
+
+                self._replica_set.record_read(index)
+                return session
+
+        self._replica_set.record_primary_read()
+        return None
+
+    def prewarm(self, connections: int) -> int:
+        """Открыть соединения пула основной БД параллельно и вернуть их в пул
+
+        Соединения держатся, пока не откроются все, иначе пул выдавал бы одно и то же.
+        Больше `pool_size` не открывается: лишние закрылись бы при возврате. Реплики не
+        прогреваются — недоступная реплика не должна мешать готовности воркера.
+        Возвращает число открытых соединений; ошибка подключения пробрасывается.
+        """
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+
+        count = max(1, min(connections, self._engine.pool.size()))
+
+        def connect() -> Connection:
+            connection = self._engine.connect()
+            try:
+                connection.execute(text("SELECT 1"))
+            except Exception:
+                connection.close()
+                raise
+            return connection
+
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="db-prewarm") as executor:
+            futures = [executor.submit(connect) for _ in range(count)]
+
+        opened, errors = [], []
+        for future in futures:
+            if future.exception() is None:
+                opened.append(future.result())
+            else:
+                errors.append(future.exception())
+
+        for connection in opened:
+            connection.close()
+
+        if errors:
+            raise errors[0]
+
+        return count
+
+    def dispose(self) -> None:
+        """Закрыть все подключения пулов основной БД и реплик"""
+        if self._initialized:
+            self._engine.dispose()
+            for replica_engine in self._replica_engines:
+                replica_engine.dispose()
+
     def create_tables(self) -> None:
         """Создание всех таблиц в базе данных"""
         if not self._initialized:
@@ -74,13 +277,19 @@ class DatabaseManager:
         Base.metadata.drop_all(bind=self._engine)
 
     @contextmanager
-    def transaction(self):
-        """Контекстный менеджер для транзакций с возможностью задания уровня изоляции"""
+    def transaction(self, isolation_level: Optional[str] = None):
+        """Контекстный менеджер для транзакций с возможностью задания уровня изоляции
+
+        isolation_level: "READ COMMITTED", "REPEATABLE READ" или "SERIALIZABLE"
+        """
         if not self._initialized:
             raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
 
         session = self._session_factory()
         try:
+            if isolation_level is not None:
+                session.connection(execution_options={"isolation_level": isolation_level})
+
             yield session
             session.commit()
         except Exception:
@@ -88,3 +297,218 @@ class DatabaseManager:
             raise
         finally:
             session.close()
+
+
+class AsyncDatabaseManager:
+    """Менеджер для асинхронной работы с базой данных PostgreSQL через asyncpg"""
+
+    def __init__(self):
+        self._engine: Optional[AsyncEngine] = None
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._pool_statistics = PoolStatistics()
+        self._replica_engines: list[AsyncEngine] = []
+        self._replica_session_factories: list[async_sessionmaker] = []
+        self._replica_set = ReplicaSet([])
+        self._read_your_writes = True
+        self._initialized = False
+
+    def initialize(
+        self,
+        db_host: str,
+        db_port: int,
+        db_name: str,
+        db_user: str,
+        db_password: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 3600,
+        statement_timeout_ms: Optional[int] = None,
+        replica_urls: Optional[list[str]] = None,
+        replica_retry_seconds: float = 30,
+        read_your_writes: bool = True,
+    ) -> None:
+        """Инициализация пула асинхронных подключений к базе данных
+
+        Параметры реплик — как у `DatabaseManager.initialize`.
+        """
+        if self._initialized:
+            return
+
+        database_url = f"postgresql+asyncpg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+        connect_args = {}
+        if statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+
+        self._engine = create_async_engine(
+            database_url,
+            echo=False,
+            poolclass=self._pool_statistics.pool_class(AsyncAdaptedQueuePool),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+            connect_args=connect_args,
+        )
+        self._pool_statistics.attach(self._engine.sync_engine.pool)
+
+        # expire_on_commit=False: доменные объекты собираются до commit,
+        # повторная подгрузка атрибутов после него не нужна
+        self._session_factory = async_sessionmaker(
+            bind=self._engine, autoflush=False, expire_on_commit=False
+        )
+
+        replica_urls = [make_url(url) for url in replica_urls or []]
+        replica_connect_args = {**connect_args, "timeout": REPLICA_CONNECT_TIMEOUT_SECONDS}
+        for url in replica_urls:
+            replica_engine = create_async_engine(
+                url.set(drivername="postgresql+asyncpg"),
+                echo=False,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                connect_args=replica_connect_args,
+            )
+            self._replica_engines.append(replica_engine)
+            self._replica_session_factories.append(
+                async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+            )
+        self._replica_set = ReplicaSet(
+            [replica_name(url) for url in replica_urls], retry_after_seconds=replica_retry_seconds
+        )
+        _eject_on_disconnect(
+            self._replica_set, [engine.sync_engine for engine in self._replica_engines]
+        )
+
+        self._read_your_writes = read_your_writes
+        if self._replica_engines and read_your_writes:
+            event.listen(self._engine.sync_engine, "after_cursor_execute", mark_write)
+
+        self._initialized = True
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Получить асинхронный движок базы данных"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._engine
+
+    def pool_statistics(self) -> dict:
+        """Текущее состояние и статистика пула соединений"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._pool_statistics.snapshot(self._engine.sync_engine.pool)
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        """Движки реплик в порядке replica_urls"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._replica_engines
+
+    def replica_statistics(self) -> dict:
+        """Чтения и исключения по репликам"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+        return self._replica_set.stats()
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[AsyncSession]:
+        """Асинхронный контекстный менеджер для получения сессии БД"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+
+        session = self._session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def get_read_session(self) -> AsyncIterator[AsyncSession]:
+        """Сессия только для чтения, выбор реплики — как в `DatabaseManager.get_read_session`"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+
+        session = await self._open_replica_session()
+        if session is None:
+            async with self.get_session() as session:
+                yield session
+            return
+
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def _open_replica_session(self) -> Optional[AsyncSession]:
+        if not self._replica_engines:
+            return None
+
+        if not (self._read_your_writes and primary_pinned()):
+            for index in self._replica_set.candidates():
+                session = self._replica_session_factories[index]()
+                try:
+                    await session.connection()
+                except (OperationalError, OSError, asyncio.TimeoutError):
+                    # asyncpg сообщает о недоступном сервере ошибками сокета и таймаутом
+                    await session.close()
+                    self._replica_set.eject(index)
+                    continue
+
+                self._replica_set.record_read(index)
+                return session
+
+        self._replica_set.record_primary_read()
+        return None
+
+    async def prewarm(self, connections: int) -> int:
+        """Открыть соединения пула основной БД параллельно, как `DatabaseManager.prewarm`"""
+        if not self._initialized:
+            raise RuntimeError("DatabaseManager не инициализирован. Вызовите initialize() сначала.")
+
+        count = max(1, min(connections, self._engine.sync_engine.pool.size()))
+
+        async with AsyncExitStack() as stack:
+
+            async def connect() -> None:
+                connection = await stack.enter_async_context(self._engine.connect())
+                await connection.execute(text("SELECT 1"))
+
+            # Дожидаемся всех попыток, чтобы ни одно соединение не открылось после выхода
+            results = await asyncio.gather(
+                *(connect() for _ in range(count)), return_exceptions=True
+            )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+        return count
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """Асинхронный контекстный менеджер для транзакций"""
+        async with self.get_session() as session:
+            yield session
+
+    async def dispose(self) -> None:
+        """Закрыть все подключения пулов основной БД и реплик"""
+        if self._initialized:
+            await self._engine.dispose()
+            for replica_engine in self._replica_engines:
+                await replica_engine.dispose()
@@ -0,0 +1,115 @@
+"""
+Учет SQL-запросов: число запросов и время в БД за HTTP-запрос, журнал медленных запросов
+
+Счетчики текущего запроса хранятся в contextvar. `asyncio.to_thread` и `run_sync`
+копируют контекст, поэтому запросы из пула потоков и из asyncpg попадают
+в счетчики того HTTP-запроса, который их выполнил.
+"""
+
+import contextvars
+import logging
+import re
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|%s")
+# Многострочные VALUES и длинные IN-списки сворачиваются, чтобы одинаковые запросы совпадали
+_REPEATED_ROWS = re.compile(r"\((?:\?, )*\?\)(?:, \((?:\?, )*\?\))+")
+_REPEATED_PARAMS = re.compile(r"\?(?:, \?)+")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL без параметров и лишних пробелов, одинаковый для запросов с разными значениями"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _REPEATED_ROWS.sub("(...), ...", statement)
+    return _REPEATED_PARAMS.sub("...", statement)
+
+
+# Метка запросов в журнале медленных запросов или функция, вычисляющая ее при записи:
+# шаблон маршрута известен только после роутинга, то есть после начала учета
+RouteLabel = Union[str, Callable[[], Optional[str]], None]
+
+
+class QueryStats:
+    """Счетчики SQL-запросов одного HTTP-запроса"""
+
+    def __init__(self, route: RouteLabel = None):
+        self._route = route
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def route(self) -> Optional[str]:
+        return self._route() if callable(self._route) else self._route
+
+    def record(self, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+
+
+_current_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries(route: RouteLabel = None) -> Iterator[QueryStats]:
+    """Собирать статистику SQL-запросов, выполненных внутри блока"""
+    stats = QueryStats(route)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class SQLInstrumentation:
+    """Обработчики событий движка: замер каждого запроса и журнал медленных запросов"""
+
+    def __init__(self, slow_query_threshold_ms: float = 200):
+        self._slow_query_threshold = slow_query_threshold_ms / 1000
+        # Ключ в Connection.info со стеком времени начала выполняемых запросов
+        self._start_key = f"query_start_time:{id(self)}"
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(self._start_key, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info[self._start_key].pop()
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(duration)
+
+        if duration >= self._slow_query_threshold:
+            route = stats.route if stats is not None else None
+            slow_query_logger.warning(
+                "slow query: duration_ms=%.1f route=%s sql=%s",
+                duration * 1000,
+                route or "-",
+                normalize_sql(statement),
+            )
+
+    def _handle_error(self, exception_context) -> None:
+        # Запрос упал: after_cursor_execute не будет вызван, снимаем его время со стека
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(self._start_key):
+            connection.info[self._start_key].pop()
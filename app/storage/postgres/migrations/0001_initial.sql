@@ -0,0 +1,37 @@
+-- Исходная схема. IF NOT EXISTS: базы, созданные раньше через create_all, принимают ее без изменений
+
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY,
+    username VARCHAR(255) NOT NULL UNIQUE,
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    updated_at TIMESTAMP WITHOUT TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id UUID PRIMARY KEY,
+    title VARCHAR(500) NOT NULL,
+    body TEXT NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    updated_at TIMESTAMP WITHOUT TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS post_tags (
+    id UUID PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    updated_at TIMESTAMP WITHOUT TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS posts_tags (
+    post_id UUID NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+    tag_id UUID NOT NULL REFERENCES post_tags (id) ON DELETE CASCADE,
+    PRIMARY KEY (post_id, tag_id)
+);
+
+-- Полнотекстовый поиск по заголовку и тексту поста
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING gin (search_vector);
@@ -0,0 +1,14 @@
+-- no-transaction
+-- Индексы строятся CONCURRENTLY, чтобы не блокировать запись в posts на больших таблицах
+
+-- Лента без фильтра: ORDER BY created_at DESC, id DESC LIMIT n читает только n строк индекса
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_created_at_id
+    ON posts (created_at DESC, id DESC);
+
+-- Лента с фильтром по статусу в том же порядке
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_status_created_at_id
+    ON posts (status, created_at DESC, id DESC);
+
+-- Посты тега и каскадное удаление тега; (post_id, tag_id) покрыт первичным ключом
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_tags_tag_id_post_id
+    ON posts_tags (tag_id, post_id);
@@ -0,0 +1,125 @@
+"""
+Версионные миграции схемы PostgreSQL
+
+Миграции — SQL-файлы `migrations/NNNN_описание.sql`, применяются по возрастанию номера,
+примененные версии записываются в таблицу `schema_migrations`. Файл, первая строка
+которого `-- no-transaction`, выполняется вне транзакции (нужно для CREATE INDEX CONCURRENTLY).
+Операторы в файле разделяются `;`.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.storage.postgres.db import DatabaseManager
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+NO_TRANSACTION_MARKER = "-- no-transaction"
+
+# Ключ advisory-блокировки: миграции из нескольких процессов выполняются по очереди
+MIGRATION_LOCK_ID = 7_245_001
+
+
+class Migration:
+    version: str
+    name: str
+    path: Path
+
+    def __init__(self, version: str, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    @property
+    def transactional(self) -> bool:
+        return not self.path.read_text().startswith(NO_TRANSACTION_MARKER)
+
+    def statements(self) -> List[str]:
+        lines = [line for line in self.path.read_text().splitlines() if not line.startswith("--")]
+        return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        migrations.append(Migration(version=version, name=name, path=path))
+
+    return migrations
+
+
+class Migrator:
+    """Применение миграций схемы, запускается отдельно от приложения: python -m app.cmd.migrate"""
+
+    def __init__(self, db_manager: DatabaseManager, migrations: Optional[List[Migration]] = None):
+        self._db_manager = db_manager
+        self._migrations = migrations if migrations is not None else load_migrations()
+
+    def applied_versions(self) -> set:
+        with self._db_manager.engine.begin() as connection:
+            self._ensure_versions_table(connection)
+            return set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+    def pending(self) -> List[Migration]:
+        applied = self.applied_versions()
+        return [migration for migration in self._migrations if migration.version not in applied]
+
+    def apply(self) -> List[Migration]:
+        """Применить неприменённые миграции и вернуть их список"""
+        applied = []
+
+        # Блокировка сессионная: держится и на время миграций вне транзакции. Соединение
+        # в autocommit, иначе CREATE INDEX CONCURRENTLY ждал бы его открытую транзакцию
+        engine = self._db_manager.engine
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_connection:
+            lock_connection.execute(
+                text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID}
+            )
+            try:
+                for migration in self.pending():
+                    self._apply_one(migration)
+                    applied.append(migration)
+            finally:
+                lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID}
+                )
+
+        return applied
+
+    def _apply_one(self, migration: Migration) -> None:
+        engine = self._db_manager.engine
+
+        if migration.transactional:
+            with engine.begin() as connection:
+                for statement in migration.statements():
+                    connection.exec_driver_sql(statement)
+                self._record(connection, migration)
+            return
+
+        # Операторы без транзакции идемпотентны (IF NOT EXISTS): после сбоя файл запускается заново
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for statement in migration.statements():
+                connection.exec_driver_sql(statement)
+        with engine.begin() as connection:
+            self._record(connection, migration)
+
+    @staticmethod
+    def _record(connection: Connection, migration: Migration) -> None:
+        connection.execute(
+            text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+            {"version": migration.version, "name": migration.name},
+        )
+
+    @staticmethod
+    def _ensure_versions_table(connection: Connection) -> None:
+        connection.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                " version VARCHAR(32) PRIMARY KEY,"
+                " name VARCHAR(255) NOT NULL,"
+                " applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now())"
+            )
+        )
@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, String, Table, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from app.storage.postgres.db import Base
 
@@ -19,11 +20,40 @@ class UserModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# Связь many-to-many между постами и тегами
+# Схема задается миграциями в migrations/; индексы объявлены и здесь, чтобы модели ей отвечали
+posts_tags = Table(
+    "posts_tags",
+    Base.metadata,
+    Column(
+        "post_id",
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        UUID(as_uuid=True),
+        ForeignKey("post_tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_posts_tags_tag_id_post_id", "tag_id", "post_id"),
+    extend_existing=True,
+)
+
+
+# Конфигурация полнотекстового поиска: без стемминга, одинаково для русского и английского
+SEARCH_CONFIG = "simple"
+
+
 class PostModel(Base):
     """SQLAlchemy модель для постов"""
 
     __tablename__ = "posts"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        {"extend_existing": True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(500), nullable=False)
@@ -32,6 +62,32 @@ class PostModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Поисковый вектор поддерживает сама PostgreSQL; совпадения в заголовке весят больше.
+    # Колонка отложенная: обычные выборки постов ее не читают
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', body), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    # Загружается явно через selectinload там, где теги нужны
+    tags = relationship("PostTagModel", secondary=posts_tags, passive_deletes=True)
+
+
+# Индексы ленты: порядок совпадает с ORDER BY created_at DESC, id DESC
+Index("ix_posts_created_at_id", PostModel.created_at.desc(), PostModel.id.desc())
+Index(
+    "ix_posts_status_created_at_id",
+    PostModel.status,
+    PostModel.created_at.desc(),
+    PostModel.id.desc(),
+)
+
 
 class PostTagModel(Base):
     """SQLAlchemy модель для тегов постов"""
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+# Границы корзин гистограммы ожидания свободного соединения, в секундах
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolStatistics:
+    """Статистика пула соединений: выдачи, время ожидания и возраст соединений"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connected_at: dict[int, float] = {}
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.wait_count = 0
+        self.wait_sum = 0.0
+
+    def pool_class(self, base: type[Pool]) -> type[Pool]:
+        """Подкласс пула, который замеряет ожидание соединения в эту статистику"""
+        return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"statistics": self})
+
+    def attach(self, pool: Pool) -> None:
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "close", self._on_close)
+        event.listen(pool, "checkout", self._on_checkout)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+
+            # Гистограмма кумулятивная, как принято в Prometheus
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(WAIT_BUCKETS, self.wait_buckets):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self.wait_count
+
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "checkouts_total": self.checkouts,
+                "timeouts_total": self.timeouts,
+                "connections_opened_total": self.connections_opened,
+                "connections_closed_total": self.connections_closed,
+                "wait_seconds": {
+                    "buckets": buckets,
+                    "count": self.wait_count,
+                    "sum": self.wait_sum,
+                },
+                "connection_age_seconds": {
+                    "count": len(ages),
+                    "min": min(ages, default=0.0),
+                    "max": max(ages, default=0.0),
+                    "avg": sum(ages) / len(ages) if ages else 0.0,
+                },
+            }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connections_opened += 1
+            self._connected_at[id(dbapi_connection)] = time.monotonic()
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connections_closed += 1
+            self._connected_at.pop(id(dbapi_connection), None)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+
+class _TimedPoolMixin:
+    statistics: PoolStatistics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.statistics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+
+        self.statistics.record_wait(time.perf_counter() - start)
+        return connection
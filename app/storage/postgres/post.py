@@ -1,21 +1,57 @@
 import uuid
-from typing import List, Optional
+from datetime import datetime as Datetime
+from typing import Iterator, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import cast, exists, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
 
 from app.domain.interfaces.storage.post import PostRepository as PostRepositoryInterface
-from app.domain.models.errors.domain import NotFoundError
-from app.domain.models.post import Post
+from app.domain.models.cursor import PostCursor, SearchCursor
+from app.domain.models.errors.domain import ConflictError, NotFoundError
+from app.domain.models.post import Post, PostPage, PostVersion
 from app.domain.models.post_tag import PostTag
 from app.storage.postgres.db import DatabaseManager
-from app.storage.postgres.models import PostModel, PostTagModel
+from app.storage.postgres.models import SEARCH_CONFIG, PostModel, PostTagModel, posts_tags
+
+# Поля поста, которые можно менять частичным обновлением
+UPDATABLE_POST_FIELDS = ("title", "body", "status", "updated_at")
+
+# Размер пачки строк в одном многострочном INSERT при массовой загрузке
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Сколько постов меняет один UPDATE при массовой смене статуса; каждая пачка — своя транзакция
+BULK_UPDATE_CHUNK_SIZE = 1000
+
+# Колонки поста для чтения без ORM, в порядке аргументов конструктора Post
+POST_COLUMNS = (
+    PostModel.id,
+    PostModel.title,
+    PostModel.body,
+    PostModel.status,
+    PostModel.created_at,
+    PostModel.updated_at,
+)
+
+# Сколько ID постов попадает в один запрос тегов при чтении без ORM
+TAGS_LOAD_CHUNK_SIZE = 1000
+
+# Сколько строк выгрузки читается с курсора на стороне сервера за раз
+EXPORT_BATCH_SIZE = 1000
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
 class PostRepository(PostRepositoryInterface):
     """PostgreSQL репозиторий для постов"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, core_reads: bool = True):
+        """`core_reads` — читать посты запросами по колонкам, минуя ORM-модели и identity map"""
         self._db_manager = db_manager
+        self._core_reads = core_reads
 
     def create_post(self, post: Post, session: Optional[Session] = None) -> None:
         """Создать новый пост"""
@@ -41,30 +77,101 @@ class PostRepository(PostRepositoryInterface):
         if not session.in_transaction():
             session.commit()
 
+    def bulk_create_posts(self, posts: List[Post], session: Optional[Session] = None) -> None:
+        """Создать посты с тегами пачками многострочных INSERT в одной транзакции
+
+        Теги постов сопоставляются по имени; недостающие теги создаются,
+        а `post.tags` заменяются тегами с их настоящими ID.
+        """
+        if session is not None:
+            return self._bulk_create_posts_with_session(session, posts)
+
+        with self._db_manager.get_session() as session:
+            return self._bulk_create_posts_with_session(session, posts)
+
+    def _bulk_create_posts_with_session(self, session: Session, posts: List[Post]) -> None:
+        """Внутренний метод для массового создания постов"""
+        tag_names = {tag.name for post in posts for tag in post.tags or []}
+        tag_ids = self._upsert_tags_by_name_with_session(session, tag_names)
+
+        post_rows = [
+            {
+                "id": post.id_,
+                "title": post.title,
+                "body": post.body,
+                "status": post.status,
+                "created_at": post.created_at,
+                "updated_at": post.updated_at,
+            }
+            for post in posts
+        ]
+        for chunk in _chunks(post_rows, BULK_INSERT_CHUNK_SIZE):
+            session.execute(insert(PostModel.__table__), chunk)
+
+        link_rows = []
+        for post in posts:
+            names = dict.fromkeys(tag.name for tag in post.tags or [])
+            post.tags = [PostTag(id_=tag_ids[name], name=name) for name in names]
+            link_rows.extend({"post_id": post.id_, "tag_id": tag.id_} for tag in post.tags)
+
+        for chunk in _chunks(link_rows, BULK_INSERT_CHUNK_SIZE):
+            session.execute(insert(posts_tags), chunk)
+
+    @staticmethod
+    def _upsert_tags_by_name_with_session(session: Session, names: set) -> dict:
+        """Создать недостающие теги и вернуть отображение имени в ID набором запросов"""
+        tag_ids = {}
+
+        # Сортировка задает одинаковый порядок блокировок у параллельных загрузок
+        for chunk in _chunks(sorted(names), BULK_INSERT_CHUNK_SIZE):
+            session.execute(
+                pg_insert(PostTagModel.__table__)
+                .values([{"id": uuid.uuid4(), "name": name} for name in chunk])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            rows = session.execute(
+                select(PostTagModel.id, PostTagModel.name).where(PostTagModel.name.in_(chunk))
+            )
+            tag_ids.update({name: id_ for id_, name in rows})
+
+        return tag_ids
+
     def get_post_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> Post:
         """Получить пост по ID"""
         if session is not None:
             return self._get_post_by_id_with_session(session, id_)
 
-        with self._db_manager.get_session() as session:
+        with self._db_manager.get_read_session() as session:
             return self._get_post_by_id_with_session(session, id_)
 
     def _get_post_by_id_with_session(self, session: Session, id_: uuid.UUID) -> Post:
         """Внутренний метод для получения поста по ID"""
-        post_model = session.query(PostModel).filter(PostModel.id == id_).first()
+        rows = self._fetch_posts(session, self._select_posts().filter(PostModel.id == id_))
 
-        if not post_model:
+        if not rows:
             raise NotFoundError(instance_type=Post)
 
-        return Post(
-            id_=post_model.id,
-            title=post_model.title,
-            body=post_model.body,
-            status=post_model.status,
-            created_at=post_model.created_at,
-            updated_at=post_model.updated_at,
-            tags=[],
-        )
+        return rows[0][0]
+
+    def get_post_version(self, id_: uuid.UUID, session: Optional[Session] = None) -> PostVersion:
+        """Получить версию поста: статус и updated_at без текста и тегов"""
+        if session is not None:
+            return self._get_post_version_with_session(session, id_)
+
+        with self._db_manager.get_read_session() as session:
+            return self._get_post_version_with_session(session, id_)
+
+    def _get_post_version_with_session(self, session: Session, id_: uuid.UUID) -> PostVersion:
+        """Внутренний метод для получения версии поста"""
+        session.flush()
+        row = session.execute(
+            select(PostModel.id, PostModel.status, PostModel.updated_at).where(PostModel.id == id_)
+        ).first()
+
+        if row is None:
+            raise NotFoundError(instance_type=Post)
+
+        return PostVersion(*row)
 
     def update_post(self, post: Post, session: Optional[Session] = None) -> None:
         """Обновить пост"""
@@ -98,62 +205,461 @@ class PostRepository(PostRepositoryInterface):
         if not session.in_transaction():
             session.commit()
 
-    def list_posts_by_filters(self, *args, **kwargs) -> List[Post]:
-        """Получить список постов с фильтрацией"""
+    def update_post_fields(
+        self,
+        id_: uuid.UUID,
+        fields: dict,
+        expected_updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> Post:
+        """Изменить поля поста одним UPDATE ... RETURNING, без предварительного чтения
+
+        Если передан `expected_updated_at`, пост обновляется только при совпадении
+        `updated_at` (оптимистическая блокировка), иначе — ConflictError. Теги читаются
+        вторым запросом по колонкам в той же транзакции: ответ содержит пост целиком.
+        """
+        if session is not None:
+            return self._update_post_fields_with_session(session, id_, fields, expected_updated_at)
+
         with self._db_manager.get_session() as session:
-            query = session.query(PostModel)
-
-            # Применяем фильтры
-            if "status" in kwargs:
-                query = query.filter(PostModel.status == kwargs["status"])
-
-            if "title_contains" in kwargs:
-                query = query.filter(PostModel.title.contains(kwargs["title_contains"]))
-
-            if "created_after" in kwargs:
-                query = query.filter(PostModel.created_at >= kwargs["created_after"])
-
-            if "created_before" in kwargs:
-                query = query.filter(PostModel.created_at <= kwargs["created_before"])
-
-            # Сортировка
-            order_by = kwargs.get("order_by", "created_at")
-            order_direction = kwargs.get("order_direction", "desc")
-
-            if order_direction == "desc":
-                query = query.order_by(getattr(PostModel, order_by).desc())
-            else:
-                query = query.order_by(getattr(PostModel, order_by).asc())
-
-            # Пагинация
-            limit = kwargs.get("limit")
-            offset = kwargs.get("offset", 0)
-
-            if limit:
-                query = query.limit(limit).offset(offset)
-
-            post_models = query.all()
-
-            # Преобразуем в доменные объекты
-            posts = []
-            for post_model in post_models:
-                tags = []
-                if post_model.tags:
-                    tags = [PostTag(id_=tag.id, name=tag.name) for tag in post_model.tags]
-
-                posts.append(
-                    Post(
-                        id_=post_model.id,
-                        title=post_model.title,
-                        body=post_model.body,
-                        status=post_model.status,
-                        created_at=post_model.created_at,
-                        updated_at=post_model.updated_at,
-                        tags=tags,
+            return self._update_post_fields_with_session(session, id_, fields, expected_updated_at)
+
+    def _update_post_fields_with_session(
+        self,
+        session: Session,
+        id_: uuid.UUID,
+        fields: dict,
+        expected_updated_at: Optional[Datetime],
+    ) -> Post:
+        """Внутренний метод для частичного обновления поста"""
+        unknown = set(fields) - set(UPDATABLE_POST_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields can not be updated: {sorted(unknown)}")
+
+        table = PostModel.__table__
+        statement = update(table).where(table.c.id == id_).values(**fields)
+        if expected_updated_at is not None:
+            statement = statement.where(table.c.updated_at == expected_updated_at)
+
+        row = session.execute(
+            statement.returning(
+                table.c.id,
+                table.c.title,
+                table.c.body,
+                table.c.status,
+                table.c.created_at,
+                table.c.updated_at,
+            )
+        ).first()
+
+        if row is None:
+            # Лишний запрос только при неудаче: отличаем отсутствие поста от конфликта версий
+            if expected_updated_at is not None and session.scalar(
+                select(exists().where(table.c.id == id_))
+            ):
+                raise ConflictError(instance_type=Post)
+
+            raise NotFoundError(instance_type=Post)
+
+        tags_by_post = self._load_tags_with_session(session, [row.id], {})
+        return Post(
+            id_=row.id,
+            title=row.title,
+            body=row.body,
+            status=row.status,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            tags=tags_by_post.get(row.id, []),
+        )
+
+    def update_posts_status(
+        self,
+        status: str,
+        updated_at: Datetime,
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = None,
+        session: Optional[Session] = None,
+    ) -> List[uuid.UUID]:
+        """Перевести посты в статус `status` пачками UPDATE и вернуть ID измененных постов
+
+        Посты выбираются по `ids` или, если они не переданы, по фильтрам списка постов
+        (не больше `limit`). Без внешней сессии каждая пачка выполняется в своей
+        транзакции, чтобы блокировки строк держались недолго.
+        """
+        if ids is not None:
+            updated = []
+            for chunk in _chunks(list(dict.fromkeys(ids)), BULK_UPDATE_CHUNK_SIZE):
+                updated.extend(
+                    self._in_session(
+                        session,
+                        self._update_posts_status_by_ids_with_session,
+                        chunk,
+                        status,
+                        updated_at,
                     )
                 )
+            return updated
+
+        updated = []
+        while limit is None or len(updated) < limit:
+            size = BULK_UPDATE_CHUNK_SIZE
+            if limit is not None:
+                size = min(size, limit - len(updated))
+
+            chunk_updated = self._in_session(
+                session,
+                self._update_posts_status_by_filters_with_session,
+                size,
+                filters or {},
+                status,
+                updated_at,
+            )
+            updated.extend(chunk_updated)
+            if len(chunk_updated) < size:
+                break
+
+        return updated
+
+    def _in_session(self, session: Optional[Session], method, *args):
+        """Выполнить `method(session, *args)` во внешней сессии или в новой транзакции"""
+        if session is not None:
+            return method(session, *args)
+
+        with self._db_manager.get_session() as session:
+            return method(session, *args)
+
+    @staticmethod
+    def _update_posts_status_by_ids_with_session(
+        session: Session, ids: List[uuid.UUID], status: str, updated_at: Datetime
+    ) -> List[uuid.UUID]:
+        """Внутренний метод: одна пачка смены статуса по ID"""
+        table = PostModel.__table__
+        rows = session.execute(
+            update(table)
+            .where(table.c.id.in_(ids))
+            .values(status=status, updated_at=updated_at)
+            .returning(table.c.id)
+        )
+        return list(rows.scalars())
+
+    def _update_posts_status_by_filters_with_session(
+        self, session: Session, size: int, filters: dict, status: str, updated_at: Datetime
+    ) -> List[uuid.UUID]:
+        """Внутренний метод: одна пачка смены статуса по фильтрам
+
+        Посты уже в целевом статусе исключаются, иначе фильтр по тому же статусу
+        выбирал бы их снова. Строки, заблокированные другими транзакциями, пропускаются.
+        """
+        table = PostModel.__table__
+        batch = (
+            self._apply_filters(select(PostModel.id), filters)
+            .where(PostModel.status != status)
+            .order_by(PostModel.id)
+            .limit(size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = session.execute(
+            update(table)
+            .where(table.c.id.in_(batch.scalar_subquery()))
+            .values(status=status, updated_at=updated_at)
+            .returning(table.c.id)
+        )
+        return list(rows.scalars())
+
+    def list_posts_by_filters(
+        self, *args, session: Optional[Session] = None, **kwargs
+    ) -> List[Post]:
+        """Получить список постов с фильтрацией"""
+        if session is not None:
+            return self._list_posts_by_filters_with_session(session, kwargs)
+
+        with self._db_manager.get_read_session() as session:
+            return self._list_posts_by_filters_with_session(session, kwargs)
+
+    def _list_posts_by_filters_with_session(self, session: Session, filters: dict) -> List[Post]:
+        """Внутренний метод для получения списка постов с фильтрацией"""
+        # Теги всех постов выборки подгружаются одним дополнительным запросом
+        query = self._apply_filters(self._select_posts(), filters)
+
+        # Сортировка
+        order_by = filters.get("order_by", "created_at")
+        order_direction = filters.get("order_direction", "desc")
+
+        if order_direction == "desc":
+            query = query.order_by(getattr(PostModel, order_by).desc())
+        else:
+            query = query.order_by(getattr(PostModel, order_by).asc())
 
-            return posts
+        # Пагинация
+        limit = filters.get("limit")
+        offset = filters.get("offset", 0)
+
+        if limit:
+            query = query.limit(limit).offset(offset)
+
+        return [post for post, in self._fetch_posts(session, query)]
+
+    def list_posts_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> PostPage:
+        """Получить страницу постов, упорядоченных по (created_at, id) от новых к старым"""
+        if session is not None:
+            return self._list_posts_page_with_session(session, limit, after, filters)
+
+        with self._db_manager.get_read_session() as session:
+            return self._list_posts_page_with_session(session, limit, after, filters)
+
+    def _list_posts_page_with_session(
+        self, session: Session, limit: int, after: Optional[PostCursor], filters: dict
+    ) -> PostPage:
+        """Внутренний метод для keyset-пагинации постов"""
+        query = self._page_query(self._select_posts(), limit, after, filters)
+        posts = [post for post, in self._fetch_posts(session, query)]
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            last = posts[-1]
+            next_cursor = PostCursor(created_at=last.created_at, id_=last.id_)
+
+        return PostPage(items=posts, next_cursor=next_cursor)
+
+    def list_post_versions_page(
+        self,
+        limit: int,
+        after: Optional[PostCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> List[PostVersion]:
+        """Версии постов страницы `list_posts_page` и первого поста следующей страницы
+
+        Последний элемент есть, только если есть следующая страница: от нее зависит курсор.
+        """
+        if session is not None:
+            return self._list_post_versions_page_with_session(session, limit, after, filters)
+
+        with self._db_manager.get_read_session() as session:
+            return self._list_post_versions_page_with_session(session, limit, after, filters)
+
+    def _list_post_versions_page_with_session(
+        self, session: Session, limit: int, after: Optional[PostCursor], filters: dict
+    ) -> List[PostVersion]:
+        """Внутренний метод для версий страницы: тот же запрос по индексу, без текста и тегов"""
+        session.flush()
+        query = self._page_query(
+            select(PostModel.id, PostModel.status, PostModel.updated_at), limit, after, filters
+        )
+
+        return [PostVersion(*row) for row in session.execute(query)]
+
+    def _page_query(self, query, limit: int, after: Optional[PostCursor], filters: dict):
+        """Фильтры, keyset-условие и порядок страницы ленты; строк на одну больше `limit`"""
+        query = self._apply_filters(query, filters)
+
+        # Keyset-пагинация: продолжаем строго после последней выданной строки,
+        # поэтому стоимость запроса не зависит от глубины страницы
+        if after is not None:
+            query = query.filter(
+                tuple_(PostModel.created_at, PostModel.id) < (after.created_at, after.id_)
+            )
+
+        # Берем на одну строку больше, чтобы понять, есть ли следующая страница
+        return query.order_by(PostModel.created_at.desc(), PostModel.id.desc()).limit(limit + 1)
+
+    def search_posts(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[SearchCursor] = None,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> PostPage:
+        """Полнотекстовый поиск по заголовку и тексту, от самых релевантных к менее релевантным
+
+        `query` разбирается как в поисковиках: слова, "фраза", -исключение, OR.
+        """
+        if session is not None:
+            return self._search_posts_with_session(session, query, limit, after, filters)
+
+        with self._db_manager.get_read_session() as session:
+            return self._search_posts_with_session(session, query, limit, after, filters)
+
+    def _search_posts_with_session(
+        self,
+        session: Session,
+        query: str,
+        limit: int,
+        after: Optional[SearchCursor],
+        filters: dict,
+    ) -> PostPage:
+        """Внутренний метод для поиска постов с keyset-пагинацией по (rank, id)"""
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        # ts_rank_cd возвращает real; в double precision ранг без потерь проходит через курсор
+        rank = cast(func.ts_rank_cd(PostModel.search_vector, ts_query), DOUBLE_PRECISION)
+
+        # Совпадения ищутся по GIN-индексу, ранжируются только найденные строки
+        search = self._apply_filters(
+            self._select_posts(rank).filter(PostModel.search_vector.op("@@")(ts_query)),
+            filters,
+        )
+
+        if after is not None:
+            search = search.filter(tuple_(rank, PostModel.id) < (after.rank, after.id_))
+
+        rows = self._fetch_posts(
+            session, search.order_by(rank.desc(), PostModel.id.desc()).limit(limit + 1)
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_post, last_rank = rows[-1]
+            next_cursor = SearchCursor(rank=last_rank, id_=last_post.id_)
+
+        posts = [post for post, _ in rows]
+
+        return PostPage(items=posts, next_cursor=next_cursor)
+
+    def export_posts(
+        self,
+        after: Optional[PostCursor] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        session: Optional[Session] = None,
+        **filters,
+    ) -> Iterator[List[Post]]:
+        """Выгрузить посты пачками по `batch_size`, от старых к новым по (created_at, id)
+
+        Строки читаются курсором на стороне сервера, поэтому память не зависит от размера
+        таблицы. `after` — позиция последнего выгруженного поста: выгрузка продолжится после него.
+        Сессия и соединение заняты, пока генератор не исчерпан или не закрыт.
+        """
+        if session is not None:
+            yield from self._export_posts_with_session(session, after, batch_size, filters)
+            return
+
+        with self._db_manager.get_read_session() as session:
+            yield from self._export_posts_with_session(session, after, batch_size, filters)
+
+    def _export_posts_with_session(
+        self,
+        session: Session,
+        after: Optional[PostCursor],
+        batch_size: int,
+        filters: dict,
+    ) -> Iterator[List[Post]]:
+        """Внутренний метод для выгрузки постов"""
+        query = self._apply_filters(select(*POST_COLUMNS), filters)
+        if after is not None:
+            query = query.filter(
+                tuple_(PostModel.created_at, PostModel.id) > (after.created_at, after.id_)
+            )
+
+        # yield_per включает курсор на стороне сервера и выдачу строк частями
+        result = session.execute(
+            query.order_by(PostModel.created_at, PostModel.id).execution_options(
+                yield_per=batch_size
+            )
+        )
+
+        tags = {}
+        for rows in result.partitions():
+            # Теги пачки читаются отдельным запросом на том же соединении, курсор остается открытым
+            tags_by_post = self._load_tags_with_session(session, [row[0] for row in rows], tags)
+            yield [Post(*row, tags=tags_by_post.get(row[0], [])) for row in rows]
+
+    def _select_posts(self, *columns):
+        """Запрос постов и дополнительных колонок: колонки поста или ORM-модель с тегами"""
+        if self._core_reads:
+            return select(*POST_COLUMNS, *columns)
+
+        # Теги всех постов выборки подгружаются одним дополнительным запросом
+        return select(PostModel, *columns).options(selectinload(PostModel.tags))
+
+    def _fetch_posts(self, session: Session, query) -> List[tuple]:
+        """Выполнить запрос из `_select_posts`: строки (Post, *дополнительные колонки)"""
+        if self._core_reads:
+            # Сессии без autoflush: запрос по колонкам не видит изменений, не записанных в БД,
+            # в отличие от ORM-моделей из identity map. Без изменений flush ничего не делает
+            session.flush()
+
+        rows = session.execute(query).all()
+        tags = {}
+
+        if not self._core_reads:
+            return [(self._to_domain(row[0], tags), *row[1:]) for row in rows]
+
+        size = len(POST_COLUMNS)
+        tags_by_post = self._load_tags_with_session(session, [row[0] for row in rows], tags)
+        return [(Post(*row[:size], tags=tags_by_post.get(row[0], [])), *row[size:]) for row in rows]
+
+    @staticmethod
+    def _load_tags_with_session(
+        session: Session, post_ids: List[uuid.UUID], tags: dict
+    ) -> dict[uuid.UUID, List[PostTag]]:
+        """Теги постов по ID поста запросами по колонкам; `tags` — общие теги выборки по ID"""
+        tags_by_post = {}
+
+        for chunk in _chunks(post_ids, TAGS_LOAD_CHUNK_SIZE):
+            rows = session.execute(
+                select(posts_tags.c.post_id, PostTagModel.id, PostTagModel.name)
+                .join(PostTagModel, PostTagModel.id == posts_tags.c.tag_id)
+                .where(posts_tags.c.post_id.in_(chunk))
+            )
+            for post_id, tag_id, name in rows:
+                tag = tags.get(tag_id)
+                if tag is None:
+                    tag = tags[tag_id] = PostTag(id_=tag_id, name=name)
+                tags_by_post.setdefault(post_id, []).append(tag)
+
+        return tags_by_post
+
+    @staticmethod
+    def _to_domain(post_model: PostModel, tags: Optional[dict] = None) -> Post:
+        """Преобразовать ORM-модель поста с загруженными тегами в доменный объект
+
+        `tags` — общие для выборки теги по ID: посты с одним тегом получают один объект.
+        """
+        if tags is None:
+            tags = {}
+
+        post_tags = []
+        for tag_model in post_model.tags:
+            tag = tags.get(tag_model.id)
+            if tag is None:
+                tag = tags[tag_model.id] = PostTag(id_=tag_model.id, name=tag_model.name)
+            post_tags.append(tag)
+
+        return Post(
+            id_=post_model.id,
+            title=post_model.title,
+            body=post_model.body,
+            status=post_model.status,
+            created_at=post_model.created_at,
+            updated_at=post_model.updated_at,
+            tags=post_tags,
+        )
+
+    @staticmethod
+    def _apply_filters(query, filters: dict):
+        """Применить фильтры списка постов к запросу"""
+        if "status" in filters:
+            query = query.filter(PostModel.status == filters["status"])
+
+        if "title_contains" in filters:
+            query = query.filter(PostModel.title.contains(filters["title_contains"]))
+
+        if "created_after" in filters:
+            query = query.filter(PostModel.created_at >= filters["created_after"])
+
+        if "created_before" in filters:
+            query = query.filter(PostModel.created_at <= filters["created_before"])
+
+        return query
 
     def delete_post_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> None:
         """Удалить пост по ID"""
@@ -174,59 +680,109 @@ class PostRepository(PostRepositoryInterface):
         if not session.in_transaction():
             session.commit()
 
-    def add_tags(
-        self, id_: uuid.UUID, tags: List[PostTag], session: Optional[Session] = None
+    def attach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
     ) -> None:
-        """Добавить теги к посту"""
+        """Привязать теги к посту; уже привязанные теги пропускаются
+
+        updated_at: новое время изменения поста, если привязки изменились
+        """
         if session is not None:
-            return self._add_tags_with_session(session, id_, tags)
+            return self._attach_tags_with_session(session, id_, tag_ids, updated_at)
 
         with self._db_manager.get_session() as session:
-            return self._add_tags_with_session(session, id_, tags)
-
-    def _add_tags_with_session(self, session: Session, id_: uuid.UUID, tags: List[PostTag]) -> None:
-        """Внутренний метод для добавления тегов к посту"""
-        post_model = session.query(PostModel).filter(PostModel.id == id_).first()
-
-        if not post_model:
-            raise NotFoundError(instance_type=Post)
-
-        # Получаем существующие теги
-        existing_tag_ids = {tag.id for tag in post_model.tags}
-
-        # Получаем новые теги из базы данных
-        new_tag_ids = [tag.id_ for tag in tags if tag.id_ not in existing_tag_ids]
-        if new_tag_ids:
-            new_tag_models = (
-                session.query(PostTagModel).filter(PostTagModel.id.in_(new_tag_ids)).all()
+            return self._attach_tags_with_session(session, id_, tag_ids, updated_at)
+
+    def _attach_tags_with_session(
+        self,
+        session: Session,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+    ) -> None:
+        """Внутренний метод для привязки тегов: проверка одним запросом и один INSERT"""
+        tag_ids = list(dict.fromkeys(tag_ids))
+        self._check_post_and_tags_with_session(session, id_, tag_ids)
+
+        if tag_ids:
+            result = session.execute(
+                pg_insert(posts_tags)
+                .values([{"post_id": id_, "tag_id": tag_id} for tag_id in tag_ids])
+                .on_conflict_do_nothing()
             )
-            post_model.tags.extend(new_tag_models)
-            if not session.in_transaction():
-                session.commit()
-
-    def remove_tags(
-        self, id_: uuid.UUID, tags: List[PostTag], session: Optional[Session] = None
+            self._touch_post_with_session(session, id_, updated_at, result.rowcount)
+
+    def detach_tags(
+        self,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
     ) -> None:
-        """Удалить теги из поста"""
+        """Отвязать теги от поста; не привязанные теги пропускаются
+
+        updated_at: новое время изменения поста, если привязки изменились
+        """
         if session is not None:
-            return self._remove_tags_with_session(session, id_, tags)
+            return self._detach_tags_with_session(session, id_, tag_ids, updated_at)
 
         with self._db_manager.get_session() as session:
-            return self._remove_tags_with_session(session, id_, tags)
+            return self._detach_tags_with_session(session, id_, tag_ids, updated_at)
+
+    def _detach_tags_with_session(
+        self,
+        session: Session,
+        id_: uuid.UUID,
+        tag_ids: List[uuid.UUID],
+        updated_at: Optional[Datetime] = None,
+    ) -> None:
+        """Внутренний метод для отвязки тегов: проверка одним запросом и один DELETE"""
+        tag_ids = list(dict.fromkeys(tag_ids))
+        self._check_post_and_tags_with_session(session, id_, tag_ids)
+
+        if tag_ids:
+            result = session.execute(
+                posts_tags.delete().where(
+                    posts_tags.c.post_id == id_, posts_tags.c.tag_id.in_(tag_ids)
+                )
+            )
+            self._touch_post_with_session(session, id_, updated_at, result.rowcount)
 
-    def _remove_tags_with_session(
-        self, session: Session, id_: uuid.UUID, tags: List[PostTag]
+    @staticmethod
+    def _touch_post_with_session(
+        session: Session, id_: uuid.UUID, updated_at: Optional[Datetime], changed: int
     ) -> None:
-        """Внутренний метод для удаления тегов из поста"""
-        post_model = session.query(PostModel).filter(PostModel.id == id_).first()
+        """Обновить updated_at поста после изменения его тегов: теги входят в ответ и ETag"""
+        if updated_at is not None and changed:
+            session.execute(
+                update(PostModel.__table__)
+                .where(PostModel.__table__.c.id == id_)
+                .values(updated_at=updated_at)
+            )
 
-        if not post_model:
-            raise NotFoundError(instance_type=Post)
+    @staticmethod
+    def _check_post_and_tags_with_session(
+        session: Session, id_: uuid.UUID, tag_ids: List[uuid.UUID]
+    ) -> None:
+        """Проверить одним запросом, что пост и все теги существуют"""
+        post_exists = exists().where(PostModel.id == id_)
+        rows = session.execute(
+            select(post_exists.label("post_exists"), PostTagModel.id)
+            .select_from(PostTagModel)
+            .where(PostTagModel.id.in_(tag_ids))
+        ).all()
+
+        if rows:
+            post_found = rows[0].post_exists
+        else:
+            post_found = session.scalar(select(post_exists))
 
-        # Получаем ID тегов для удаления
-        tag_ids_to_remove = {tag.id_ for tag in tags}
+        if not post_found:
+            raise NotFoundError(instance_type=Post)
 
-        # Удаляем теги
-        post_model.tags = [tag for tag in post_model.tags if tag.id not in tag_ids_to_remove]
-        if not session.in_transaction():
-            session.commit()
+        if len(rows) != len(tag_ids):
+            raise NotFoundError(instance_type=PostTag)
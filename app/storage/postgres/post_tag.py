@@ -1,21 +1,26 @@
 import uuid
+from datetime import datetime as Datetime
 from typing import List, Optional
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.domain.interfaces.storage.post_tag import PostTagRepository as PostTagRepositoryInterface
 from app.domain.models.errors.domain import AlreadyExistsError, NotFoundError
-from app.domain.models.post_tag import PostTag
+from app.domain.models.post_tag import PostTag, PostTagChange
 from app.storage.postgres.db import DatabaseManager
-from app.storage.postgres.models import PostTagModel
+from app.storage.postgres.models import PostModel, PostTagModel, posts_tags
 
 
 class PostTagRepository(PostTagRepositoryInterface):
     """PostgreSQL репозиторий для тегов постов"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, core_reads: bool = True):
+        """`core_reads` — читать теги запросами по колонкам, минуя ORM-модели и identity map"""
         self._db_manager = db_manager
+        self._core_reads = core_reads
 
     def create_post_tag(self, post_tag: PostTag, session: Optional[Session] = None) -> None:
         """Создать новый тег"""
@@ -31,6 +36,8 @@ class PostTagRepository(PostTagRepositoryInterface):
 
         try:
             session.add(post_tag_model)
+            # Нарушение уникальности имени проявляется здесь, а не при коммите вызывающего кода
+            session.flush()
             if not session.in_transaction():
                 session.commit()
         except IntegrityError:
@@ -45,35 +52,47 @@ class PostTagRepository(PostTagRepositoryInterface):
         if session is not None:
             return self._get_post_tag_by_id_with_session(session, id_)
 
-        with self._db_manager.get_session() as session:
+        with self._db_manager.get_read_session() as session:
             return self._get_post_tag_by_id_with_session(session, id_)
 
     def _get_post_tag_by_id_with_session(self, session: Session, id_: uuid.UUID) -> PostTag:
         """Внутренний метод для получения тега по ID"""
-        post_tag_model = session.query(PostTagModel).filter(PostTagModel.id == id_).first()
+        post_tags = self._fetch_tags(session, self._select_tags().filter(PostTagModel.id == id_))
 
-        if not post_tag_model:
+        if not post_tags:
             raise NotFoundError(instance_type=PostTag)
 
-        return PostTag(id_=post_tag_model.id, name=post_tag_model.name)
+        return post_tags[0]
+
+    def update_post_tag(
+        self,
+        post_tag: PostTag,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> PostTagChange:
+        """Обновить тег
 
-    def update_post_tag(self, post_tag: PostTag, session: Optional[Session] = None) -> None:
-        """Обновить тег"""
+        Имя тега входит в представление и ETag постов с этим тегом, поэтому в той же
+        транзакции им ставится `updated_at`, если он передан. Возвращает прежнее имя
+        (строка тега блокируется до конца транзакции) и ID этих постов.
+        """
         if session is not None:
-            return self._update_post_tag_with_session(session, post_tag)
+            return self._update_post_tag_with_session(session, post_tag, updated_at)
 
         with self._db_manager.get_session() as session:
-            return self._update_post_tag_with_session(session, post_tag)
+            return self._update_post_tag_with_session(session, post_tag, updated_at)
 
-    def _update_post_tag_with_session(self, session: Session, post_tag: PostTag) -> None:
+    def _update_post_tag_with_session(
+        self, session: Session, post_tag: PostTag, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
         """Внутренний метод для обновления тега"""
-        post_tag_model = session.query(PostTagModel).filter(PostTagModel.id == post_tag.id_).first()
-
-        if not post_tag_model:
-            raise NotFoundError(instance_type=PostTag)
+        post_tag_model = self._lock_post_tag_with_session(session, post_tag.id_)
+        old_name = post_tag_model.name
 
         try:
             post_tag_model.name = post_tag.name
+            session.flush()
+            post_ids = self._touch_posts_with_session(session, post_tag.id_, updated_at)
             if not session.in_transaction():
                 session.commit()
         except IntegrityError:
@@ -83,61 +102,126 @@ class PostTagRepository(PostTagRepositoryInterface):
                 instance_type=PostTag, field_name="name", field_value=post_tag.name
             )
 
-    def list_post_tags_by_filters(self, *args, **kwargs) -> List[PostTag]:
+        return PostTagChange(old_name, post_ids)
+
+    def list_post_tags_by_filters(
+        self, *args, session: Optional[Session] = None, **kwargs
+    ) -> List[PostTag]:
         """Получить список тегов с фильтрацией"""
-        with self._db_manager.get_session() as session:
-            query = session.query(PostTagModel)
+        if session is not None:
+            return self._list_post_tags_by_filters_with_session(session, kwargs)
 
-            # Применяем фильтры
-            if "name_contains" in kwargs:
-                query = query.filter(PostTagModel.name.contains(kwargs["name_contains"]))
+        with self._db_manager.get_read_session() as session:
+            return self._list_post_tags_by_filters_with_session(session, kwargs)
 
-            if "name" in kwargs:
-                query = query.filter(PostTagModel.name == kwargs["name"])
+    def _list_post_tags_by_filters_with_session(
+        self, session: Session, filters: dict
+    ) -> List[PostTag]:
+        """Внутренний метод для получения списка тегов с фильтрацией"""
+        query = self._select_tags()
 
-            # Сортировка
-            order_by = kwargs.get("order_by", "name")
-            order_direction = kwargs.get("order_direction", "asc")
+        # Применяем фильтры
+        if "name_contains" in filters:
+            query = query.filter(PostTagModel.name.contains(filters["name_contains"]))
 
-            if order_direction == "desc":
-                query = query.order_by(getattr(PostTagModel, order_by).desc())
-            else:
-                query = query.order_by(getattr(PostTagModel, order_by).asc())
+        if "name" in filters:
+            query = query.filter(PostTagModel.name == filters["name"])
 
-            # Пагинация
-            limit = kwargs.get("limit")
-            offset = kwargs.get("offset", 0)
+        # Сортировка
+        order_by = filters.get("order_by", "name")
+        order_direction = filters.get("order_direction", "asc")
 
-            if limit:
-                query = query.limit(limit).offset(offset)
+        if order_direction == "desc":
+            query = query.order_by(getattr(PostTagModel, order_by).desc())
+        else:
+            query = query.order_by(getattr(PostTagModel, order_by).asc())
 
-            post_tag_models = query.all()
+        # Пагинация
+        limit = filters.get("limit")
+        offset = filters.get("offset", 0)
 
-            # Преобразуем в доменные объекты
-            return [
-                PostTag(id_=post_tag_model.id, name=post_tag_model.name)
-                for post_tag_model in post_tag_models
-            ]
+        if limit:
+            query = query.limit(limit).offset(offset)
 
-    def delete_post_tag_by_id(self, id_: uuid.UUID, session: Optional[Session] = None) -> None:
-        """Удалить тег по ID"""
+        return self._fetch_tags(session, query)
+
+    def _select_tags(self):
+        if self._core_reads:
+            return select(PostTagModel.id, PostTagModel.name)
+
+        return select(PostTagModel)
+
+    def _fetch_tags(self, session: Session, query) -> List[PostTag]:
+        """Выполнить запрос из `_select_tags` и вернуть доменные объекты"""
+        if not self._core_reads:
+            return [PostTag(id_=model.id, name=model.name) for model in session.scalars(query)]
+
+        # Сессии без autoflush: запрос по колонкам иначе не увидит незаписанных изменений
+        session.flush()
+        return [PostTag(id_=id_, name=name) for id_, name in session.execute(query)]
+
+    def delete_post_tag_by_id(
+        self,
+        id_: uuid.UUID,
+        updated_at: Optional[Datetime] = None,
+        session: Optional[Session] = None,
+    ) -> PostTagChange:
+        """Удалить тег по ID
+
+        Постам, от которых отвязывается тег, в той же транзакции ставится `updated_at`,
+        если он передан. Возвращает имя тега и ID этих постов.
+        """
         if session is not None:
-            return self._delete_post_tag_by_id_with_session(session, id_)
+            return self._delete_post_tag_by_id_with_session(session, id_, updated_at)
 
         with self._db_manager.get_session() as session:
-            return self._delete_post_tag_by_id_with_session(session, id_)
+            return self._delete_post_tag_by_id_with_session(session, id_, updated_at)
 
-    def _delete_post_tag_by_id_with_session(self, session: Session, id_: uuid.UUID) -> None:
+    def _delete_post_tag_by_id_with_session(
+        self, session: Session, id_: uuid.UUID, updated_at: Optional[Datetime] = None
+    ) -> PostTagChange:
         """Внутренний метод для удаления тега"""
-        post_tag_model = session.query(PostTagModel).filter(PostTagModel.id == id_).first()
-
-        if not post_tag_model:
-            raise NotFoundError(instance_type=PostTag)
+        post_tag_model = self._lock_post_tag_with_session(session, id_)
+        name = post_tag_model.name
 
+        # Связи удаляются каскадом вместе с тегом, посты выбираются до удаления
+        post_ids = self._touch_posts_with_session(session, id_, updated_at)
         session.delete(post_tag_model)
         if not session.in_transaction():
             session.commit()
 
+        return PostTagChange(name, post_ids)
+
+    @staticmethod
+    def _lock_post_tag_with_session(session: Session, id_: uuid.UUID) -> PostTagModel:
+        """Прочитать тег с блокировкой строки: его имя не изменится до конца транзакции"""
+        post_tag_model = (
+            session.query(PostTagModel).filter(PostTagModel.id == id_).with_for_update().first()
+        )
+
+        if not post_tag_model:
+            raise NotFoundError(instance_type=PostTag)
+
+        return post_tag_model
+
+    @staticmethod
+    def _touch_posts_with_session(
+        session: Session, id_: uuid.UUID, updated_at: Optional[Datetime]
+    ) -> List[uuid.UUID]:
+        """ID постов с тегом; с `updated_at` — еще и обновить им время изменения"""
+        linked = select(posts_tags.c.post_id).where(posts_tags.c.tag_id == id_)
+        if updated_at is None:
+            return list(session.execute(linked).scalars())
+
+        posts = PostModel.__table__
+        rows = session.execute(
+            update(posts)
+            .where(posts.c.id.in_(linked.scalar_subquery()))
+            .values(updated_at=updated_at)
+            .returning(posts.c.id)
+        )
+        return list(rows.scalars())
+
     def get_post_tag_by_name(
         self, name: str, session: Optional[Session] = None
     ) -> Optional[PostTag]:
@@ -145,25 +229,56 @@ class PostTagRepository(PostTagRepositoryInterface):
         if session is not None:
             return self._get_post_tag_by_name_with_session(session, name)
 
-        with self._db_manager.get_session() as session:
+        with self._db_manager.get_read_session() as session:
             return self._get_post_tag_by_name_with_session(session, name)
 
     def _get_post_tag_by_name_with_session(self, session: Session, name: str) -> Optional[PostTag]:
         """Внутренний метод для получения тега по имени"""
-        post_tag_model = session.query(PostTagModel).filter(PostTagModel.name == name).first()
+        post_tags = self._fetch_tags(session, self._select_tags().filter(PostTagModel.name == name))
 
-        if not post_tag_model:
-            return None
-
-        return PostTag(id_=post_tag_model.id, name=post_tag_model.name)
+        return post_tags[0] if post_tags else None
 
     def get_or_create_post_tag(self, name: str, session: Optional[Session] = None) -> PostTag:
         """Получить существующий тег или создать новый"""
-        existing_tag = self.get_post_tag_by_name(name, session)
-        if existing_tag:
-            return existing_tag
-
-        # Создаем новый тег
-        new_tag = PostTag(id_=uuid.uuid4(), name=name)
-        self.create_post_tag(new_tag, session)
-        return new_tag
+        return self.get_or_create_post_tags([name], session=session)[0]
+
+    def get_or_create_post_tags(
+        self, names: List[str], session: Optional[Session] = None
+    ) -> List[PostTag]:
+        """Получить теги по именам, создав недостающие, не больше чем двумя запросами
+
+        Теги возвращаются в порядке первого вхождения имени, повторы убираются.
+        Параллельное создание тега с тем же именем не приводит к ошибке.
+        """
+        if session is not None:
+            return self._get_or_create_post_tags_with_session(session, names)
+
+        with self._db_manager.get_session() as session:
+            return self._get_or_create_post_tags_with_session(session, names)
+
+    def _get_or_create_post_tags_with_session(
+        self, session: Session, names: List[str]
+    ) -> List[PostTag]:
+        """Внутренний метод: INSERT ... ON CONFLICT DO NOTHING RETURNING и SELECT для остальных"""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+
+        # Сортировка задает одинаковый порядок блокировок у параллельных вставок
+        rows = session.execute(
+            pg_insert(PostTagModel)
+            .values([{"id": uuid.uuid4(), "name": name} for name in sorted(names)])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(PostTagModel.id, PostTagModel.name)
+        )
+        tag_ids = {name: id_ for id_, name in rows}
+
+        # Имена, которые уже были заняты: RETURNING не возвращает строки при конфликте
+        existing = [name for name in names if name not in tag_ids]
+        if existing:
+            rows = session.execute(
+                select(PostTagModel.id, PostTagModel.name).where(PostTagModel.name.in_(existing))
+            )
+            tag_ids.update({name: id_ for id_, name in rows})
+
+        return [PostTag(id_=tag_ids[name], name=name) for name in names]
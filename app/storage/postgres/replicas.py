@@ -0,0 +1,127 @@
+"""
+Чтение с реплик PostgreSQL: распределение чтений, исключение недоступных реплик
+и чтение своих записей
+
+Реплики выбираются по кругу. Реплика, к которой не удалось подключиться или соединение
+с которой оборвалось, исключается на `retry_after_seconds`, после чего снова получает чтения.
+Внутри `read_routing_scope()` (HTTP-запрос) после первой записи в основную БД чтения
+этого запроса идут в основную БД: реплика могла еще не получить записанное.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.engine import URL
+
+
+class ReadRouting:
+    """Состояние маршрутизации чтений одного запроса"""
+
+    def __init__(self):
+        self.wrote = False
+
+
+# Объект, а не флаг: запись в потоке из asyncio.to_thread видна чтениям в следующих потоках
+_current_routing: contextvars.ContextVar[Optional[ReadRouting]] = contextvars.ContextVar(
+    "read_routing", default=None
+)
+
+
+@contextmanager
+def read_routing_scope() -> Iterator[ReadRouting]:
+    """Чтения внутри блока, выполненные после записи в основную БД, идут в основную БД"""
+    routing = ReadRouting()
+    token = _current_routing.set(routing)
+    try:
+        yield routing
+    finally:
+        _current_routing.reset(token)
+
+
+def primary_pinned() -> bool:
+    routing = _current_routing.get()
+    return routing is not None and routing.wrote
+
+
+def mark_write(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Обработчик after_cursor_execute основной БД: отметить запись в текущем запросе"""
+    routing = _current_routing.get()
+    if routing is None or context is None:
+        return
+
+    if context.isinsert or context.isupdate or context.isdelete:
+        routing.wrote = True
+
+
+def replica_name(url: URL) -> str:
+    """Имя реплики для статистики, без учетных данных"""
+    return f"{url.host}:{url.port or 5432}/{url.database}"
+
+
+class ReplicaSet:
+    """Выбор реплики для чтения по кругу с временным исключением недоступных"""
+
+    def __init__(
+        self,
+        names: list[str],
+        retry_after_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._names = names
+        self._retry_after_seconds = retry_after_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next = 0
+        self._ejected_until = [float("-inf")] * len(names)
+
+        self.reads = [0] * len(names)
+        self.ejections = [0] * len(names)
+        self.primary_reads = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def candidates(self) -> list[int]:
+        """Индексы доступных реплик, начиная со следующей по кругу"""
+        if not self._names:
+            return []
+
+        with self._lock:
+            now = self._clock()
+            start = self._next
+            self._next = (start + 1) % len(self._names)
+
+            order = [(start + offset) % len(self._names) for offset in range(len(self._names))]
+            return [index for index in order if self._ejected_until[index] <= now]
+
+    def eject(self, index: int) -> None:
+        with self._lock:
+            self._ejected_until[index] = self._clock() + self._retry_after_seconds
+            self.ejections[index] += 1
+
+    def record_read(self, index: int) -> None:
+        with self._lock:
+            self.reads[index] += 1
+
+    def record_primary_read(self) -> None:
+        with self._lock:
+            self.primary_reads += 1
+
+    def stats(self) -> dict:
+        """Чтения и исключения по репликам, чтения, ушедшие в основную БД"""
+        now = self._clock()
+        with self._lock:
+            return {
+                "primary_reads": self.primary_reads,
+                "replicas": {
+                    name: {
+                        "healthy": int(self._ejected_until[index] <= now),
+                        "reads": self.reads[index],
+                        "ejections": self.ejections[index],
+                    }
+                    for index, name in enumerate(self._names)
+                },
+            }
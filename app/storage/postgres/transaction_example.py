@@ -5,15 +5,20 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy.engine import IsolationLevel
-
 from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
 from app.domain.models.user import User
+from app.storage.cache.lru import LRUCache
+from app.storage.cache.post_tag import CachedPostTagRepository
 from app.storage.postgres.db import DatabaseManager
 from app.storage.postgres.post import PostRepository
 from app.storage.postgres.post_tag import PostTagRepository
 from app.storage.postgres.user import UserRepository
 
+# Кэш ID тегов по имени: популярные теги не требуют запросов при записи постов
+TAG_NAME_CACHE_MAX_SIZE = 10_000
+TAG_NAME_CACHE_TTL_SECONDS = 300
+
 
 class TransactionExample:
     """Пример использования транзакций в бизнес-логике"""
@@ -22,7 +27,10 @@ class TransactionExample:
         self._db_manager = db_manager
         self._user_repo = UserRepository(db_manager)
         self._post_repo = PostRepository(db_manager)
-        self._post_tag_repo = PostTagRepository(db_manager)
+        self._post_tag_repo = CachedPostTagRepository(
+            PostTagRepository(db_manager),
+            LRUCache(TAG_NAME_CACHE_MAX_SIZE, TAG_NAME_CACHE_TTL_SECONDS),
+        )
 
     def create_user_with_first_post(
         self, username: str, post_title: str, post_body: str, tags: list[str]
@@ -35,11 +43,8 @@ class TransactionExample:
             user = User(id_=uuid.uuid4(), username=username)
             self._user_repo.create_user(user, session)
 
-            # Создаем теги для поста
-            post_tags = []
-            for tag_name in tags:
-                tag = self._post_tag_repo.get_or_create_post_tag(tag_name, session)
-                post_tags.append(tag)
+            # Создаем теги для поста одним набором запросов
+            post_tags = self._post_tag_repo.get_or_create_post_tags(tags, session)
 
             # Создаем пост
             now = datetime.utcnow()
@@ -62,7 +67,7 @@ class TransactionExample:
         Пример бизнес-операции: передать пост от одного пользователя другому
         Использует уровень изоляции READ_COMMITTED
         """
-        with self._db_manager.transaction(IsolationLevel.READ_COMMITTED) as session:
+        with self._db_manager.transaction("READ COMMITTED") as session:
             # Получаем пост
             post = self._post_repo.get_post_by_id(post_id, session)
 
@@ -86,30 +91,27 @@ class TransactionExample:
         """
         Пример массовой операции: создать несколько постов с тегами в одной транзакции
         Использует уровень изоляции SERIALIZABLE для предотвращения конфликтов
+        Теги и посты записываются пачками, а не по одной строке
         """
-        with self._db_manager.transaction(IsolationLevel.SERIALIZABLE) as session:
-            created_posts = []
-
-            for post_data in posts_data:
-                # Создаем теги
-                post_tags = []
-                for tag_name in post_data.get("tags", []):
-                    tag = self._post_tag_repo.get_or_create_post_tag(tag_name, session)
-                    post_tags.append(tag)
-
-                # Создаем пост
-                now = datetime.utcnow()
-                post = Post(
+        with self._db_manager.transaction("SERIALIZABLE") as session:
+            now = datetime.utcnow()
+            created_posts = [
+                Post(
                     id_=uuid.uuid4(),
                     title=post_data["title"],
                     body=post_data["body"],
                     status=post_data.get("status", "draft"),
                     created_at=now,
                     updated_at=now,
-                    tags=post_tags,
+                    tags=[
+                        PostTag(id_=uuid.uuid4(), name=tag_name)
+                        for tag_name in post_data.get("tags", [])
+                    ],
                 )
-                self._post_repo.create_post(post, session)
-                created_posts.append(post)
+                for post_data in posts_data
+            ]
+
+            self._post_repo.bulk_create_posts(created_posts, session)
 
             return created_posts
 
@@ -120,7 +122,7 @@ class TransactionExample:
         Пример сложной бизнес-операции: обновить пользователя, пост и добавить теги
         Использует уровень изоляции REPEATABLE_READ
         """
-        with self._db_manager.transaction(IsolationLevel.REPEATABLE_READ) as session:
+        with self._db_manager.transaction("REPEATABLE READ") as session:
             # Получаем пользователя
             user = self._user_repo.get_user_by_id(user_id, session)
 
@@ -132,10 +134,7 @@ class TransactionExample:
             self._user_repo.update_user(user, session)
 
             # Создаем новые теги
-            new_tag_objects = []
-            for tag_name in new_tags:
-                tag = self._post_tag_repo.get_or_create_post_tag(tag_name, session)
-                new_tag_objects.append(tag)
+            new_tag_objects = self._post_tag_repo.get_or_create_post_tags(new_tags, session)
 
             # Добавляем теги к посту
             self._post_repo.add_tags(post_id, new_tag_objects, session)
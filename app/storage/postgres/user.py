@@ -22,7 +22,7 @@ class UserRepository(UserRepositoryInterface):
         if session is not None:
             return self._get_user_by_id_with_session(session, id_)
 
-        with self._db_manager.get_session() as session:
+        with self._db_manager.get_read_session() as session:
             return self._get_user_by_id_with_session(session, id_)
 
     def _get_user_by_id_with_session(self, session: Session, id_: uuid.UUID) -> User:
@@ -109,7 +109,7 @@ class UserRepository(UserRepositoryInterface):
         if session is not None:
             return self._get_user_by_username_with_session(session, username)
 
-        with self._db_manager.get_session() as session:
+        with self._db_manager.get_read_session() as session:
             return self._get_user_by_username_with_session(session, username)
 
     def _get_user_by_username_with_session(self, session: Session, username: str) -> Optional[User]:
@@ -0,0 +1,242 @@
+"""
+Сжатие ответов gzip и brotli по заголовку Accept-Encoding
+
+Ответ целиком сжимается, если он не меньше `minimum_size` байт. Потоковый ответ
+(`StreamingResponse`, в том числе списки из `DomainJSONStreamResponse` и выгрузки)
+сжимается по частям по мере поступления: каждая часть отправляется клиенту сразу,
+полный ответ ни в исходном, ни в сжатом виде в памяти не собирается.
+Слабые ETag при сжатии остаются верными: представление по смыслу то же.
+"""
+
+import zlib
+from typing import Optional
+
+import brotli
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ENCODING_BROTLI = "br"
+ENCODING_GZIP = "gzip"
+
+# При равном q brotli предпочтительнее: при сравнимой скорости он сжимает JSON сильнее
+_SUPPORTED_ENCODINGS = (ENCODING_BROTLI, ENCODING_GZIP)
+
+# Сжимается только текст: изображения и архивы уже сжаты
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson")
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Кодировка с наибольшим q из поддерживаемых; None — отдавать без сжатия"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        if name:
+            weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in _SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+
+    return best
+
+
+class _Encoder:
+    """Потоковый компрессор: части с flush, чтобы клиент получал данные без задержки"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == ENCODING_BROTLI:
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == ENCODING_BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == ENCODING_BROTLI:
+            return self._brotli.process(data) + self._brotli.finish()
+
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+class _CompressionResponder:
+    """Перехват ответа приложения: решение о сжатии принимается по первым `minimum_size` байтам
+
+    Middleware на BaseHTTPMiddleware отдают любой ответ частями, поэтому размер ответа
+    определяется не по первой части: начало тела копится, пока не наберется порог или не
+    закончится ответ.
+    """
+
+    def __init__(
+        self, send: Send, encoding: str, minimum_size: int, gzip_level: int, brotli_quality: int
+    ):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+
+        self._start: Optional[Message] = None
+        self._buffer = b""
+        self._encoder: Optional[_Encoder] = None
+        self._passthrough = False
+        # Тело отправлено по Content-Length, но приложение еще не прислало последнее сообщение
+        self._complete = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Заголовки зависят от тела: отправляются вместе с его первой частью
+            self._start = message
+            return
+
+        if message["type"] == "http.response.body" and self._complete:
+            self._complete = message.get("more_body", False)
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        if self._encoder is not None:
+            await self._send_compressed(message)
+            return
+
+        headers = MutableHeaders(raw=self._start["headers"])
+        if not self._compressible(headers):
+            self._passthrough = True
+            await self._send(self._start)
+            await self._send(message)
+            return
+
+        self._buffer += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        # Тело с Content-Length уже в памяти, но middleware("http") передает его с more_body:
+        # оно собирается целиком и сжимается одним телом с Content-Length
+        declared_size = int(headers.get("content-length", 0))
+        if more_body and len(self._buffer) < max(self._minimum_size, declared_size):
+            return
+        if declared_size and len(self._buffer) >= declared_size:
+            # Оставшиеся сообщения пустые и не отправляются: тело уже закончено
+            self._complete = more_body
+            more_body = False
+
+        headers.add_vary_header("Accept-Encoding")
+        body, self._buffer = self._buffer, b""
+
+        if len(body) < self._minimum_size:
+            # Ответ закончился раньше порога: отдается как есть, одним телом
+            self._passthrough = True
+            headers["Content-Length"] = str(len(body))
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        self._encoder = _Encoder(self._encoding, self._gzip_level, self._brotli_quality)
+        headers["Content-Encoding"] = self._encoding
+
+        if not more_body:
+            compressed = self._encoder.finish(body)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        # Длина сжатого потока заранее неизвестна
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self._send(self._start)
+        await self._send_compressed({"body": body, "more_body": True})
+
+    async def _send_compressed(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressed = self._encoder.compress(body) if more_body else self._encoder.finish(body)
+
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self._start["status"] < 200 or self._start["status"] in (204, 304):
+            return False
+
+        if "content-encoding" in headers:
+            return False
+
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+class _CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # У ответа на HEAD нет тела, его Content-Length относится к GET
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, encoding, self.minimum_size, self.gzip_level, self.brotli_quality
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class ResponseCompression:
+    """Сжатие ответов API: middleware оборачивает зарегистрированные до нее middleware"""
+
+    fastapi_app: FastAPI
+
+    def __init__(
+        self,
+        fastapi_app: FastAPI,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+    ):
+        self.fastapi_app = fastapi_app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def register(self):
+        self.fastapi_app.add_middleware(
+            _CompressionMiddleware,
+            minimum_size=self.minimum_size,
+            gzip_level=self.gzip_level,
+            brotli_quality=self.brotli_quality,
+        )
@@ -0,0 +1,67 @@
+"""
+Условные GET-запросы: слабые ETag, Last-Modified и ответ 304 Not Modified
+
+Обработчик проверяет условие по дешевой версии ресурса и читает сам ресурс,
+только если клиентская копия устарела.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def weak_etag(*parts) -> str:
+    """Слабый ETag из значений, определяющих представление ресурса"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _utc(value: datetime) -> datetime:
+    # Наивное время в БД — локальное время сервера, как DateTime.now() в сервисах
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_utc(value), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _opaque_tag(etag: str) -> str:
+    # If-None-Match сравнивает ETag слабо: префикс W/ не учитывается
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Копия клиента актуальна: If-None-Match совпал или ресурс не менялся с If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # При If-None-Match заголовок If-Modified-Since не учитывается (RFC 9110, 13.2.2)
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque_tag(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    # Дата HTTP с точностью до секунды
+    return _utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: dict) -> Response:
+    """304 без тела; валидаторы и Cache-Control повторяются, как требует RFC 9110"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,199 @@
+"""
+Метрики в формате Prometheus: запросы и задержки по маршрутам, доменные счетчики
+
+При нескольких воркерах uvicorn задайте `PROMETHEUS_MULTIPROC_DIR` (пустой каталог, общий
+для воркеров) до запуска процесса: значения пишутся в файлы и суммируются при сборе.
+Монотонные счетчики stats-провайдеров (`app_counters_total`) суммируются по воркерам,
+остальные значения (`app_stats`: размеры, состояние пула) — по ряду на воркер с меткой `pid`.
+"""
+
+import logging
+import os
+import time
+from typing import Callable
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Маршрут запросов, не совпавших ни с одним шаблоном: сырой путь раздул бы число рядов
+UNMATCHED_ROUTE = "unmatched"
+
+# Как часто воркер переносит значения stats-провайдеров в метрики между сборами, в секундах
+STATS_REFRESH_INTERVAL = 1.0
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_requests_total = Counter(
+    "http_requests_total", "Число HTTP-запросов", ["method", "route", "status"]
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP-запросы в обработке",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+# Значения stats-провайдеров (кэш, пул соединений, сервисы): монотонные счетчики
+# суммируются по воркерам, сумма остальных (размер кэша, pool_size, ready) не имеет смысла
+app_counters = Counter(
+    "app_counters", "Монотонные счетчики компонентов приложения", ["provider", "name"]
+)
+app_stats = Gauge(
+    "app_stats",
+    "Текущие значения компонентов приложения",
+    ["provider", "name"],
+    multiprocess_mode="liveall",
+)
+
+# Ключи stats-провайдеров, которые только растут; также ключи с суффиксом _total
+COUNTER_STATS = frozenset(
+    {
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "second_tier_hits",
+        "stale_fills_skipped",
+        "posts_created",
+        "posts_bulk_created",
+        "primary_reads",
+        "reads",
+        "ejections",
+        "attempts",
+    }
+)
+# Кумулятивные гистограммы: их buckets, count и sum только растут. Сводки вроде
+# connection_age_seconds (count — число открытых соединений) остаются значениями
+COUNTER_HISTOGRAMS = frozenset({"wait_seconds"})
+
+
+def _flatten(stats: dict, path: tuple = ()):
+    for key, value in stats.items():
+        key_path = (*path, str(key))
+        if isinstance(value, dict):
+            yield from _flatten(value, key_path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield key_path, value
+
+
+def _is_counter(path: tuple) -> bool:
+    key = path[-1]
+    if key in COUNTER_STATS or key.endswith("_total"):
+        return True
+
+    if len(path) >= 2 and path[-2] in COUNTER_HISTOGRAMS:
+        return key in ("count", "sum")
+
+    return len(path) >= 3 and path[-3] in COUNTER_HISTOGRAMS and path[-2] == "buckets"
+
+
+class MetricsAPI:
+    """Эндпоинт /metrics и middleware, собирающее метрики HTTP-запросов"""
+
+    fastapi_app: FastAPI
+
+    def __init__(
+        self,
+        fastapi_app: FastAPI,
+        stats_providers: dict[str, Callable[[], dict]],
+        api_prefix: str = "",
+    ):
+        self.fastapi_app = fastapi_app
+        self.stats_providers = stats_providers
+        self.api_prefix = api_prefix
+        self._stats_refreshed_at = float("-inf")
+        # Последние значения монотонных счетчиков: в Counter переносится прирост
+        self._counter_values: dict[tuple[str, str], float] = {}
+
+    def register(self):
+        self.fastapi_app.middleware("http")(self.dispatch)
+        self.fastapi_app.get(self.api_prefix + "/metrics", include_in_schema=False)(self.metrics())
+
+        if os.getenv(MULTIPROC_DIR_ENV):
+            self.fastapi_app.add_event_handler("shutdown", self._mark_process_dead)
+
+    async def dispatch(self, request: Request, call_next):
+        method = request.method
+        start = time.perf_counter()
+        status = 500
+
+        http_requests_in_flight.labels(method).inc()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            http_requests_in_flight.labels(method).dec()
+
+            route = request.scope.get("route")
+            route_path = route.path if route is not None else UNMATCHED_ROUTE
+            http_requests_total.labels(method, route_path, str(status)).inc()
+            http_request_duration_seconds.labels(method, route_path).observe(
+                time.perf_counter() - start
+            )
+            if time.monotonic() - self._stats_refreshed_at >= STATS_REFRESH_INTERVAL:
+                self.refresh_stats()
+
+    def refresh_stats(self) -> None:
+        """Перенести текущие значения stats-провайдеров в метрики
+
+        Ошибка провайдера только пишется в лог: обновление идет в middleware,
+        и исключение заменило бы ответ на запрос.
+        """
+        self._stats_refreshed_at = time.monotonic()
+        for provider, stats in self.stats_providers.items():
+            try:
+                values = list(_flatten(stats()))
+            except Exception as error:
+                logger.warning(f"Stats provider {provider} failed: {error}")
+                continue
+
+            for path, value in values:
+                name = ".".join(path)
+                if _is_counter(path):
+                    self._add_counter(provider, name, value)
+                else:
+                    app_stats.labels(provider, name).set(value)
+
+    def _add_counter(self, provider: str, name: str, value: float) -> None:
+        previous = self._counter_values.get((provider, name), 0)
+        self._counter_values[provider, name] = value
+        # Уменьшение значит, что счетчик провайдера сброшен: прирост считается с нуля
+        app_counters.labels(provider, name).inc(value - previous if value >= previous else value)
+
+    def metrics(self):
+
+        def f():
+            self.refresh_stats()
+
+            if os.getenv(MULTIPROC_DIR_ENV):
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry)
+            else:
+                registry = REGISTRY
+
+            return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+        return f
+
+    @staticmethod
+    def _mark_process_dead():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,20 @@
+from fastapi import FastAPI, Request
+
+from app.storage.postgres.replicas import read_routing_scope
+
+
+class ReadRoutingMiddleware:
+    """Граница запроса для чтения своих записей: после записи чтения идут в основную БД"""
+
+    fastapi_app: FastAPI
+
+    def __init__(self, fastapi_app: FastAPI):
+        self.fastapi_app = fastapi_app
+
+    def register(self):
+        self.fastapi_app.middleware("http")(self.dispatch)
+
+    @staticmethod
+    async def dispatch(request: Request, call_next):
+        with read_routing_scope():
+            return await call_next(request)
@@ -0,0 +1,110 @@
+"""
+Готовность воркера принимать трафик: `GET /ready`
+
+`/health` отвечает, что процесс жив, и не трогает зависимости. `/ready` отвечает 200,
+только когда прогрев при старте (`warmup`, например открытие соединений пула) прошел.
+Прогрев идет фоновой задачей после события startup, поэтому старт воркера не ждет
+доступности БД: пока прогрев не прошел, `/ready` отвечает 503 со статусом `starting`,
+после неудачной попытки — `unavailable`, и попытка повторяется через `retry_seconds`.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi import FastAPI
+
+from app.transport.rest.fast_api.common.responses import DomainJSONResponse
+
+logger = logging.getLogger(__name__)
+
+STATUS_STARTING = "starting"
+STATUS_READY = "ready"
+STATUS_UNAVAILABLE = "unavailable"
+
+DEFAULT_RETRY_SECONDS = 5.0
+
+
+class ReadinessAPI:
+    """Эндпоинт /ready и прогрев зависимостей при старте приложения"""
+
+    fastapi_app: FastAPI
+
+    def __init__(
+        self,
+        fastapi_app: FastAPI,
+        warmup: Optional[Callable[[], Awaitable[object]]] = None,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+        api_prefix: str = "",
+    ):
+        self.fastapi_app = fastapi_app
+        self.warmup = warmup
+        self.retry_seconds = retry_seconds
+        self.api_prefix = api_prefix
+
+        self.status = STATUS_STARTING
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.warmup_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self):
+        self.fastapi_app.add_event_handler("startup", self._start)
+        self.fastapi_app.add_event_handler("shutdown", self._stop)
+        self.fastapi_app.get(self.api_prefix + "/ready")(self.ready())
+
+    def stats(self) -> dict:
+        """Состояние готовности для внутреннего API и метрик"""
+        return {
+            "ready": int(self.status == STATUS_READY),
+            "attempts": self.attempts,
+            "warmup_seconds": self.warmup_seconds,
+        }
+
+    def ready(self):
+
+        def f():
+            content = {"status": self.status}
+            if self.status != STATUS_READY:
+                content["error"] = self.last_error
+                return DomainJSONResponse(content, status_code=503)
+
+            return DomainJSONResponse(content)
+
+        return f
+
+    async def _start(self):
+        if self.warmup is None:
+            self.status = STATUS_READY
+            return
+
+        self._task = asyncio.create_task(self._warm_up())
+
+    async def _stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _warm_up(self):
+        start = time.perf_counter()
+        while True:
+            self.attempts += 1
+            try:
+                await self.warmup()
+            except Exception as error:
+                # Текст ошибки подключения может содержать адрес БД, наружу отдается только тип
+                logger.warning(f"Warmup attempt {self.attempts} failed: {error}")
+                self.status = STATUS_UNAVAILABLE
+                self.last_error = type(error).__name__
+                await asyncio.sleep(self.retry_seconds)
+                continue
+
+            self.status = STATUS_READY
+            self.last_error = None
+            self.warmup_seconds = round(time.perf_counter() - start, 3)
+            logger.info(f"Ready after {self.warmup_seconds}s, {self.attempts} warmup attempts")
+            return
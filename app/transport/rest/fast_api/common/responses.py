@@ -0,0 +1,108 @@
+"""
+JSON-ответы через orjson с явными схемами доменных объектов
+
+FastAPI кодирует возвращенные объекты дважды: `jsonable_encoder` обходит их через
+интроспекцию и строит копию из словарей и строк, затем `json.dumps` сериализует копию.
+`DomainJSONResponse` сериализует содержимое за один проход orjson; доменные объекты
+кодируются функциями схем из `RESPONSE_SCHEMAS`, UUID и datetime — самим orjson.
+Обработчик должен вернуть ответ сам, иначе FastAPI все равно вызовет `jsonable_encoder`.
+
+Списки длиннее страницы `list_response` отдает потоком `DomainJSONStreamResponse`: массив
+кодируется частями по `JSON_STREAM_CHUNK_SIZE` элементов, и сжатие ответа получает их по одной.
+Страницы не длиннее `MAX_PAGE_SIZE` уже в памяти и уходят одним телом: с Content-Length
+и Server-Timing, которого у потоковых ответов нет.
+"""
+
+from typing import Any, Callable, Iterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.domain.services.post import MAX_PAGE_SIZE
+
+
+def _post_tag_schema(post_tag: PostTag) -> dict:
+    return {"id_": post_tag.id_, "name": post_tag.name}
+
+
+def _post_schema(post: Post) -> dict:
+    # Теги остаются объектами: orjson закодирует их схемой PostTag при обходе списка
+    return {
+        "id_": post.id_,
+        "title": post.title,
+        "body": post.body,
+        "status": post.status,
+        "created_at": post.created_at,
+        "updated_at": post.updated_at,
+        "tags": post.tags,
+    }
+
+
+# Сколько элементов кодируется за один шаг потокового ответа
+JSON_STREAM_CHUNK_SIZE = 20
+
+# С какой длины список отдается потоком: любая страница API короче
+JSON_STREAM_MIN_ITEMS = MAX_PAGE_SIZE + 1
+
+# Поля и их порядок совпадают с тем, что отдавал jsonable_encoder
+RESPONSE_SCHEMAS: dict[type, Callable[[Any], dict]] = {
+    Post: _post_schema,
+    PostTag: _post_tag_schema,
+}
+
+
+def _default(value: Any) -> Any:
+    schema = RESPONSE_SCHEMAS.get(type(value))
+    if schema is None:
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+    return schema(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+class DomainJSONResponse(JSONResponse):
+    """JSON-ответ, сериализующий доменные объекты orjson без промежуточной копии"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def iter_json_array(items: list, chunk_size: int = JSON_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """JSON-массив по частям; вместе дают то же, что `dumps(items)`"""
+    yield b"["
+    for start in range(0, len(items), chunk_size):
+        # Скобки массива части отбрасываются, части разделяются запятой
+        chunk = dumps(items[start : start + chunk_size])[1:-1]
+        yield b"," + chunk if start else chunk
+    yield b"]"
+
+
+class DomainJSONStreamResponse(StreamingResponse):
+    """JSON-массив доменных объектов, закодированный и отправленный частями"""
+
+    def __init__(
+        self,
+        items: list,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        chunk_size: int = JSON_STREAM_CHUNK_SIZE,
+    ):
+        super().__init__(
+            iter_json_array(items, chunk_size),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+def list_response(items: list, headers: Optional[dict] = None) -> JSONResponse | StreamingResponse:
+    """Короткий список — одним телом с Content-Length, длинный — потоком"""
+    if len(items) >= JSON_STREAM_MIN_ITEMS:
+        return DomainJSONStreamResponse(items, headers=headers)
+
+    return DomainJSONResponse(items, headers=headers)
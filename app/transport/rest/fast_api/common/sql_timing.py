@@ -0,0 +1,88 @@
+import logging
+import time
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request, Response
+
+from app.storage.postgres.instrumentation import QueryStats, track_queries
+
+logger = logging.getLogger("app.sql.requests")
+
+
+class SQLTimingMiddleware:
+    """Число SQL-запросов и время в БД за HTTP-запрос: заголовок Server-Timing и строка в логе
+
+    Тело StreamingResponse (выгрузка постов) формируется после отправки заголовков, поэтому
+    Server-Timing у таких ответов нет, а строка в логе пишется после тела.
+    """
+
+    fastapi_app: FastAPI
+
+    def __init__(self, fastapi_app: FastAPI):
+        self.fastapi_app = fastapi_app
+
+    def register(self):
+        self.fastapi_app.middleware("http")(self.dispatch)
+
+    @classmethod
+    async def dispatch(cls, request: Request, call_next):
+        start = time.perf_counter()
+        # Метка вычисляется при записи медленного запроса: к этому времени роутинг уже прошел
+        with track_queries(lambda: f"{request.method} {cls._route(request)}") as stats:
+            response = await call_next(request)
+
+        if cls._streams_body(response):
+            response.body_iterator = cls._log_after_body(
+                response.body_iterator, request, response, stats, start
+            )
+            return response
+
+        total = time.perf_counter() - start
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+            f"total;dur={total * 1000:.1f}"
+        )
+        cls._log(request, response, stats, total)
+        return response
+
+    @classmethod
+    async def _log_after_body(
+        cls,
+        body: AsyncIterator[bytes],
+        request: Request,
+        response: Response,
+        stats: QueryStats,
+        start: float,
+    ) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            cls._log(request, response, stats, time.perf_counter() - start)
+
+    @classmethod
+    def _log(cls, request: Request, response: Response, stats: QueryStats, total: float):
+        logger.info(
+            "request: method=%s route=%s status=%d db_queries=%d db_ms=%.1f total_ms=%.1f",
+            request.method,
+            cls._route(request),
+            response.status_code,
+            stats.count,
+            stats.duration * 1000,
+            total * 1000,
+        )
+
+    @staticmethod
+    def _route(request: Request) -> str:
+        # Шаблон маршрута известен только после роутинга
+        route = request.scope.get("route")
+        return route.path if route is not None else request.url.path
+
+    @staticmethod
+    def _streams_body(response: Response) -> bool:
+        # Response с готовым телом всегда получает Content-Length, кроме ответов без тела
+        return (
+            "content-length" not in response.headers
+            and response.status_code >= 200
+            and response.status_code not in (204, 304)
+        )
@@ -0,0 +1,42 @@
+from typing import Callable
+
+from fastapi import FastAPI
+
+from app.domain.models.errors.domain import NotFoundError
+
+
+class InternalAPI:
+    """Служебные эндпоинты для эксплуатации; доступ к ним закрывается на уровне прокси"""
+
+    fastapi_app: FastAPI
+
+    def __init__(
+        self,
+        fastapi_app: FastAPI,
+        stats_providers: dict[str, Callable[[], dict]],
+        api_prefix: str = "/internal",
+    ):
+        self.fastapi_app = fastapi_app
+        self.stats_providers = stats_providers
+        self.api_prefix = api_prefix
+
+    def register(self):
+        self.fastapi_app.get(self.api_prefix + "/stats")(self.all_stats())
+        self.fastapi_app.get(self.api_prefix + "/stats/{name}")(self.stats())
+
+    def all_stats(self):
+
+        def f():
+            return {name: provider() for name, provider in self.stats_providers.items()}
+
+        return f
+
+    def stats(self):
+
+        def f(name: str):
+            if name not in self.stats_providers:
+                raise NotFoundError(instance_type="Stats")
+
+            return self.stats_providers[name]()
+
+        return f
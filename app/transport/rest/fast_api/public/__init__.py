@@ -2,9 +2,15 @@ from fastapi import FastAPI
 
 from app.domain.services.post import PostService
 from app.domain.services.post_tag import PostTagService
+from app.transport.rest.fast_api.common.compression import (
+    DEFAULT_BROTLI_QUALITY,
+    DEFAULT_GZIP_LEVEL,
+    DEFAULT_MINIMUM_SIZE,
+    ResponseCompression,
+)
 from app.transport.rest.fast_api.common.heathcheck import HealthCheckAPI
 from app.transport.rest.fast_api.public.exception_handlers import PublicExceptionHandlers
-from app.transport.rest.fast_api.public.post import PostApi
+from app.transport.rest.fast_api.public.post import DEFAULT_PUBLIC_CACHE_CONTROL, PostApi
 from app.transport.rest.fast_api.public.post_tag import PostTagApi
 
 
@@ -16,16 +22,33 @@ class PublicAPI:
         fastapi_app: FastAPI,
         post_service: PostService,
         posts_tags_service: PostTagService,
+        public_post_cache_control: str = DEFAULT_PUBLIC_CACHE_CONTROL,
+        compression_minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        compression_gzip_level: int = DEFAULT_GZIP_LEVEL,
+        compression_brotli_quality: int = DEFAULT_BROTLI_QUALITY,
     ) -> None:
         self.fastapi_app = fastapi_app
 
+        self.compression = ResponseCompression(
+            self.fastapi_app,
+            minimum_size=compression_minimum_size,
+            gzip_level=compression_gzip_level,
+            brotli_quality=compression_brotli_quality,
+        )
+
         self.exception_handlers = PublicExceptionHandlers(self.fastapi_app)
 
         self.healthcheck = HealthCheckAPI(self.fastapi_app, api_prefix="")
-        self.post_api = PostApi(post_service, self.fastapi_app, api_prefix="/post")
-        self.post_tag_api = PostTagApi(self.fastapi_app, api_prefix="/post_tag")
+        self.post_api = PostApi(
+            post_service,
+            self.fastapi_app,
+            api_prefix="/post",
+            public_cache_control=public_post_cache_control,
+        )
+        self.post_tag_api = PostTagApi(posts_tags_service, self.fastapi_app, api_prefix="/post_tag")
 
     def register(self):
+        self.compression.register()
         self.exception_handlers.register()
 
         self.healthcheck.register()
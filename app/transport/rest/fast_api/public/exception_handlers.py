@@ -1,7 +1,12 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
-from app.domain.models.errors.domain import DomainError, NotFoundError
+from app.domain.models.errors.domain import (
+    AlreadyExistsError,
+    ConflictError,
+    DomainError,
+    NotFoundError,
+)
 from app.transport.rest.fast_api.common.errors import ApiError
 
 
@@ -21,6 +26,17 @@ class PublicExceptionHandlers:
         if isinstance(error, NotFoundError):
             return JSONResponse(status_code=404, content={"error": {"code": "not_found"}})
 
+        if isinstance(error, ConflictError):
+            return JSONResponse(
+                status_code=409, content={"error": {"code": "conflict", "message": error.message}}
+            )
+
+        if isinstance(error, AlreadyExistsError):
+            return JSONResponse(
+                status_code=409,
+                content={"error": {"code": "already_exists", "message": error.message}},
+            )
+
         return JSONResponse(
             status_code=400,
             content={"error": error.message},
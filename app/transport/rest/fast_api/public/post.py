@@ -1,25 +1,84 @@
+import csv
+import io
+import json
 import uuid
+from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.domain.models.post import POST_STATUS_ARCHIVE, POST_STATUS_DRAFT, POST_STATUS_PUBLIC
-from app.domain.services.post import PostService
+from app.domain.models.cursor import PostCursor
+from app.domain.models.post import (
+    POST_STATUS_ARCHIVE,
+    POST_STATUS_DRAFT,
+    POST_STATUS_PUBLIC,
+    Post,
+    PostPage,
+    PostVersion,
+)
+from app.domain.services.post import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BULK_STATUS_SIZE,
+    MAX_PAGE_SIZE,
+    PostService,
+)
+from app.transport.rest.fast_api.common.conditional import (
+    http_date,
+    is_conditional,
+    not_modified,
+    not_modified_response,
+    weak_etag,
+)
+from app.transport.rest.fast_api.common.errors import ApiError
+from app.transport.rest.fast_api.common.responses import (
+    RESPONSE_SCHEMAS,
+    DomainJSONResponse,
+    dumps,
+    list_response,
+)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_CSV_COLUMNS = ("id", "title", "body", "status", "created_at", "updated_at", "tags", "cursor")
+
+# Публичные посты может хранить CDN; остальные клиент перепроверяет при каждом запросе
+DEFAULT_PUBLIC_CACHE_CONTROL = "public, max-age=60"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
 
 
 class PostApi:
     fastapi_app: FastAPI
 
-    def __init__(self, post_service: PostService, app: FastAPI, api_prefix: str = "/post"):
+    def __init__(
+        self,
+        post_service: PostService,
+        app: FastAPI,
+        api_prefix: str = "/post",
+        public_cache_control: str = DEFAULT_PUBLIC_CACHE_CONTROL,
+    ):
         self.post_service = post_service
         self.app = app
         self.api_prefix = api_prefix
+        self.public_cache_control = public_cache_control
 
     def register(self):
         self.app.post(self.api_prefix + "")(self.create())
+        self.app.post(self.api_prefix + "/bulk")(self.bulk_create())
         self.app.get(self.api_prefix + "")(self.list_all())
+        # Регистрируются раньше /{id_}, иначе "search" и "export" разбираются как ID
+        self.app.get(self.api_prefix + "/search")(self.search())
+        self.app.get(self.api_prefix + "/export")(self.export())
         self.app.get(self.api_prefix + "/{id_}")(self.get())
+        self.app.put(self.api_prefix + "/status")(self.change_status())
         self.app.put(self.api_prefix + "/{id_}/publish")(self.publish())
         self.app.put(self.api_prefix + "/{id_}/archive")(self.archive())
+        self.app.post(self.api_prefix + "/{id_}/tags")(self.add_tags())
+        self.app.delete(self.api_prefix + "/{id_}/tags")(self.remove_tags())
         self.app.delete(self.api_prefix + "/{id_}")(self.delete())
 
     def create(self):
@@ -28,7 +87,7 @@ class PostApi:
             body = await request.json()
 
             return {
-                "id": self.post_service.create_post(
+                "id": await self.post_service.create_post(
                     title=body.get("title"),
                     body=body.get("body"),
                     status=POST_STATUS_DRAFT,
@@ -37,37 +96,321 @@ class PostApi:
 
         return f
 
+    def bulk_create(self):
+
+        async def f(request: Request):
+            raw = await request.body()
+
+            if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+                items = [self._parse_ndjson_line(line) for line in raw.splitlines() if line.strip()]
+            else:
+                try:
+                    items = json.loads(raw)
+                except ValueError:
+                    items = None
+
+                if not isinstance(items, list):
+                    raise ApiError(
+                        "invalid_body", "Body must be a JSON array or NDJSON", status=400
+                    )
+
+            results = await self.post_service.bulk_create_posts(items)
+            created = sum(result.ok for result in results)
+
+            return {
+                "created": created,
+                "failed": len(results) - created,
+                "items": self._bulk_items(results),
+            }
+
+        return f
+
+    def change_status(self):
+
+        async def f(request: Request):
+            body = await request.json()
+            if not isinstance(body, dict):
+                raise ApiError("invalid_body", "Body must be a JSON object", status=400)
+
+            ids = body.get("ids")
+            if ids is not None:
+                ids = self._parse_ids(ids)
+
+            filters = self._parse_status_filter(body.get("filter") or {})
+            limit = body.get("limit", MAX_BULK_STATUS_SIZE)
+            if not isinstance(limit, int) or limit < 1:
+                raise ApiError("invalid_body", "Limit must be a positive integer", status=400)
+
+            results = await self.post_service.change_posts_status(
+                body.get("status"), ids=ids, filters=filters, limit=limit
+            )
+            updated = sum(result.ok for result in results)
+
+            return {
+                "updated": updated,
+                "failed": len(results) - updated,
+                "items": self._bulk_items(results),
+            }
+
+        return f
+
+    @staticmethod
+    def _bulk_items(results) -> list[dict]:
+        return [
+            {"index": result.index, "id": result.id_, "error": result.error} for result in results
+        ]
+
+    @staticmethod
+    def _parse_ids(ids) -> list[uuid.UUID]:
+        if not isinstance(ids, list):
+            raise ApiError("invalid_body", "Ids must be a list of UUID strings", status=400)
+
+        try:
+            return [uuid.UUID(id_) for id_ in ids]
+        except (AttributeError, TypeError, ValueError):
+            raise ApiError("invalid_body", "Ids must be UUID strings", status=400)
+
+    @staticmethod
+    def _parse_status_filter(raw) -> dict:
+        if not isinstance(raw, dict):
+            raise ApiError("invalid_body", "Filter must be a JSON object", status=400)
+
+        filters = dict(raw)
+        for key in ("created_after", "created_before"):
+            if key in filters:
+                try:
+                    filters[key] = datetime.fromisoformat(filters[key])
+                except (TypeError, ValueError):
+                    raise ApiError("invalid_body", f"{key} must be an ISO datetime", status=400)
+
+        return filters
+
+    @staticmethod
+    def _parse_ndjson_line(line: bytes):
+        try:
+            return json.loads(line)
+        except ValueError:
+            # Сервис вернет ошибку для этого элемента, остальные будут созданы
+            return None
+
     def publish(self):
 
-        def f(id_: uuid.UUID):
-            return self.post_service.update_post(id_, status=POST_STATUS_PUBLIC)
+        async def f(id_: uuid.UUID, expected_updated_at: Optional[datetime] = None):
+            post = await self.post_service.update_post_fields(
+                id_, expected_updated_at=expected_updated_at, status=POST_STATUS_PUBLIC
+            )
+
+            return DomainJSONResponse(post)
 
         return f
 
     def archive(self):
 
-        def f(id_: uuid.UUID):
-            return self.post_service.update_post(id_, status=POST_STATUS_ARCHIVE)
+        async def f(id_: uuid.UUID, expected_updated_at: Optional[datetime] = None):
+            post = await self.post_service.update_post_fields(
+                id_, expected_updated_at=expected_updated_at, status=POST_STATUS_ARCHIVE
+            )
+
+            return DomainJSONResponse(post)
+
+        return f
+
+    def add_tags(self):
+
+        async def f(id_: uuid.UUID, request: Request):
+            body = await request.json()
+            if not isinstance(body, dict):
+                raise ApiError("invalid_body", "Body must be a JSON object", status=400)
+
+            return await self.post_service.add_tags(id_, self._parse_ids(body.get("tag_ids")))
+
+        return f
+
+    def remove_tags(self):
+
+        async def f(id_: uuid.UUID, tag_id: list[uuid.UUID] = Query(...)):
+            return await self.post_service.remove_tags(id_, tag_id)
 
         return f
 
     def get(self):
 
-        def f(id_: uuid.UUID):
-            return self.post_service.get_post(id_)
+        async def f(id_: uuid.UUID, request: Request):
+            if is_conditional(request):
+                # Условие проверяется по версии поста, сам пост читается, только если он изменился
+                version = await self.post_service.get_post_version(id_)
+                headers = self._post_headers(version)
+                if not_modified(request, headers["ETag"], version.updated_at):
+                    return not_modified_response(headers)
+
+            post = await self.post_service.get_post(id_)
+
+            return DomainJSONResponse(post, headers=self._post_headers(post))
 
         return f
 
     def delete(self):
 
-        def f(id_: uuid.UUID):
-            return self.post_service.delete_post(id_)
+        async def f(id_: uuid.UUID):
+            return await self.post_service.delete_post(id_)
 
         return f
 
     def list_all(self):
 
-        def f():
-            return self.post_service.list_posts()
+        async def f(
+            request: Request,
+            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+            cursor: Optional[str] = None,
+            status: Optional[str] = None,
+        ):
+            filters = {"status": status} if status is not None else {}
+
+            if is_conditional(request):
+                versions = await self.post_service.list_post_versions(
+                    limit=limit, cursor=cursor, **filters
+                )
+                headers = self._page_headers(
+                    versions[:limit], len(versions) > limit, limit, cursor, filters
+                )
+                if not_modified(request, headers["ETag"]):
+                    return not_modified_response(headers)
+
+            page = await self.post_service.list_posts(limit=limit, cursor=cursor, **filters)
+            headers = self._page_headers(
+                page.items, page.next_cursor is not None, limit, cursor, filters
+            )
+
+            return self._page_response(page, headers)
+
+        return f
+
+    def search(self):
+
+        async def f(
+            q: str = Query(..., min_length=1),
+            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+            cursor: Optional[str] = None,
+            status: Optional[str] = None,
+        ):
+            filters = {"status": status} if status is not None else {}
+            page = await self.post_service.search_posts(q, limit=limit, cursor=cursor, **filters)
+
+            return self._page_response(page)
 
         return f
+
+    def export(self):
+
+        async def f(
+            format: str = Query(EXPORT_FORMAT_NDJSON, pattern="^(ndjson|csv)$"),
+            cursor: Optional[str] = None,
+            status: Optional[str] = None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+        ):
+            filters = {
+                key: value
+                for key, value in (
+                    ("status", status),
+                    ("created_after", created_after),
+                    ("created_before", created_before),
+                )
+                if value is not None
+            }
+            batches = await self.post_service.export_posts(cursor=cursor, **filters)
+
+            if format == EXPORT_FORMAT_CSV:
+                return StreamingResponse(self._csv_chunks(batches), media_type=CSV_MEDIA_TYPE)
+
+            return StreamingResponse(self._ndjson_chunks(batches), media_type=NDJSON_MEDIA_TYPE)
+
+        return f
+
+    @staticmethod
+    async def _ndjson_chunks(batches: AsyncIterator[list[Post]]) -> AsyncIterator[bytes]:
+        """Строка на пост: поля поста и `cursor` для продолжения выгрузки после него"""
+        encode_post = RESPONSE_SCHEMAS[Post]
+        async for posts in batches:
+            yield b"".join(
+                dumps({**encode_post(post), "cursor": PostApi._export_cursor(post)}) + b"\n"
+                for post in posts
+            )
+
+    @staticmethod
+    async def _csv_chunks(batches: AsyncIterator[list[Post]]) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+
+        async for posts in batches:
+            for post in posts:
+                writer.writerow(
+                    (
+                        post.id_,
+                        post.title,
+                        post.body,
+                        post.status,
+                        post.created_at.isoformat(),
+                        post.updated_at.isoformat(),
+                        dumps([tag.name for tag in post.tags]).decode(),
+                        PostApi._export_cursor(post),
+                    )
+                )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Постов не было: отдаем только строку заголовка
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _export_cursor(post: Post) -> str:
+        return PostCursor(created_at=post.created_at, id_=post.id_).encode()
+
+    def _cache_control(self, status: Optional[str]) -> str:
+        return self.public_cache_control if status == POST_STATUS_PUBLIC else PRIVATE_CACHE_CONTROL
+
+    def _post_headers(self, post: Post | PostVersion) -> dict:
+        """ETag из (id, updated_at) и Last-Modified; одинаковы для поста и его версии
+
+        Тело поста включает имена тегов, поэтому переименование и удаление тега тоже
+        обновляют updated_at его постов (см. PostTagService): иначе ETag устаревает.
+        """
+        return {
+            "ETag": weak_etag(post.id_, post.updated_at),
+            "Last-Modified": http_date(post.updated_at),
+            "Cache-Control": self._cache_control(post.status),
+        }
+
+    def _page_headers(
+        self,
+        posts: list[Post] | list[PostVersion],
+        has_next: bool,
+        limit: int,
+        cursor: Optional[str],
+        filters: dict,
+    ) -> dict:
+        """ETag страницы из параметров запроса и (id, updated_at) ее постов
+
+        Last-Modified у страницы нет: удаление поста меняет страницу, но не max(updated_at).
+        """
+        return {
+            "ETag": weak_etag(
+                sorted(filters.items()),
+                limit,
+                cursor,
+                [(post.id_, post.updated_at) for post in posts],
+                has_next,
+            ),
+            "Cache-Control": self._cache_control(filters.get("status")),
+        }
+
+    @staticmethod
+    def _page_response(page: PostPage, headers: Optional[dict] = None) -> Response:
+        headers = dict(headers or {})
+        if page.next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor.encode()
+
+        return list_response(page.items, headers=headers)
@@ -1,11 +1,99 @@
-from fastapi import FastAPI
+import uuid
+from typing import Optional
+
+from fastapi import FastAPI, Query, Request
+
+from app.domain.services.post import MAX_PAGE_SIZE
+from app.domain.services.post_tag import DEFAULT_SUGGEST_SIZE, MAX_SUGGEST_SIZE, PostTagService
+from app.transport.rest.fast_api.common.errors import ApiError
+from app.transport.rest.fast_api.common.responses import DomainJSONResponse, list_response
 
 
 class PostTagApi:
     fastapi_app: FastAPI
 
-    def __init__(self, fastapi_app: FastAPI, api_prefix: str = "post_tag"):
-        self.fastapi_app = fastapi_app
+    def __init__(
+        self, post_tag_service: PostTagService, app: FastAPI, api_prefix: str = "/post_tag"
+    ):
+        self.post_tag_service = post_tag_service
+        self.app = app
+        self.api_prefix = api_prefix
 
     def register(self):
-        pass
+        self.app.post(self.api_prefix + "")(self.create())
+        self.app.get(self.api_prefix + "")(self.list_all())
+        # Регистрируется раньше /{id_}, иначе "suggest" разбирается как ID
+        self.app.get(self.api_prefix + "/suggest")(self.suggest())
+        self.app.get(self.api_prefix + "/{id_}")(self.get())
+        self.app.put(self.api_prefix + "/{id_}")(self.update())
+        self.app.delete(self.api_prefix + "/{id_}")(self.delete())
+
+    def create(self):
+
+        async def f(request: Request):
+            body = await self._json_object(request)
+
+            return {"id": await self.post_tag_service.create_post_tag(body.get("name"))}
+
+        return f
+
+    def list_all(self):
+
+        async def f(
+            limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+            offset: int = Query(0, ge=0),
+        ):
+            return list_response(
+                await self.post_tag_service.list_post_tags(limit=limit, offset=offset)
+            )
+
+        return f
+
+    def suggest(self):
+
+        async def f(
+            prefix: str = Query(..., min_length=1),
+            limit: int = Query(DEFAULT_SUGGEST_SIZE, ge=1, le=MAX_SUGGEST_SIZE),
+        ):
+            return DomainJSONResponse(
+                await self.post_tag_service.suggest_post_tags(prefix, limit=limit)
+            )
+
+        return f
+
+    def get(self):
+
+        async def f(id_: uuid.UUID):
+            return DomainJSONResponse(await self.post_tag_service.get_post_tag(id_))
+
+        return f
+
+    def update(self):
+
+        async def f(id_: uuid.UUID, request: Request):
+            body = await self._json_object(request)
+
+            return DomainJSONResponse(
+                await self.post_tag_service.update_post_tag(id_, body.get("name"))
+            )
+
+        return f
+
+    def delete(self):
+
+        async def f(id_: uuid.UUID):
+            return await self.post_tag_service.delete_post_tag(id_)
+
+        return f
+
+    @staticmethod
+    async def _json_object(request: Request) -> dict:
+        try:
+            body: Optional[dict] = await request.json()
+        except ValueError:
+            body = None
+
+        if not isinstance(body, dict):
+            raise ApiError("invalid_body", "Body must be a JSON object", status=400)
+
+        return body
@@ -0,0 +1,127 @@
+"""
+Сравнение массовой загрузки постов: построчный цикл против bulk_create_posts
+
+Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.bulk_insert --posts 10000 --tags 200
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import datetime
+
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+from app.storage.postgres.models import PostModel, PostTagModel
+from app.storage.postgres.post import PostRepository
+from app.storage.postgres.post_tag import PostTagRepository
+
+
+def make_posts_data(posts: int, tags: int, tags_per_post: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    # Префикс прогона, чтобы прогоны не переиспользовали теги друг друга
+    run = uuid.uuid4().hex[:8]
+    tag_names = [f"bench-{run}-{i}" for i in range(tags)]
+
+    return [
+        {
+            "title": f"Benchmark post {i}",
+            "body": "x" * rng.randint(100, 2000),
+            "tags": rng.sample(tag_names, tags_per_post),
+        }
+        for i in range(posts)
+    ]
+
+
+def per_row_loop(db_manager: DatabaseManager, posts_data: list[dict]) -> None:
+    """Прежний подход: get_or_create_post_tag на каждый тег и session.add на каждый пост"""
+    post_tag_repo = PostTagRepository(db_manager)
+
+    with db_manager.transaction() as session:
+        for post_data in posts_data:
+            tag_ids = []
+            for tag_name in post_data["tags"]:
+                tag_ids.append(post_tag_repo.get_or_create_post_tag(tag_name, session).id_)
+                # Новый тег должен быть виден следующему get_or_create_post_tag
+                session.flush()
+
+            now = datetime.utcnow()
+            post_model = PostModel(
+                id=uuid.uuid4(),
+                title=post_data["title"],
+                body=post_data["body"],
+                status="draft",
+                created_at=now,
+                updated_at=now,
+            )
+            post_model.tags = session.query(PostTagModel).filter(PostTagModel.id.in_(tag_ids)).all()
+            session.add(post_model)
+            session.flush()
+
+
+def bulk(db_manager: DatabaseManager, posts_data: list[dict]) -> None:
+    now = datetime.utcnow()
+    posts = [
+        Post(
+            id_=uuid.uuid4(),
+            title=post_data["title"],
+            body=post_data["body"],
+            status="draft",
+            created_at=now,
+            updated_at=now,
+            tags=[PostTag(id_=uuid.uuid4(), name=name) for name in post_data["tags"]],
+        )
+        for post_data in posts_data
+    ]
+
+    with db_manager.transaction() as session:
+        PostRepository(db_manager).bulk_create_posts(posts, session)
+
+
+def measure(name: str, fn, db_manager: DatabaseManager, posts_data: list[dict]) -> float:
+    start = time.perf_counter()
+    fn(db_manager, posts_data)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>12}: {elapsed:8.2f} s, {len(posts_data) / elapsed:10.0f} posts/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "localhost"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    Migrator(db_manager).apply()
+
+    loop_time = measure(
+        "per-row loop",
+        per_row_loop,
+        db_manager,
+        make_posts_data(args.posts, args.tags, args.tags_per_post, args.seed),
+    )
+    bulk_time = measure(
+        "bulk",
+        bulk,
+        db_manager,
+        make_posts_data(args.posts, args.tags, args.tags_per_post, args.seed),
+    )
+    print(f"{'speedup':>12}: {loop_time / bulk_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Память списка постов: сколько занимают доменные объекты результата list_posts_by_filters
+
+Посты бенчмарка (статус `memory_bench`, по --tags-per-post тега из общего набора --tags)
+добавляются в таблицу до --posts штук, повторный запуск переиспользует их. Память
+меряется tracemalloc: пик во время запроса и объем, удерживаемый готовым списком.
+Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.domain_memory --posts 100000
+"""
+
+import argparse
+import gc
+import os
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+from app.storage.postgres.models import PostModel
+from app.storage.postgres.post import PostRepository
+
+BENCH_STATUS = "memory_bench"
+
+
+def seed(repository: PostRepository, db_manager: DatabaseManager, args) -> None:
+    with db_manager.get_session() as session:
+        existing = session.execute(
+            select(func.count()).select_from(PostModel).where(PostModel.status == BENCH_STATUS)
+        ).scalar()
+
+    rng = random.Random(args.seed)
+    tag_names = [f"memory-bench-{i}" for i in range(args.tags)]
+    now = datetime.now()
+
+    for start in range(existing, args.posts, 10_000):
+        posts = [
+            Post(
+                id_=uuid.uuid4(),
+                title=f"Memory benchmark post {i}",
+                body="x" * rng.randint(100, 600),
+                status=BENCH_STATUS,
+                created_at=now - timedelta(seconds=i),
+                updated_at=now,
+                tags=[
+                    PostTag(id_=uuid.uuid4(), name=name)
+                    for name in rng.sample(tag_names, args.tags_per_post)
+                ],
+            )
+            for i in range(start, min(start + 10_000, args.posts))
+        ]
+        repository.bulk_create_posts(posts)
+        print(f"seeded {start + len(posts)} / {args.posts} posts")
+
+
+def measure(repository: PostRepository, limit: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    posts = repository.list_posts_by_filters(status=BENCH_STATUS, limit=limit)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tags = {id(tag) for post in posts for tag in post.tags}
+    links = sum(len(post.tags) for post in posts)
+    print(f"posts: {len(posts)}, tag links: {links}, distinct tag objects: {len(tags)}")
+    print(f"time: {elapsed:.2f} s")
+    print(f"retained by result: {retained / 2**20:8.1f} MiB ({retained / len(posts):.0f} B/post)")
+    print(f"peak during query:  {peak / 2**20:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "localhost"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    Migrator(db_manager).apply()
+
+    repository = PostRepository(db_manager)
+    seed(repository, db_manager, args)
+    measure(repository, args.posts)
+
+
+if __name__ == "__main__":
+    main()
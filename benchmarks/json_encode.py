@@ -0,0 +1,85 @@
+"""
+Сериализация ответа со списком постов: jsonable_encoder + json.dumps против DomainJSONResponse
+
+БД не нужна: посты с тегами создаются в памяти. Запуск:
+    python -m benchmarks.json_encode --posts 1000 --tags 3
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.transport.rest.fast_api.common.responses import DomainJSONResponse
+
+
+def make_posts(count: int, tags_per_post: int) -> list[Post]:
+    now = datetime.now()
+    tags = [PostTag(uuid.uuid4(), f"tag-{i}") for i in range(50)]
+
+    return [
+        Post(
+            uuid.uuid4(),
+            f"Benchmark post {i}",
+            "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 10,
+            "public",
+            now - timedelta(seconds=i),
+            now,
+            [tags[(i + j) % len(tags)] for j in range(tags_per_post)],
+        )
+        for i in range(count)
+    ]
+
+
+def _attributes(value):
+    """Атрибуты объекта словарем, как их видел jsonable_encoder через vars() до __slots__"""
+    if isinstance(value, (Post, PostTag)):
+        return {name: _attributes(getattr(value, name)) for name in value.__slots__}
+    if isinstance(value, list):
+        return [_attributes(item) for item in value]
+    return value
+
+
+def fastapi_default(posts: list[Post]) -> bytes:
+    """Что делает FastAPI, когда обработчик возвращает объекты без response_model"""
+    return JSONResponse(jsonable_encoder(_attributes(posts))).body
+
+
+def domain_response(posts: list[Post]) -> bytes:
+    return DomainJSONResponse(posts).body
+
+
+def measure(name: str, fn, posts: list[Post], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(posts)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    print(f"{name:>32}: median {median * 1000:8.2f} ms per {len(posts)} posts")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.tags)
+
+    before = measure("jsonable_encoder + json.dumps", fastapi_default, posts, args.repeat)
+    after = measure("DomainJSONResponse (orjson)", domain_response, posts, args.repeat)
+    print(f"{'speedup':>32}: {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Нагрузочный сценарий публичного API: смесь чтений и записей, p50/p95/p99 и запросов в секунду
+
+Запросы идут по расписанию, выведенному из --seed: доли операций заданы в OPERATIONS,
+посты и теги выбираются из набора benchmarks.seed. Записи создают посты с заголовком
+LOAD_TITLE_PREFIX, публикуют их и ставят им теги; в конце они удаляются.
+По умолчанию приложение запускается в процессе (httpx.ASGITransport, без сети);
+с --url нагрузка идет на запущенный сервер, который должен смотреть в ту же БД, что
+и DB_* переменные окружения скрипта. Регрессия против `baselines/load.json` или
+ответы с ошибкой завершают процесс с кодом 1.
+Запуск:
+    python -m benchmarks.load --posts 100000 --tags 500 --requests 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Optional
+
+import httpx
+from sqlalchemy import delete
+
+from app.storage.postgres.models import PostModel
+from benchmarks.report import add_baseline_arguments, finish, summarize
+from benchmarks.repositories import Fixtures
+from benchmarks.seed import Dataset, add_dataset_arguments, connect, seed
+
+SUITE = "load"
+
+LOAD_TITLE_PREFIX = "bench-load "
+
+# Доли операций в смеси: преобладают чтения ленты и постов, как у блога
+OPERATIONS = {
+    "GET /post": 30,
+    "GET /post/{id}": 30,
+    "GET /post/{id} conditional": 5,
+    "GET /post/search": 8,
+    "GET /post_tag/suggest": 7,
+    "GET /post_tag": 5,
+    "POST /post": 8,
+    "PUT /post/{id}/publish": 4,
+    "POST /post/{id}/tags": 3,
+}
+
+
+class Scenario:
+    """Запрос операции по номеру в расписании; ответ с ошибкой запоминается"""
+
+    def __init__(self, client: httpx.AsyncClient, fx: Fixtures, seed: int):
+        self.client = client
+        self.fx = fx
+        self.rng = random.Random(f"{seed}:load")
+        self.created: list[str] = []
+        # Посты, уже полученные клиентом, и их ETag: повторные запросы идут с If-None-Match
+        self.etags: list[tuple[str, str]] = []
+        self.errors: dict[str, int] = {}
+
+    def schedule(self, count: int) -> list[str]:
+        names, weights = zip(*OPERATIONS.items())
+        return self.rng.choices(names, weights, k=count)
+
+    async def run(self, operation: str, index: int) -> None:
+        response = await self._request(operation, index)
+        if response.status_code >= 400:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    async def _request(self, operation: str, index: int) -> httpx.Response:
+        fx = self.fx
+        post_id = str(fx.post_ids[index % len(fx.post_ids)])
+        tag = fx.tags[index % len(fx.tags)]
+
+        if operation == "GET /post":
+            # Каждый четвертый запрос листает ленту вглубь
+            params = {"status": "public"}
+            if index % 4 == 0:
+                params["cursor"] = fx.cursors[index % len(fx.cursors)].encode()
+            return await self.client.get("/post", params=params)
+
+        if operation == "GET /post/{id}":
+            response = await self.client.get(f"/post/{post_id}")
+            if "etag" in response.headers:
+                self.etags.append((post_id, response.headers["etag"]))
+            return response
+
+        if operation == "GET /post/{id} conditional":
+            etag_id, etag = self.etags[index % len(self.etags)] if self.etags else (post_id, "*")
+            return await self.client.get(f"/post/{etag_id}", headers={"If-None-Match": etag})
+
+        if operation == "GET /post/search":
+            # Поиск частого слова ранжирует большую долю таблицы и занимает соединения
+            # на сотни миллисекунд; он измеряется отдельно в benchmarks.repositories
+            return await self.client.get("/post/search", params={"q": fx.dataset.rare_word})
+
+        if operation == "GET /post_tag/suggest":
+            return await self.client.get("/post_tag/suggest", params={"prefix": tag.name[:-2]})
+
+        if operation == "GET /post_tag":
+            return await self.client.get("/post_tag", params={"limit": 100})
+
+        if operation == "POST /post" or not self.created:
+            response = await self.client.post(
+                "/post", json={"title": f"{LOAD_TITLE_PREFIX}{index}", "body": "Body " * 50}
+            )
+            if response.status_code == 200:
+                self.created.append(response.json()["id"])
+            return response
+
+        created_id = self.created[index % len(self.created)]
+        if operation == "PUT /post/{id}/publish":
+            return await self.client.put(f"/post/{created_id}/publish")
+
+        return await self.client.post(f"/post/{created_id}/tags", json={"tag_ids": [str(tag.id_)]})
+
+
+async def drive(
+    scenario: Scenario, warmup: int, requests: int, concurrency: int
+) -> tuple[dict[str, list[float]], float]:
+    """Замеры по операциям и общее время измеряемой части"""
+    plan = list(enumerate(scenario.schedule(warmup + requests)))
+    for index, operation in plan[:warmup]:
+        await scenario.run(operation, index)
+
+    timings: dict[str, list[float]] = {}
+    queue = iter(plan[warmup:])
+
+    async def worker():
+        # Итератор общий: каждый воркер берет следующий запрос расписания
+        for index, operation in queue:
+            start = time.perf_counter()
+            await scenario.run(operation, index)
+            timings.setdefault(operation, []).append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return timings, time.perf_counter() - start
+
+
+def client_for(url: Optional[str]) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=30)
+
+    from app.cmd.public_api import fastapi_app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fastapi_app), base_url="http://bench", timeout=30
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_dataset_arguments(parser)
+    add_baseline_arguments(parser)
+    parser.add_argument("--url", help="адрес запущенного API; по умолчанию API в процессе")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    db_manager = connect()
+    dataset = Dataset(args.posts, args.tags, args.seed)
+    seed(db_manager, dataset)
+    fx = Fixtures(db_manager, dataset)
+
+    async def run():
+        async with client_for(args.url) as client:
+            scenario = Scenario(client, fx, args.seed)
+            timings, elapsed = await drive(scenario, args.warmup, args.requests, args.concurrency)
+            return scenario, timings, elapsed
+
+    try:
+        scenario, timings, elapsed = asyncio.run(run())
+    finally:
+        with db_manager.get_session() as session:
+            session.execute(delete(PostModel).where(PostModel.title.startswith(LOAD_TITLE_PREFIX)))
+
+    results = {name: summarize(timings[name]) for name in OPERATIONS if name in timings}
+    results["total"] = {
+        **summarize([timing for values in timings.values() for timing in values]),
+        "rps": round(args.requests / elapsed, 1),
+    }
+
+    describe = {**dataset.describe(), "requests": args.requests, "concurrency": args.concurrency}
+    code = finish(SUITE, describe, results, args)
+    for operation, count in scenario.errors.items():
+        print(f"ERROR {operation}: {count} responses with status >= 400")
+
+    raise SystemExit(code or (1 if scenario.errors else 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Скорость чтения списка постов: ORM-модели против запросов по колонкам (core_reads)
+
+Использует посты бенчмарка domain_memory (статус `memory_bench`), при необходимости досоздает их.
+Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.read_path --posts 100000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+from app.storage.postgres.post import PostRepository
+from benchmarks.domain_memory import BENCH_STATUS, seed
+
+
+def measure(name: str, repository: PostRepository, limit: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        posts = repository.list_posts_by_filters(status=BENCH_STATUS, limit=limit)
+        timings.append(time.perf_counter() - start)
+
+    rows_per_second = len(posts) / statistics.median(timings)
+    print(f"{name:>12} limit {limit:>6}: {rows_per_second:10.0f} rows/s")
+    return rows_per_second
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "localhost"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    Migrator(db_manager).apply()
+    seed(PostRepository(db_manager), db_manager, args)
+
+    orm = PostRepository(db_manager, core_reads=False)
+    core = PostRepository(db_manager, core_reads=True)
+
+    for limit in (100, 10_000, args.posts):
+        # Страницы по 100 строк повторяются чаще, чтобы медиана была устойчивой
+        repeat = args.repeat * 20 if limit <= 100 else args.repeat
+        orm_rate = measure("ORM", orm, limit, repeat)
+        core_rate = measure("core_reads", core, limit, repeat)
+        print(f"{'speedup':>12} limit {limit:>6}: {core_rate / orm_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Перцентили замеров и сравнение прогона с сохраненной базовой линией
+
+Базовая линия набора лежит в `benchmarks/baselines/<suite>.json`: параметры данных и
+метрики каждой операции. Задержка считается регрессией, если выросла больше чем на
+`--tolerance` (доля) и еще на `--slack-ms`: поправка не дает субмиллисекундным операциям
+падать от шума. Пропускная способность (`rps`) — регрессия, если упала больше чем на допуск.
+По умолчанию проверяются p50, p95 и rps: p99 из сотен замеров определяют один-два вызова,
+совпавшие с checkpoint или autovacuum, он печатается, но прогон не роняет (`--metrics`).
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_SLACK_MS = 0.5
+DEFAULT_CHECKED_METRICS = ("p50", "p95", "rps")
+
+# Метрики, у которых больше — лучше; остальные — задержки в миллисекундах
+HIGHER_IS_BETTER = {"rps"}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings: list[float]) -> dict:
+    """p50/p95/p99 в миллисекундах по замерам в секундах"""
+    values = sorted(timing * 1000 for timing in timings)
+    return {f"p{q}": round(percentile(values, q), 3) for q in (50, 95, 99)}
+
+
+def print_table(results: dict[str, dict]) -> None:
+    columns = sorted({key for metrics in results.values() for key in metrics})
+    width = max(len(name) for name in results)
+    print(f"{'':<{width}}  " + "  ".join(f"{column:>10}" for column in columns))
+    for name, metrics in results.items():
+        values = (
+            f"{metrics[column]:>10.2f}" if column in metrics else f"{'':>10}" for column in columns
+        )
+        print(f"{name:<{width}}  " + "  ".join(values))
+
+
+def baseline_path(suite: str) -> Path:
+    return BASELINES_DIR / f"{suite}.json"
+
+
+def load_baseline(suite: str) -> Optional[dict]:
+    path = baseline_path(suite)
+    if not path.exists():
+        return None
+
+    return json.loads(path.read_text())
+
+
+def save_baseline(suite: str, dataset: dict, results: dict[str, dict]) -> Path:
+    path = baseline_path(suite)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "dataset": dataset,
+                "recorded_at": datetime.now().replace(microsecond=0).isoformat(),
+                "machine": f"{platform.platform()}, Python {platform.python_version()}",
+                "metrics": results,
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+        + "\n"
+    )
+    return path
+
+
+def find_regressions(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    tolerance: float = DEFAULT_TOLERANCE,
+    slack_ms: float = DEFAULT_SLACK_MS,
+    checked: tuple[str, ...] = DEFAULT_CHECKED_METRICS,
+) -> list[str]:
+    """Описания метрик, вышедших за допуск; метрики без базового значения не проверяются"""
+    regressions = []
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            base = baseline.get(name, {}).get(key)
+            if base is None or key not in checked:
+                continue
+
+            if key in HIGHER_IS_BETTER:
+                failed = value < base * (1 - tolerance)
+            else:
+                failed = value > base * (1 + tolerance) + slack_ms
+
+            if failed:
+                regressions.append(f"{name} {key}: {value:.2f} (baseline {base:.2f})")
+
+    return regressions
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="записать результаты как базовую линию"
+    )
+    parser.add_argument(
+        "--no-check", action="store_true", help="не сравнивать результаты с базовой линией"
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS)
+    parser.add_argument(
+        "--metrics",
+        type=lambda value: tuple(item.strip() for item in value.split(",")),
+        default=DEFAULT_CHECKED_METRICS,
+        help="проверяемые метрики через запятую, по умолчанию p50,p95,rps",
+    )
+
+
+def finish(suite: str, dataset: dict, results: dict[str, dict], args) -> int:
+    """Напечатать результаты, сохранить или сверить базовую линию; код выхода процесса"""
+    print_table(results)
+
+    if args.save_baseline:
+        print(f"baseline saved: {save_baseline(suite, dataset, results)}")
+        return 0
+
+    if args.no_check:
+        return 0
+
+    baseline = load_baseline(suite)
+    if baseline is None:
+        print(f"no baseline for {suite}, run with --save-baseline to record one")
+        return 0
+
+    if baseline["dataset"] != dataset:
+        print(f"baseline was recorded on dataset {baseline['dataset']}, this run used {dataset}")
+        return 2
+
+    regressions = find_regressions(
+        results, baseline["metrics"], args.tolerance, args.slack_ms, args.metrics
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+
+    if not regressions:
+        print(f"no regressions against {baseline_path(suite).name}")
+
+    return 1 if regressions else 0
@@ -0,0 +1,252 @@
+"""
+Микробенчмарки методов PostRepository и PostTagRepository на наборе benchmarks.seed
+
+Каждый метод вызывается --repeat раз после --warmup прогревочных вызовов; аргументы
+меняются от вызова к вызову (разные посты, теги, глубина страницы), но одинаковы между
+запусками. Пишущие методы работают с временными постами и тегами, которые удаляются
+в конце. Результат — p50/p95/p99 каждого метода; регрессия против
+`baselines/repositories.json` завершает процесс с кодом 1.
+Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.repositories --posts 100000 --tags 500
+"""
+
+import argparse
+import itertools
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, select
+
+from app.domain.models.cursor import PostCursor
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.models import PostModel, PostTagModel
+from app.storage.postgres.post import PostRepository
+from app.storage.postgres.post_tag import PostTagRepository
+from benchmarks.report import add_baseline_arguments, finish, summarize
+from benchmarks.seed import BASE_TIME, Dataset, add_dataset_arguments, connect, seed
+
+SUITE = "repositories"
+
+# Сколько постов набора участвует в чтениях по ID
+SAMPLE_SIZE = 1000
+PAGE_SIZE = 50
+SCRATCH_STATUS = "bench_scratch"
+SCRATCH_TAG_PREFIX = "bench-scratch-"
+
+
+class Fixtures:
+    """Значения набора и временные объекты, с которыми работают бенчмарки"""
+
+    def __init__(self, db_manager: DatabaseManager, dataset: Dataset):
+        oldest = BASE_TIME - timedelta(minutes=dataset.posts)
+        with db_manager.get_session() as session:
+            rows = session.execute(
+                select(PostModel.id, PostModel.created_at)
+                .where(PostModel.created_at > oldest, PostModel.created_at <= BASE_TIME)
+                .order_by(PostModel.id)
+                .limit(SAMPLE_SIZE)
+            ).all()
+            tag_rows = session.execute(
+                select(PostTagModel.id, PostTagModel.name)
+                .where(PostTagModel.name.in_(dataset.tag_names))
+                .order_by(PostTagModel.name)
+            ).all()
+
+        self.dataset = dataset
+        self.post_ids = [id_ for id_, _ in rows]
+        # Курсоры в разные места ленты: от первых страниц до глубоких
+        self.cursors = [PostCursor(created_at=created_at, id_=id_) for id_, created_at in rows]
+        self.tags = [PostTag(id_=id_, name=name) for id_, name in tag_rows]
+
+        self.scratch_posts: list[Post] = []
+        self.scratch_tags: list[PostTag] = []
+
+    def prepare(
+        self, post_repository: PostRepository, tag_repository: PostTagRepository, count: int
+    ) -> None:
+        """Временные посты и теги для пишущих методов, по одному на вызов; не измеряется"""
+        post_repository.bulk_create_posts([self.scratch_post(index) for index in range(count)])
+        for _ in range(count):
+            tag_repository.create_post_tag(self.scratch_tag())
+
+    def scratch_post(self, index: int) -> Post:
+        now = datetime.now()
+        post = Post(uuid.uuid4(), f"Scratch {index}", "Body " * 50, SCRATCH_STATUS, now, now)
+        self.scratch_posts.append(post)
+        return post
+
+    def scratch_tag(self) -> PostTag:
+        tag = PostTag(uuid.uuid4(), f"{SCRATCH_TAG_PREFIX}{uuid.uuid4().hex}")
+        self.scratch_tags.append(tag)
+        return tag
+
+
+def post_cases(repository: PostRepository, fx: Fixtures) -> dict[str, Callable[[int], object]]:
+    """Вызов метода по номеру повтора; порядок важен: пишущие методы идут после создания"""
+    sample = fx.post_ids
+    cursors = fx.cursors
+    tags = fx.tags
+    status_ids = itertools.count()
+
+    def scratch(index: int) -> Post:
+        return fx.scratch_posts[index % len(fx.scratch_posts)]
+
+    def export_first_batch(_):
+        batches = repository.export_posts(batch_size=1000, status="public")
+        try:
+            return next(batches)
+        finally:
+            batches.close()
+
+    def update_post(index: int):
+        post = scratch(index)
+        post.body = f"Updated {index}"
+        post.tags = []
+        return repository.update_post(post)
+
+    def update_posts_status(index: int):
+        start = next(status_ids) * 10 % len(fx.scratch_posts)
+        ids = [post.id_ for post in fx.scratch_posts[start : start + 10]]
+        return repository.update_posts_status(SCRATCH_STATUS, datetime.now(), ids=ids)
+
+    return {
+        "post.get_post_by_id": lambda i: repository.get_post_by_id(sample[i % len(sample)]),
+        "post.get_post_version": lambda i: repository.get_post_version(sample[i % len(sample)]),
+        "post.list_posts_by_filters": lambda i: repository.list_posts_by_filters(
+            status="public", limit=PAGE_SIZE
+        ),
+        "post.list_posts_page[first]": lambda i: repository.list_posts_page(
+            PAGE_SIZE, status="public"
+        ),
+        "post.list_posts_page[deep]": lambda i: repository.list_posts_page(
+            PAGE_SIZE, cursors[i % len(cursors)], status="public"
+        ),
+        "post.list_post_versions_page": lambda i: repository.list_post_versions_page(
+            PAGE_SIZE, cursors[i % len(cursors)], status="public"
+        ),
+        "post.search_posts[common]": lambda i: repository.search_posts(
+            fx.dataset.common_word, PAGE_SIZE
+        ),
+        "post.search_posts[rare]": lambda i: repository.search_posts(
+            fx.dataset.rare_word, PAGE_SIZE
+        ),
+        "post.export_posts[first batch]": export_first_batch,
+        "post.create_post": lambda i: repository.create_post(fx.scratch_post(i)),
+        "post.bulk_create_posts[100]": lambda i: repository.bulk_create_posts(
+            [fx.scratch_post(i) for _ in range(100)]
+        ),
+        "post.update_post": update_post,
+        "post.update_post_fields": lambda i: repository.update_post_fields(
+            scratch(i).id_, {"title": f"Renamed {i}", "updated_at": datetime.now()}
+        ),
+        "post.update_posts_status[10]": update_posts_status,
+        "post.attach_tags": lambda i: repository.attach_tags(
+            scratch(i).id_, [tag.id_ for tag in tags[i % len(tags) :][:3]], datetime.now()
+        ),
+        "post.detach_tags": lambda i: repository.detach_tags(
+            scratch(i).id_, [tag.id_ for tag in tags[i % len(tags) :][:3]], datetime.now()
+        ),
+        "post.add_tags": lambda i: repository.add_tags(scratch(i).id_, tags[:2]),
+        "post.remove_tags": lambda i: repository.remove_tags(scratch(i).id_, tags[:2]),
+        "post.delete_post_by_id": lambda i: repository.delete_post_by_id(
+            fx.scratch_posts.pop().id_
+        ),
+    }
+
+
+def post_tag_cases(
+    repository: PostTagRepository, fx: Fixtures
+) -> dict[str, Callable[[int], object]]:
+    tags = fx.tags
+
+    def update_post_tag(index: int):
+        tag = fx.scratch_tags[index % len(fx.scratch_tags)]
+        tag.name = f"{SCRATCH_TAG_PREFIX}{uuid.uuid4().hex}"
+        return repository.update_post_tag(tag)
+
+    return {
+        "post_tag.get_post_tag_by_id": lambda i: repository.get_post_tag_by_id(
+            tags[i % len(tags)].id_
+        ),
+        "post_tag.get_post_tag_by_name": lambda i: repository.get_post_tag_by_name(
+            tags[i % len(tags)].name
+        ),
+        "post_tag.list_post_tags_by_filters": lambda i: repository.list_post_tags_by_filters(
+            limit=100
+        ),
+        "post_tag.get_or_create_post_tag": lambda i: repository.get_or_create_post_tag(
+            tags[i % len(tags)].name
+        ),
+        "post_tag.get_or_create_post_tags[10]": lambda i: repository.get_or_create_post_tags(
+            [tag.name for tag in tags[i % len(tags) :][:10]]
+        ),
+        "post_tag.create_post_tag": lambda i: repository.create_post_tag(fx.scratch_tag()),
+        "post_tag.update_post_tag": update_post_tag,
+        "post_tag.delete_post_tag_by_id": lambda i: repository.delete_post_tag_by_id(
+            fx.scratch_tags.pop().id_
+        ),
+    }
+
+
+def measure(case: Callable[[int], object], warmup: int, repeat: int) -> list[float]:
+    for index in range(warmup):
+        case(index)
+
+    timings = []
+    for index in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        case(index)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def cleanup(db_manager: DatabaseManager) -> None:
+    """Удалить временные посты и теги, в том числе оставшиеся от прерванных запусков"""
+    with db_manager.get_session() as session:
+        session.execute(delete(PostModel).where(PostModel.status == SCRATCH_STATUS))
+        session.execute(
+            delete(PostTagModel).where(PostTagModel.name.startswith(SCRATCH_TAG_PREFIX))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_dataset_arguments(parser)
+    add_baseline_arguments(parser)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", help="только методы, в имени которых есть эта подстрока")
+    args = parser.parse_args()
+
+    db_manager = connect()
+    dataset = Dataset(args.posts, args.tags, args.seed)
+    seed(db_manager, dataset)
+
+    post_repository = PostRepository(db_manager)
+    tag_repository = PostTagRepository(db_manager)
+    fx = Fixtures(db_manager, dataset)
+    cleanup(db_manager)
+    fx.prepare(post_repository, tag_repository, args.warmup + args.repeat)
+    cases = {**post_cases(post_repository, fx), **post_tag_cases(tag_repository, fx)}
+
+    results = {}
+    try:
+        for name, case in cases.items():
+            if args.only and args.only not in name:
+                continue
+
+            results[name] = summarize(measure(case, args.warmup, args.repeat))
+            print(f"{name}: p50 {results[name]['p50']:.2f} ms", flush=True)
+    finally:
+        cleanup(db_manager)
+
+    raise SystemExit(finish(SUITE, dataset.describe(), results, args))
+
+
+if __name__ == "__main__":
+    main()
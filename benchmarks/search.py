@@ -0,0 +1,137 @@
+"""
+Сравнение поиска постов: фильтр title_contains (LIKE '%...%') против полнотекстового search_posts
+
+Таблица posts дополняется сгенерированными постами до --posts строк (повторный запуск
+переиспользует их). Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.search --posts 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import or_, text
+
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+from app.storage.postgres.models import PostModel
+from app.storage.postgres.post import PostRepository
+
+# Словарь сгенерированных текстов; редкие слова встречаются только в тексте, примерно в 3% постов
+COMMON_WORDS = [f"word{i}" for i in range(1000)]
+RARE_WORDS = [f"rare{i}" for i in range(20)]
+
+SEED_SQL = """
+INSERT INTO posts (id, title, body, status, created_at, updated_at)
+SELECT
+    gen_random_uuid(),
+    'Benchmark post ' || words[1 + (random() * 999)::int]
+        || ' ' || words[1 + (random() * 999)::int],
+    (
+        SELECT string_agg(
+            CASE WHEN random() < 0.0005 THEN rare[1 + (random() * 19)::int]
+                 ELSE words[1 + (random() * 999)::int] END || repeat('', n),
+            ' '
+        )
+        FROM generate_series(1, 60 + g % 2) AS n
+    ),
+    'public',
+    now() - g * interval '1 second',
+    now()
+FROM generate_series(1, :count) AS g,
+     (SELECT CAST(:words AS text[]) AS words, CAST(:rare AS text[]) AS rare) AS vocabulary
+"""
+
+
+def seed(db_manager: DatabaseManager, posts: int) -> None:
+    with db_manager.transaction() as session:
+        existing = session.execute(text("SELECT count(*) FROM posts")).scalar()
+
+    missing = posts - existing
+    batch = 100_000
+    while missing > 0:
+        count = min(batch, missing)
+        start = time.perf_counter()
+        with db_manager.transaction() as session:
+            session.execute(
+                text(SEED_SQL), {"count": count, "words": COMMON_WORDS, "rare": RARE_WORDS}
+            )
+        missing -= count
+        print(f"seeded {count} posts in {time.perf_counter() - start:.1f} s, {missing} left")
+
+    with db_manager.transaction() as session:
+        session.execute(text("ANALYZE posts"))
+
+
+def like_title_or_body(db_manager: DatabaseManager, word: str, limit: int) -> list:
+    """То, во что обошелся бы LIKE-поиск, если бы он покрывал и текст поста"""
+    with db_manager.get_session() as session:
+        return (
+            session.query(PostModel)
+            .filter(or_(PostModel.title.contains(word), PostModel.body.contains(word)))
+            .order_by(PostModel.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+def measure(name: str, fn, queries: list[str]) -> float:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    print(f"{name:>24}: median {median * 1000:9.1f} ms, max {max(timings) * 1000:9.1f} ms")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "localhost"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    Migrator(db_manager).apply()
+    seed(db_manager, args.posts)
+
+    repository = PostRepository(db_manager)
+    rng = random.Random(args.seed)
+    common = rng.sample(COMMON_WORDS, args.queries)
+    rare = [rng.choice(RARE_WORDS) for _ in range(args.queries)]
+
+    for label, words in (("common word", common), ("rare word", rare)):
+        print(f"{label}:")
+        like_time = measure(
+            "title LIKE '%...%'",
+            lambda word: repository.list_posts_by_filters(title_contains=word, limit=args.limit),
+            words,
+        )
+        measure(
+            "title/body LIKE '%...%'",
+            lambda word: like_title_or_body(db_manager, word, args.limit),
+            words,
+        )
+        search_time = measure(
+            "full-text title + body",
+            lambda word: repository.search_posts(word, args.limit),
+            words,
+        )
+        print(f"{'title LIKE / full-text':>24}: {like_time / search_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Детерминированный набор данных для бенчмарков: N постов, M тегов
+
+Посты, их ID, тексты, статусы и теги выводятся из --seed: одинаковые параметры дают
+одинаковые данные в любой базе. Популярность тегов и слов текста убывает по закону Ципфа —
+несколько тегов стоят у большой доли постов, большинство редкие, как в живом блоге.
+Повторный запуск досоздает только отсутствующие посты.
+Запуск (нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.seed --posts 100000 --tags 500
+"""
+
+import argparse
+import itertools
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.db import DatabaseManager
+from app.storage.postgres.migrator import Migrator
+from app.storage.postgres.models import PostModel
+from app.storage.postgres.post import PostRepository
+
+DEFAULT_POSTS = 100_000
+DEFAULT_TAGS = 500
+DEFAULT_SEED = 42
+
+# Время самого нового поста: в прошлом, чтобы посты тестов и приложения были новее
+BASE_TIME = datetime(2020, 1, 1)
+
+STATUS_WEIGHTS = {"public": 70, "draft": 20, "on_moderation": 5, "archive": 5}
+# Число тегов поста: у большинства 1–3, бывают посты без тегов и с пятью
+TAGS_PER_POST_WEIGHTS = {0: 10, 1: 25, 2: 30, 3: 20, 4: 10, 5: 5}
+ZIPF_EXPONENT = 1.1
+
+VOCABULARY_SIZE = 5000
+SEED_CHUNK_SIZE = 10_000
+
+
+class Dataset:
+    """Параметры набора и значения, по которым бенчмарки строят запросы"""
+
+    def __init__(self, posts: int, tags: int, seed: int):
+        self.posts = posts
+        self.tags = tags
+        self.seed = seed
+
+        rng = random.Random(f"{seed}:vocabulary")
+        self.words = list(
+            dict.fromkeys(
+                "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10)))
+                for _ in range(VOCABULARY_SIZE * 2)
+            )
+        )[:VOCABULARY_SIZE]
+        self.tag_names = [f"bench-tag-{rank:04d}" for rank in range(tags)]
+
+    @property
+    def common_word(self) -> str:
+        return self.words[5]
+
+    @property
+    def rare_word(self) -> str:
+        return self.words[VOCABULARY_SIZE // 2]
+
+    def describe(self) -> dict:
+        return {"posts": self.posts, "tags": self.tags, "seed": self.seed}
+
+    def chunks(self, size: int = SEED_CHUNK_SIZE) -> Iterator[list[Post]]:
+        """Посты набора пачками; каждый вызов выдает те же посты заново"""
+        rng = random.Random(self.seed)
+        tag_weights = list(itertools.accumulate(_zipf_weights(self.tags)))
+        word_weights = list(itertools.accumulate(_zipf_weights(VOCABULARY_SIZE)))
+        statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+        tag_counts, tag_count_weights = zip(*TAGS_PER_POST_WEIGHTS.items())
+
+        for start in range(0, self.posts, size):
+            chunk = []
+            for index in range(start, min(start + size, self.posts)):
+                tag_count = min(rng.choices(tag_counts, tag_count_weights)[0], self.tags)
+                tags = set()
+                while len(tags) < tag_count:
+                    tags.add(rng.choices(self.tag_names, cum_weights=tag_weights)[0])
+
+                words = rng.choices(self.words, cum_weights=word_weights, k=rng.randint(20, 300))
+                created_at = BASE_TIME - timedelta(minutes=index)
+                chunk.append(
+                    Post(
+                        id_=uuid.UUID(int=rng.getrandbits(128), version=4),
+                        title=f"Bench post {index}: {' '.join(words[:5])}",
+                        body=" ".join(words)[:4095],
+                        status=rng.choices(statuses, status_weights)[0],
+                        created_at=created_at,
+                        updated_at=created_at,
+                        tags=[PostTag(id_=uuid.uuid4(), name=name) for name in sorted(tags)],
+                    )
+                )
+            yield chunk
+
+
+def _zipf_weights(count: int) -> Iterator[float]:
+    return (1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(count))
+
+
+def seed(db_manager: DatabaseManager, dataset: Dataset) -> None:
+    """Записать в БД посты набора, которых в ней еще нет"""
+    repository = PostRepository(db_manager)
+    created = 0
+
+    for chunk in dataset.chunks():
+        with db_manager.get_session() as session:
+            existing = set(
+                session.execute(
+                    select(PostModel.id).where(PostModel.id.in_([post.id_ for post in chunk]))
+                ).scalars()
+            )
+
+        missing = [post for post in chunk if post.id_ not in existing]
+        if missing:
+            repository.bulk_create_posts(missing)
+            created += len(missing)
+            print(f"seeded {created} posts")
+
+    print(f"dataset: {dataset.posts} posts, {dataset.tags} tags, seed {dataset.seed}")
+
+
+def connect() -> DatabaseManager:
+    """Менеджер БД по DB_* переменным окружения со схемой, приведенной миграциями"""
+    db_manager = DatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "localhost"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    Migrator(db_manager).apply()
+    return db_manager
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--posts", type=int, default=DEFAULT_POSTS)
+    parser.add_argument("--tags", type=int, default=DEFAULT_TAGS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    seed(connect(), Dataset(args.posts, args.tags, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Время импорта и холодного старта приложения публичного API
+
+Каждый замер — отдельный процесс Python, как новый воркер uvicorn: импорт
+`app.cmd.public_api`, сборка `create_app()`, событие startup и ожидание готовности
+(`/ready`: прогрев пула соединений), а также время процесса целиком вместе с запуском
+интерпретатора. Регрессия против `baselines/startup.json` завершает процесс с кодом 1.
+Запуск (для sync/async нужна доступная PostgreSQL, параметры из DB_* переменных окружения):
+    python -m benchmarks.startup --repeat 20 --backend sync
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.report import add_baseline_arguments, finish, summarize
+
+SUITE = "startup"
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Код замера в новом процессе: печатает длительности этапов в секундах одной строкой JSON
+CHILD = """
+import time
+
+start = time.perf_counter()
+import asyncio
+import json
+
+import app.cmd.public_api as public_api
+
+imported = time.perf_counter()
+fastapi_app = public_api.create_app()
+created = time.perf_counter()
+
+
+async def serve():
+    readiness = fastapi_app.state.application.readiness
+    async with fastapi_app.router.lifespan_context(fastapi_app):
+        started = time.perf_counter()
+        while readiness.status != "ready":
+            await asyncio.sleep(0.001)
+        return started, time.perf_counter()
+
+
+started, ready = asyncio.run(serve())
+print(json.dumps({
+    "import": imported - start,
+    "create_app": created - imported,
+    "startup": started - created,
+    "ready": ready - created,
+}))
+"""
+
+STAGES = ("import", "create_app", "startup", "ready")
+
+
+def measure(backend: str, prewarm: int) -> dict:
+    """Один холодный старт в новом процессе"""
+    env = {**os.environ, "DB_BACKEND": backend, "DB_PREWARM_CONNECTIONS": str(prewarm)}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{result.stderr}")
+
+    return {**json.loads(result.stdout.strip().splitlines()[-1]), "process": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_baseline_arguments(parser)
+    parser.add_argument("--backend", choices=("sync", "async", "memory"), default="sync")
+    parser.add_argument("--prewarm", type=int, default=5, help="DB_PREWARM_CONNECTIONS")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Первые запуски заполняют кэш страниц ОС и __pycache__
+    for _ in range(args.warmup):
+        measure(args.backend, args.prewarm)
+
+    timings = {stage: [] for stage in (*STAGES, "process")}
+    for _ in range(args.repeat):
+        for stage, seconds in measure(args.backend, args.prewarm).items():
+            timings[stage].append(seconds)
+
+    results = {stage: summarize(values) for stage, values in timings.items()}
+    dataset = {"backend": args.backend, "prewarm": args.prewarm, "repeat": args.repeat}
+    raise SystemExit(finish(SUITE, dataset, results, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,17 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]  # корень репозитория
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    """Приложение не создает схему при старте: тестовая БД приводится к ней миграциями"""
+    from app.cmd.public_api import db_manager
+    from app.storage.postgres.migrator import Migrator
+
+    Migrator(db_manager).apply()
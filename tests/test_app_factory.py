@@ -0,0 +1,135 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cmd import public_api
+from app.cmd.public_api import Application, Settings, create_app
+from app.storage.postgres.db import AsyncDatabaseManager
+
+
+def _settings(**overrides) -> Settings:
+    return Settings({**os.environ, **overrides})
+
+
+def _wait_ready(client: TestClient, status: str = "ready", timeout: float = 10) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get("/ready").json()
+        if body["status"] == status or time.monotonic() > deadline:
+            return body
+        time.sleep(0.02)
+
+
+def test_import_does_not_build_application():
+    code = (
+        "import sys; import app.cmd.public_api as api; "
+        "print(api._default_application is None, 'sqlalchemy' in sys.modules, "
+        "'fastapi' in sys.modules)"
+    )
+    # Без переменных БД: импорт не читает и не проверяет окружение
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": os.getcwd()}
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == ["True", "False", "False"]
+
+
+def test_module_attributes_come_from_default_application():
+    from app.cmd.public_api import db_manager, fastapi_app
+
+    application = public_api.default_application()
+    assert fastapi_app is application.fastapi_app
+    assert db_manager is application.db_manager
+    assert fastapi_app.state.application is application
+
+    with pytest.raises(AttributeError):
+        public_api.missing_component
+
+
+def test_settings_validate_backend_and_credentials():
+    with pytest.raises(ValueError):
+        Settings({"DB_BACKEND": "mongo"})
+    with pytest.raises(ValueError):
+        Settings({"DB_BACKEND": "sync"})
+
+    assert Settings({"DB_BACKEND": "memory"}).db_prewarm_connections == 5
+
+
+def test_memory_backend_is_ready_at_startup():
+    with TestClient(create_app(_settings(DB_BACKEND="memory"))) as client:
+        assert client.get("/ready").json() == {"status": "ready"}
+        assert client.get("/internal/stats/readiness").json()["ready"] == 1
+
+
+def test_readiness_waits_for_pool_prewarm():
+    application = Application(_settings(DB_BACKEND="sync", DB_PREWARM_CONNECTIONS="3"))
+    client = TestClient(application.fastapi_app)
+
+    # Без события startup прогрев не запускался
+    r = client.get("/ready")
+    assert r.status_code == 503
+    assert r.json()["status"] == "starting"
+    assert application.db_manager.pool_statistics()["connections_opened_total"] == 0
+
+    try:
+        with client:
+            assert _wait_ready(client) == {"status": "ready"}
+            stats = application.db_manager.pool_statistics()
+            assert stats["connections_opened_total"] == 3
+            assert stats["checked_in"] == 3
+
+            # Прогретые соединения переиспользуются первыми запросами
+            assert client.get("/post", params={"limit": 1}).status_code == 200
+            assert application.db_manager.pool_statistics()["connections_opened_total"] == 3
+    finally:
+        application.db_manager.dispose()
+
+
+def test_unreachable_database_does_not_block_startup():
+    # Порт без PostgreSQL: подключение сразу получает отказ
+    settings = _settings(
+        DB_BACKEND="sync", DB_HOST="127.0.0.1", DB_PORT="9", READINESS_RETRY_SECONDS="0.05"
+    )
+
+    start = time.perf_counter()
+    with TestClient(create_app(settings)) as client:
+        assert time.perf_counter() - start < 5
+        assert client.get("/health").json() == {"status": "ok"}
+
+        body = _wait_ready(client, status="unavailable")
+        assert body == {"status": "unavailable", "error": "OperationalError"}
+        assert client.get("/ready").status_code == 503
+        assert client.get("/internal/stats/readiness").json()["attempts"] >= 1
+
+
+def test_async_pool_prewarm_opens_connections_in_parallel():
+    settings = _settings()
+
+    async def scenario():
+        manager = AsyncDatabaseManager()
+        manager.initialize(
+            settings.db_host,
+            settings.db_port,
+            settings.db_name,
+            settings.db_user,
+            settings.db_password,
+            pool_size=4,
+        )
+        try:
+            opened = await manager.prewarm(10)
+            return opened, manager.pool_statistics()
+        finally:
+            await manager.dispose()
+
+    opened, stats = asyncio.run(scenario())
+
+    # Больше pool_size не открывается: лишние закрылись бы при возврате в пул
+    assert opened == 4
+    assert stats["connections_opened_total"] == 4
+    assert stats["checked_in"] == 4
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+from app.cmd.public_api import post_repository, post_tags_repository
+from app.domain.models.post import Post
+from app.domain.services.post import PostService
+from app.storage.postgres.aio import AsyncPostRepository, AsyncPostTagRepository
+from app.storage.postgres.db import AsyncDatabaseManager
+
+
+def _async_db_manager() -> AsyncDatabaseManager:
+    db_manager = AsyncDatabaseManager()
+    db_manager.initialize(
+        os.getenv("DB_HOST", "postgres"),
+        int(os.getenv("DB_PORT", "5432")),
+        os.getenv("DB_NAME"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+    return db_manager
+
+
+def test_async_repository_roundtrip():
+    async def scenario():
+        db_manager = _async_db_manager()
+        repository = AsyncPostRepository(post_repository, db_manager)
+        now = datetime.now()
+        post = Post(uuid.uuid4(), "Async post", "Body", "draft", now, now)
+
+        try:
+            await repository.create_post(post)
+            return await repository.get_post_by_id(post.id_)
+        finally:
+            await db_manager.dispose()
+
+    loaded = asyncio.run(scenario())
+    assert loaded.title == "Async post"
+
+
+def test_async_service_runs_concurrently():
+    async def scenario():
+        db_manager = _async_db_manager()
+        service = PostService(
+            AsyncPostRepository(post_repository, db_manager),
+            AsyncPostTagRepository(post_tags_repository, db_manager),
+        )
+
+        try:
+            ids = await asyncio.gather(
+                *(service.create_post(f"Concurrent {i}", "Body", "draft") for i in range(5))
+            )
+            return await asyncio.gather(*(service.get_post(id_) for id_ in ids))
+        finally:
+            await db_manager.dispose()
+
+    posts = asyncio.run(scenario())
+    assert sorted(post.title for post in posts) == [f"Concurrent {i}" for i in range(5)]
@@ -0,0 +1,71 @@
+from benchmarks.report import find_regressions, percentile, summarize
+from benchmarks.seed import Dataset
+from benchmarks.startup import measure as measure_startup
+
+
+def test_dataset_is_deterministic():
+    first = [post for chunk in Dataset(300, 20, 7).chunks(size=100) for post in chunk]
+    second = [post for chunk in Dataset(300, 20, 7).chunks(size=100) for post in chunk]
+    other_seed = [post for chunk in Dataset(300, 20, 8).chunks(size=100) for post in chunk]
+
+    assert len(first) == 300
+    assert [(p.id_, p.title, p.body, p.status, p.created_at) for p in first] == [
+        (p.id_, p.title, p.body, p.status, p.created_at) for p in second
+    ]
+    assert [[t.name for t in p.tags] for p in first] == [[t.name for t in p.tags] for p in second]
+    assert first[0].id_ != other_seed[0].id_
+
+
+def test_dataset_tags_follow_popularity():
+    posts = [post for chunk in Dataset(2000, 50, 1).chunks() for post in chunk]
+    counts = {}
+    for post in posts:
+        for tag in post.tags:
+            counts[tag.name] = counts.get(tag.name, 0) + 1
+
+    assert all(len({t.name for t in post.tags}) == len(post.tags) <= 5 for post in posts)
+    # Первый тег по закону Ципфа встречается много чаще последних
+    assert counts["bench-tag-0000"] > 10 * counts.get("bench-tag-0049", 1)
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([5.0], 99) == 5
+    assert summarize([0.001, 0.002, 0.003]) == {"p50": 2.0, "p95": 3.0, "p99": 3.0}
+
+
+def test_find_regressions_respects_tolerance_slack_and_direction():
+    baseline = {
+        "fast": {"p50": 0.2, "p95": 0.3},
+        "slow": {"p50": 10.0, "p95": 20.0, "p99": 30.0},
+        "total": {"rps": 100.0},
+    }
+    results = {
+        # Рост в 3 раза, но в пределах поправки на шум
+        "fast": {"p50": 0.6, "p95": 0.9},
+        "slow": {"p50": 14.0, "p95": 31.0, "p99": 90.0},
+        "total": {"rps": 40.0},
+        "new": {"p50": 1000.0},
+    }
+
+    regressions = find_regressions(results, baseline, tolerance=0.5, slack_ms=0.5)
+
+    assert regressions == [
+        "slow p95: 31.00 (baseline 20.00)",
+        "total rps: 40.00 (baseline 100.00)",
+    ]
+    assert "slow p99: 90.00 (baseline 30.00)" in find_regressions(
+        results, baseline, checked=("p99",)
+    )
+    assert find_regressions({"total": {"rps": 160.0}}, baseline) == []
+
+
+def test_startup_benchmark_measures_cold_start_stages():
+    stages = measure_startup("memory", prewarm=1)
+
+    assert set(stages) == {"import", "create_app", "startup", "ready", "process"}
+    assert all(seconds >= 0 for seconds in stages.values())
+    assert stages["process"] > stages["import"] + stages["create_app"]
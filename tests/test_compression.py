@@ -0,0 +1,101 @@
+import gzip
+import uuid
+from datetime import datetime
+
+import brotli
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app, post_repository
+from app.domain.models.post import Post
+from app.transport.rest.fast_api.common.compression import ResponseCompression, negotiate_encoding
+from app.transport.rest.fast_api.common.responses import (
+    DomainJSONStreamResponse,
+    dumps,
+    iter_json_array,
+)
+
+client = TestClient(fastapi_app)
+
+
+def _create_posts(count: int) -> None:
+    now = datetime.now()
+    post_repository.bulk_create_posts(
+        [
+            Post(uuid.uuid4(), f"Compressed {i}", "Body " * 500, "draft", now, now)
+            for i in range(count)
+        ]
+    )
+
+
+def test_negotiate_encoding_respects_q_values():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_json_array_chunks_join_to_single_encoding():
+    items = [{"n": n} for n in range(45)]
+    chunks = list(iter_json_array(items, chunk_size=20))
+
+    assert len(chunks) == 5
+    assert b"".join(chunks) == dumps(items)
+    assert b"".join(iter_json_array([])) == b"[]"
+
+
+def test_post_page_is_compressed_as_one_body():
+    _create_posts(60)
+
+    for encoding, decompress in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+        # stream=True: httpx не распаковывает тело и отдает его как есть
+        with client.stream("GET", "/post?limit=60", headers={"Accept-Encoding": encoding}) as r:
+            raw = b"".join(r.iter_raw())
+
+        assert r.status_code == 200
+        assert r.headers["Content-Encoding"] == encoding
+        assert r.headers["Vary"] == "Accept-Encoding"
+        # Страница ограничена MAX_PAGE_SIZE и не отдается потоком
+        assert r.headers["Content-Length"] == str(len(raw))
+        assert len(orjson.loads(decompress(raw))) == 60
+        assert len(raw) * 10 < len(decompress(raw))
+
+
+def test_small_and_uncompressible_responses_are_sent_as_is():
+    r = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+
+    r = client.get("/post?limit=1", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in r.headers
+
+    etag = client.get("/post?limit=1").headers["ETag"]
+    r = client.get("/post?limit=1", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r.status_code == 304
+    assert "Content-Encoding" not in r.headers
+
+
+def test_minimum_size_and_level_are_configurable():
+    app = FastAPI()
+    body = [{"text": "x" * 100}] * 10
+
+    @app.get("/items")
+    def items():
+        return DomainJSONStreamResponse(body, chunk_size=3)
+
+    @app.get("/small")
+    def small():
+        return {"text": "x" * 200}
+
+    ResponseCompression(app, minimum_size=100, gzip_level=1).register()
+    test_client = TestClient(app)
+
+    r = test_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.json() == {"text": "x" * 200}
+
+    r = test_client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.json() == body
@@ -0,0 +1,155 @@
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, fastapi_app, post_repository, post_tags_repository
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.transport.rest.fast_api.public.post import PRIVATE_CACHE_CONTROL
+
+client = TestClient(fastapi_app)
+
+
+def _create_post(status: str = "public") -> Post:
+    now = datetime.now()
+    post = Post(uuid.uuid4(), "Conditional", "Body", status, now, now)
+    post_repository.create_post(post)
+    return post
+
+
+def _statements(request) -> tuple:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        return request(), statements
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_post_is_revalidated_by_etag_with_version_lookup_only():
+    post = _create_post()
+    r = client.get(f"/post/{post.id_}")
+    assert r.headers["ETag"].startswith('W/"')
+    assert r.headers["Cache-Control"] == "public, max-age=60"
+    assert r.headers["Last-Modified"].endswith("GMT")
+
+    # Версия читается мимо кэша постов, чтобы проверить запрос к БД
+    post_repository._evict(post.id_)
+    r304, statements = _statements(
+        lambda: client.get(f"/post/{post.id_}", headers={"If-None-Match": r.headers["ETag"]})
+    )
+    assert r304.status_code == 304
+    assert r304.content == b""
+    assert r304.headers["ETag"] == r.headers["ETag"]
+    assert len(statements) == 1
+    assert "posts.body" not in statements[0] and "posts_tags" not in statements[0]
+
+    r = client.get(
+        f"/post/{post.id_}", headers={"If-None-Match": 'W/"other", ' + r.headers["ETag"]}
+    )
+    assert r.status_code == 304
+
+
+def test_post_etag_changes_when_post_or_its_tags_change():
+    post = _create_post()
+    etag = client.get(f"/post/{post.id_}").headers["ETag"]
+
+    tag = PostTag(uuid.uuid4(), f"etag-{uuid.uuid4().hex}")
+    post_tags_repository.create_post_tag(tag)
+    client.post(f"/post/{post.id_}/tags", json={"tag_ids": [str(tag.id_)]})
+
+    r = client.get(f"/post/{post.id_}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["tags"] == [{"id_": str(tag.id_), "name": tag.name}]
+
+    etag = r.headers["ETag"]
+    client.put(f"/post/{post.id_}/archive")
+    r = client.get(f"/post/{post.id_}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"] == PRIVATE_CACHE_CONTROL
+
+
+def test_post_is_revalidated_by_if_modified_since():
+    post = _create_post()
+    last_modified = client.get(f"/post/{post.id_}").headers["Last-Modified"]
+
+    r = client.get(f"/post/{post.id_}", headers={"If-Modified-Since": last_modified})
+    assert r.status_code == 304
+
+    r = client.get(
+        f"/post/{post.id_}", headers={"If-Modified-Since": "Sat, 01 Jan 2000 00:00:00 GMT"}
+    )
+    assert r.status_code == 200
+
+    r = client.get(
+        f"/post/{post.id_}",
+        headers={"If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified},
+    )
+    assert r.status_code == 200
+
+
+def test_missing_post_is_not_found_for_conditional_request():
+    r = client.get(f"/post/{uuid.uuid4()}", headers={"If-None-Match": "*"})
+    assert r.status_code == 404
+
+
+def test_post_list_is_revalidated_by_etag():
+    _create_post()
+    params = {"limit": 3, "status": "public"}
+    r = client.get("/post", params=params)
+    etag = r.headers["ETag"]
+    assert r.headers["Cache-Control"] == "public, max-age=60"
+
+    r304, statements = _statements(
+        lambda: client.get("/post", params=params, headers={"If-None-Match": etag})
+    )
+    assert r304.status_code == 304
+    assert len(statements) == 1 and "posts_tags" not in statements[0]
+
+    # Другие параметры — другая страница
+    r = client.get(
+        "/post", params={"limit": 2, "status": "public"}, headers={"If-None-Match": etag}
+    )
+    assert r.status_code == 200
+    assert (
+        client.get("/post", params={"limit": 3}).headers["Cache-Control"] == PRIVATE_CACHE_CONTROL
+    )
+
+    # Новый пост меняет первую страницу
+    _create_post()
+    r = client.get("/post", params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+def test_tag_rename_and_delete_change_etag_of_its_posts():
+    post = _create_post()
+    tag = PostTag(uuid.uuid4(), f"etag-{uuid.uuid4().hex}")
+    post_tags_repository.create_post_tag(tag)
+    client.post(f"/post/{post.id_}/tags", json={"tag_ids": [str(tag.id_)]})
+    params = {"limit": 1, "status": "public"}
+    r = client.get(f"/post/{post.id_}")
+    etag, page_etag = r.headers["ETag"], client.get("/post", params=params).headers["ETag"]
+
+    renamed = f"renamed-{uuid.uuid4().hex}"
+    assert client.put(f"/post_tag/{tag.id_}", json={"name": renamed}).status_code == 200
+
+    # Запись кэша постов сброшена: новое имя видно сразу
+    r = client.get(f"/post/{post.id_}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["tags"] == [{"id_": str(tag.id_), "name": renamed}]
+    assert (
+        client.get("/post", params=params, headers={"If-None-Match": page_etag}).status_code == 200
+    )
+
+    etag = r.headers["ETag"]
+    assert client.delete(f"/post_tag/{tag.id_}").status_code in (200, 204)
+    r = client.get(f"/post/{post.id_}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["tags"] == []
@@ -0,0 +1,95 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cmd.public_api import db_manager
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.post import PostRepository
+from app.storage.postgres.post_tag import PostTagRepository
+
+core = PostRepository(db_manager, core_reads=True)
+orm = PostRepository(db_manager, core_reads=False)
+
+
+def _snapshot(post: Post) -> tuple:
+    tags = sorted((tag.id_, tag.name) for tag in post.tags)
+    return (post.id_, post.title, post.body, post.status, post.created_at, post.updated_at, tags)
+
+
+@pytest.fixture(scope="module")
+def status():
+    """Посты с тегами под отдельным статусом, чтобы выборки не зависели от других тестов"""
+    status = f"core-{uuid.uuid4().hex[:8]}"
+    now = datetime.now()
+    tags = [PostTag(uuid.uuid4(), f"core-{uuid.uuid4().hex}") for _ in range(3)]
+    posts = [
+        Post(
+            uuid.uuid4(),
+            f"Core read {i} needle",
+            "Body",
+            status,
+            now - timedelta(seconds=i),
+            now,
+            tags[: i % 4],
+        )
+        for i in range(7)
+    ]
+    core.bulk_create_posts(posts)
+    return status
+
+
+def test_list_and_get_match_orm(status):
+    core_posts = core.list_posts_by_filters(status=status)
+    orm_posts = orm.list_posts_by_filters(status=status)
+
+    assert len(core_posts) == 7
+    assert [_snapshot(post) for post in core_posts] == [_snapshot(post) for post in orm_posts]
+
+    for post in core_posts:
+        assert _snapshot(core.get_post_by_id(post.id_)) == _snapshot(orm.get_post_by_id(post.id_))
+
+
+def test_pages_and_search_match_orm(status):
+    for method, args in (("list_posts_page", (3,)), ("search_posts", ("needle", 3))):
+        core_page = getattr(core, method)(*args, status=status)
+        orm_page = getattr(orm, method)(*args, status=status)
+
+        assert [_snapshot(post) for post in core_page.items] == [
+            _snapshot(post) for post in orm_page.items
+        ]
+        assert core_page.next_cursor.encode() == orm_page.next_cursor.encode()
+
+
+def test_core_reads_share_tags_and_skip_identity_map(status):
+    with db_manager.get_session() as session:
+        posts = core.list_posts_by_filters(status=status, session=session)
+        assert len(session.identity_map) == 0
+
+    tags = {}
+    for post in posts:
+        for tag in post.tags:
+            assert tags.setdefault(tag.id_, tag) is tag
+
+
+def test_core_reads_see_unflushed_changes():
+    post = Post(uuid.uuid4(), "Before", "Body", "draft", datetime.now(), datetime.now())
+    core.create_post(post)
+
+    with db_manager.transaction() as session:
+        post.title = "After"
+        orm.update_post(post, session=session)
+        assert core.get_post_by_id(post.id_, session=session).title == "After"
+
+
+def test_post_tag_reads_match_orm():
+    core_tags = PostTagRepository(db_manager, core_reads=True)
+    orm_tags = PostTagRepository(db_manager, core_reads=False)
+    tag = PostTag(uuid.uuid4(), f"core-tag-{uuid.uuid4().hex}")
+    core_tags.create_post_tag(tag)
+
+    for repository in (core_tags, orm_tags):
+        assert repository.get_post_tag_by_id(tag.id_).name == tag.name
+        assert repository.get_post_tag_by_name(tag.name).id_ == tag.id_
+        assert [t.id_ for t in repository.list_post_tags_by_filters(name=tag.name)] == [tag.id_]
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.cmd.public_api import db_manager, fastapi_app
+
+
+def test_pool_statistics_count_checkouts_and_waits():
+    before = db_manager.pool_statistics()
+
+    with db_manager.get_session() as session:
+        session.execute(text("SELECT 1"))
+        during = db_manager.pool_statistics()
+
+    after = db_manager.pool_statistics()
+    assert during["checked_out"] >= 1
+    assert after["checkouts_total"] > before["checkouts_total"]
+    assert after["wait_seconds"]["count"] > before["wait_seconds"]["count"]
+    assert after["wait_seconds"]["buckets"]["+Inf"] == after["wait_seconds"]["count"]
+    assert after["connection_age_seconds"]["count"] >= 1
+
+
+def test_pool_statistics_are_exposed_on_internal_api():
+    r = TestClient(fastapi_app).get("/internal/stats/db_pool")
+    assert r.status_code == 200
+    assert {
+        "pool_size",
+        "checked_out",
+        "overflow",
+        "timeouts_total",
+        "wait_seconds",
+    } <= r.json().keys()
@@ -0,0 +1,282 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cmd.public_api import db_manager
+from app.domain.models.cursor import PostCursor
+from app.domain.models.errors.domain import AlreadyExistsError, ConflictError, NotFoundError
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.domain.models.user import User
+from app.domain.services.post import PostService
+from app.storage.memory.post import PostRepository as MemoryPostRepository
+from app.storage.memory.post_tag import PostTagRepository as MemoryPostTagRepository
+from app.storage.memory.store import MemoryStore
+from app.storage.memory.user import UserRepository as MemoryUserRepository
+from app.storage.postgres.aio import AsyncPostRepository, AsyncPostTagRepository
+from app.storage.postgres.post import PostRepository
+from app.storage.postgres.post_tag import PostTagRepository
+
+postgres = PostRepository(db_manager)
+
+
+def _snapshot(post: Post) -> tuple:
+    # ID новых тегов у хранилищ разные, сравниваются имена
+    tags = sorted(tag.name for tag in post.tags or [])
+    return (post.id_, post.title, post.body, post.status, post.created_at, post.updated_at, tags)
+
+
+def _posts(status: str, now: datetime) -> list[Post]:
+    # У постов второго статуса время совпадает попарно: страницы по курсору упорядочены
+    # по (created_at, id), а у list_posts_by_filters порядок при равном created_at не задан
+    return [
+        Post(
+            uuid.uuid4(),
+            f"Memory {i} {'needle' if i % 3 == 0 else 'hay'}",
+            f"Body {i} " + ("needle needle" if i % 2 else "plain"),
+            status if i % 4 else f"{status}-other",
+            now - timedelta(minutes=i if i % 4 else 100 + i // 8),
+            now,
+            [PostTag(uuid.uuid4(), f"{status}-tag-{j}") for j in range(i % 3)],
+        )
+        for i in range(23)
+    ]
+
+
+@pytest.fixture(scope="module")
+def stores():
+    """Один и тот же набор постов в PostgreSQL и в памяти под отдельным статусом"""
+    status = f"mem-{uuid.uuid4().hex[:8]}"
+    now = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    memory = MemoryPostRepository(MemoryStore())
+
+    posts = _posts(status, now)
+    postgres.bulk_create_posts(posts)
+    memory.bulk_create_posts(
+        [Post(p.id_, p.title, p.body, p.status, p.created_at, p.updated_at, p.tags) for p in posts]
+    )
+    return status, now, memory
+
+
+def _walk(repository, limit: int, **filters) -> list[tuple]:
+    pages, cursor = [], None
+    while True:
+        page = repository.list_posts_page(limit, cursor, **filters)
+        pages.append([_snapshot(post) for post in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_lists_match_postgres(stores):
+    status, now, memory = stores
+    filter_sets = [
+        {"status": status},
+        {"status": status, "limit": 4, "offset": 3},
+        {"status": status, "order_direction": "asc"},
+        {"status": status, "title_contains": "needle"},
+        {"status": status, "created_after": now - timedelta(minutes=5), "created_before": now},
+        {"status": status, "order_by": "title", "limit": 5},
+    ]
+
+    for filters in filter_sets:
+        expected = [_snapshot(post) for post in postgres.list_posts_by_filters(**filters)]
+        actual = [_snapshot(post) for post in memory.list_posts_by_filters(**filters)]
+        assert actual == expected, filters
+
+    for filters in ({"status": status}, {"status": f"{status}-other"}):
+        assert _walk(memory, 4, **filters) == _walk(postgres, 4, **filters)
+
+    cursor = PostCursor(created_at=now - timedelta(minutes=3), id_=uuid.UUID(int=0))
+    versions = memory.list_post_versions_page(3, cursor, status=status)
+    assert [(v.id_, v.status, v.updated_at) for v in versions] == [
+        (v.id_, v.status, v.updated_at)
+        for v in postgres.list_post_versions_page(3, cursor, status=status)
+    ]
+
+    exported = [
+        [_snapshot(p) for p in batch] for batch in memory.export_posts(batch_size=5, status=status)
+    ]
+    assert exported == [
+        [_snapshot(p) for p in batch]
+        for batch in postgres.export_posts(batch_size=5, status=status)
+    ]
+
+
+def test_status_update_by_filters_matches_postgres(stores):
+    status, now, memory = stores
+    filters = {"status": f"{status}-other"}
+
+    expected = postgres.update_posts_status(f"{status}-moved", now, filters=filters, limit=3)
+    actual = memory.update_posts_status(f"{status}-moved", now, filters=filters, limit=3)
+
+    # Порядок RETURNING в PostgreSQL не задан
+    assert sorted(actual) == sorted(expected)
+    assert {post.id_ for post in memory.list_posts_by_filters(status=f"{status}-moved")} == set(
+        expected
+    )
+
+
+def test_search_parses_websearch_queries():
+    now = datetime.now()
+    repository = MemoryPostRepository(MemoryStore())
+    titled = Post(uuid.uuid4(), "Red fox", "Quick animal", "public", now, now)
+    bodied = Post(uuid.uuid4(), "Animals", "A red fox jumps over a dog", "public", now, now)
+    other = Post(uuid.uuid4(), "Dogs", "Only a lazy dog", "draft", now, now)
+    repository.bulk_create_posts([titled, bodied, other])
+
+    def titles(query, **filters):
+        return [post.title for post in repository.search_posts(query, 10, **filters).items]
+
+    # Вхождение в заголовке весит больше, чем в тексте
+    assert titles("fox") == ["Red fox", "Animals"]
+    assert titles('"fox jumps"') == ["Animals"]
+    assert titles("fox -dog") == ["Red fox"]
+    assert set(titles("lazy or quick")) == {"Red fox", "Dogs"}
+    assert titles("dog", status="public") == ["Animals"]
+    assert titles("!!!") == []
+
+    first = repository.search_posts("fox", 1)
+    rest = repository.search_posts("fox", 1, first.next_cursor)
+    assert [post.title for post in first.items + rest.items] == ["Red fox", "Animals"]
+    assert rest.next_cursor is None
+
+
+def test_transaction_rollback_restores_snapshot():
+    store = MemoryStore()
+    posts = MemoryPostRepository(store)
+    tags = MemoryPostTagRepository(store)
+    now = datetime.now()
+
+    kept = Post(uuid.uuid4(), "Kept", "Body", "public", now, now, [PostTag(uuid.uuid4(), "kept")])
+    posts.bulk_create_posts([kept])
+    before = (store.stats(), [_snapshot(p) for p in posts.list_posts_by_filters()])
+
+    with pytest.raises(RuntimeError):
+        with store.transaction() as session:
+            extra = [Post(uuid.uuid4(), f"Extra {i}", "Body", "draft", now, now) for i in range(20)]
+            posts.bulk_create_posts(extra, session=session)
+            new_tag = tags.get_or_create_post_tag("new", session=session)
+            posts.attach_tags(kept.id_, [new_tag.id_], now + timedelta(seconds=1), session=session)
+            posts.update_post_fields(kept.id_, {"status": "archive"}, session=session)
+            tags.delete_post_tag_by_id(kept.tags[0].id_, session=session)
+            posts.delete_post_by_id(extra[0].id_, session=session)
+
+            assert len(posts.list_posts_by_filters(status="draft", session=session)) == 19
+            raise RuntimeError("rollback")
+
+    assert (store.stats(), [_snapshot(p) for p in posts.list_posts_by_filters()]) == before
+    assert posts.list_posts_by_filters(status="archive") == []
+    assert [p.id_ for p in posts.list_posts_by_filters(status="public")] == [kept.id_]
+    assert tags.get_post_tag_by_name("new") is None
+
+
+def test_failed_bulk_create_is_atomic():
+    store = MemoryStore()
+    posts = MemoryPostRepository(store)
+    now = datetime.now()
+    existing = Post(uuid.uuid4(), "Existing", "Body", "public", now, now)
+    posts.create_post(existing)
+
+    batch = [
+        Post(uuid.uuid4(), "New", "Body", "public", now, now, [PostTag(uuid.uuid4(), "t")]),
+        Post(existing.id_, "Duplicate", "Body", "public", now, now),
+    ]
+    with pytest.raises(AlreadyExistsError):
+        posts.bulk_create_posts(batch)
+
+    assert store.stats() == {"posts": 1, "post_tags": 0, "posts_tags": 0, "users": 0}
+
+
+def test_constraints_and_errors_match_postgres_repositories():
+    store = MemoryStore()
+    posts = MemoryPostRepository(store)
+    tags = MemoryPostTagRepository(store)
+    users = MemoryUserRepository(store)
+    now = datetime.now()
+
+    tags.create_post_tag(PostTag(uuid.uuid4(), "unique"))
+    with pytest.raises(AlreadyExistsError):
+        tags.create_post_tag(PostTag(uuid.uuid4(), "unique"))
+
+    post = Post(uuid.uuid4(), "Post", "Body", "draft", now, now)
+    posts.create_post(post)
+    with pytest.raises(ConflictError):
+        posts.update_post_fields(
+            post.id_, {"status": "public"}, expected_updated_at=now - timedelta(1)
+        )
+    with pytest.raises(NotFoundError):
+        posts.attach_tags(post.id_, [uuid.uuid4()])
+    with pytest.raises(NotFoundError):
+        posts.get_post_by_id(uuid.uuid4())
+
+    # Удаление тега удаляет его связи, как ON DELETE CASCADE
+    tag = tags.get_or_create_post_tag("cascade")
+    posts.add_tags(post.id_, [tag])
+    assert posts.update_post_fields(post.id_, {"status": "public"}).tags == [tag]
+    tags.delete_post_tag_by_id(tag.id_)
+    assert posts.get_post_by_id(post.id_).tags == []
+
+    user = User(uuid.uuid4(), "alice")
+    users.create_user(user)
+    with pytest.raises(AlreadyExistsError):
+        users.create_user(User(uuid.uuid4(), "alice"))
+    assert users.get_user_by_username("alice").id_ == user.id_
+
+
+def test_post_service_runs_on_memory_backend():
+    store = MemoryStore()
+    service = PostService(
+        AsyncPostRepository(MemoryPostRepository(store)),
+        AsyncPostTagRepository(MemoryPostTagRepository(store)),
+    )
+
+    async def scenario():
+        results = await service.bulk_create_posts(
+            [
+                {"title": f"Post {i}", "body": "Body", "status": "public", "tags": ["x"]}
+                for i in range(5)
+            ]
+        )
+        page = await service.list_posts(limit=2, status="public")
+        tag_id = page.items[0].tags[0].id_
+        await service.remove_tags(page.items[0].id_, [tag_id])
+        return results, page, await service.get_post(page.items[0].id_)
+
+    results, page, post = asyncio.run(scenario())
+
+    assert all(result.error is None for result in results)
+    assert len(page.items) == 2 and page.next_cursor is not None
+    assert post.tags == [] and post.updated_at > post.created_at
+
+
+def test_tag_rename_and_delete_touch_linked_posts_like_postgres():
+    now = datetime.now().replace(microsecond=0)
+    later = now + timedelta(minutes=1)
+    store = MemoryStore()
+    repositories = [
+        (postgres, PostTagRepository(db_manager)),
+        (MemoryPostRepository(store), MemoryPostTagRepository(store)),
+    ]
+
+    for posts, tags in repositories:
+        tag = tags.get_or_create_post_tag(f"touch-{uuid.uuid4().hex}")
+        tagged = Post(uuid.uuid4(), "Tagged", "Body", "public", now, now, [tag])
+        other = Post(uuid.uuid4(), "Other", "Body", "public", now, now)
+        posts.bulk_create_posts([tagged, other])
+
+        moved = f"moved-{uuid.uuid4().hex}"
+        change = tags.update_post_tag(PostTag(tag.id_, f"renamed-{uuid.uuid4().hex}"))
+        assert (change.old_name, change.post_ids) == (tag.name, [tagged.id_])
+        assert posts.get_post_by_id(tagged.id_).updated_at == now
+
+        assert tags.update_post_tag(PostTag(tag.id_, moved), later).post_ids == [tagged.id_]
+        assert posts.get_post_by_id(tagged.id_).updated_at == later
+        assert posts.get_post_by_id(other.id_).updated_at == now
+
+        change = tags.delete_post_tag_by_id(tag.id_, later + timedelta(minutes=1))
+        assert (change.old_name, change.post_ids) == (moved, [tagged.id_])
+        post = posts.get_post_by_id(tagged.id_)
+        assert post.tags == [] and post.updated_at == later + timedelta(minutes=1)
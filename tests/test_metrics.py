@@ -0,0 +1,98 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.cmd.public_api import fastapi_app
+from app.transport.rest.fast_api.common.metrics import MetricsAPI
+
+
+def _metrics(client: TestClient) -> str:
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    return r.text
+
+
+def test_requests_are_counted_by_route_template():
+    client = TestClient(fastapi_app)
+    client.get("/post/00000000-0000-0000-0000-000000000000")
+
+    text = _metrics(client)
+    assert 'http_requests_total{method="GET",route="/post/{id_}",status="404"}' in text
+    assert (
+        'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/post/{id_}"}' in text
+    )
+    assert "http_requests_in_flight" in text
+
+
+def test_unknown_paths_share_one_route_label():
+    client = TestClient(fastapi_app)
+    client.get("/no/such/path")
+
+    assert 'route="unmatched",status="404"' in _metrics(client)
+
+
+def test_domain_and_cache_counters_are_exported():
+    client = TestClient(fastapi_app)
+    r = client.post("/post", json={"title": "Metrics", "body": "Body", "status": "draft"})
+    assert r.status_code == 200
+
+    text = _metrics(client)
+    assert 'app_counters_total{name="posts_created",provider="post_service"}' in text
+    assert 'app_counters_total{name="hits",provider="post_cache"}' in text
+    assert 'app_counters_total{name="checkouts_total",provider="db_pool"}' in text
+    assert 'app_stats{name="size",provider="post_cache"}' in text
+    assert 'app_stats{name="checked_out",provider="db_pool"}' in text
+
+
+def test_counters_export_increments_and_gauges_current_values():
+    stats = {"hits": 5, "size": 3, "wait_seconds": {"buckets": {"0.01": 2}}}
+    metrics_api = MetricsAPI(FastAPI(), {"test_counters": lambda: stats})
+
+    def value(metric: str, name: str) -> float:
+        return REGISTRY.get_sample_value(metric, {"provider": "test_counters", "name": name})
+
+    metrics_api.refresh_stats()
+    stats.update(hits=7, size=1)
+    metrics_api.refresh_stats()
+    assert value("app_counters_total", "hits") == 7
+    assert value("app_counters_total", "wait_seconds.buckets.0.01") == 2
+    assert value("app_stats", "size") == 1
+
+    # Сброс счетчика у провайдера: прирост считается с нуля, сумма не уменьшается
+    stats["hits"] = 2
+    metrics_api.refresh_stats()
+    assert value("app_counters_total", "hits") == 9
+
+
+def test_failing_stats_provider_does_not_break_responses(caplog):
+    def broken():
+        raise RuntimeError("provider is down")
+
+    app = FastAPI()
+    metrics_api = MetricsAPI(app, {"broken": broken, "working": lambda: {"size": 1}})
+    metrics_api.register()
+    app.get("/ping")(lambda: {"ok": True})
+    client = TestClient(app)
+
+    assert client.get("/ping").json() == {"ok": True}
+    assert "Stats provider broken failed" in caplog.text
+    assert 'app_stats{name="size",provider="working"} 1.0' in _metrics(client)
+
+
+def test_summary_count_is_exported_as_gauge():
+    ages = {"count": 5}
+    stats = {"connection_age_seconds": ages, "wait_seconds": {"count": 5}}
+    metrics_api = MetricsAPI(FastAPI(), {"test_summary": lambda: stats})
+
+    def value(metric: str, name: str) -> float:
+        return REGISTRY.get_sample_value(metric, {"provider": "test_summary", "name": name})
+
+    for count in (5, 3, 4, 2):
+        ages["count"] = count
+        metrics_api.refresh_stats()
+        # Число открытых соединений может уменьшаться: это значение, а не счетчик
+        assert value("app_stats", "connection_age_seconds.count") == count
+
+    assert value("app_counters_total", "connection_age_seconds.count") is None
+    assert value("app_counters_total", "wait_seconds.count") == 5
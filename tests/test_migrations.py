@@ -0,0 +1,41 @@
+from sqlalchemy import text
+
+from app.cmd.public_api import db_manager
+from app.storage.postgres.migrator import Migrator, load_migrations
+
+
+def _index_names(table: str) -> set:
+    with db_manager.engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": table}
+        )
+        return set(rows.scalars())
+
+
+def test_migrations_are_applied_once():
+    migrator = Migrator(db_manager)
+
+    assert migrator.pending() == []
+    assert migrator.apply() == []
+
+
+def test_list_indexes_exist():
+    assert {
+        "ix_posts_created_at_id",
+        "ix_posts_status_created_at_id",
+        "ix_posts_search_vector",
+    } <= _index_names("posts")
+    assert "ix_posts_tags_tag_id_post_id" in _index_names("posts_tags")
+
+
+def test_migration_files_are_ordered_and_split_into_statements(tmp_path):
+    (tmp_path / "0002_second.sql").write_text(
+        "-- no-transaction\nCREATE INDEX CONCURRENTLY a ON t (x);\n-- comment\nSELECT 1;\n"
+    )
+    (tmp_path / "0001_first.sql").write_text("CREATE TABLE t (x int);\n")
+
+    first, second = load_migrations(tmp_path)
+
+    assert (first.version, first.name, first.transactional) == ("0001", "first", True)
+    assert (second.version, second.name, second.transactional) == ("0002", "second", False)
+    assert second.statements() == ["CREATE INDEX CONCURRENTLY a ON t (x)", "SELECT 1"]
@@ -0,0 +1,68 @@
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app
+
+client = TestClient(fastapi_app)
+
+
+def test_bulk_create_json_array_reports_per_item_results():
+    tag = f"bulk-{uuid.uuid4().hex}"
+    response = client.post(
+        "/post/bulk",
+        json=[
+            {"title": "Bulk 1", "body": "Body", "tags": [tag]},
+            {"title": "a" * 256, "body": "Body"},
+            {"title": "Bulk 3", "body": "Body", "tags": [tag, tag]},
+        ],
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert result["items"][1]["error"] == "Title is too long"
+
+    post = client.get(f"/post/{result['items'][2]['id']}").json()
+    assert [t["name"] for t in post["tags"]] == [tag]
+
+
+def test_bulk_create_ndjson_skips_broken_lines():
+    lines = [json.dumps({"title": "NDJSON post", "body": "Body"}), "{not json"]
+    response = client.post(
+        "/post/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert [item["error"] is None for item in response.json()["items"]] == [True, False]
+
+
+def test_bulk_create_rejects_non_array_body():
+    response = client.post("/post/bulk", json={"title": "Not a list"})
+    assert response.status_code == 400
+
+
+def test_bulk_create_validates_tag_names_per_item():
+    tag = f"bulk-{uuid.uuid4().hex}"
+    response = client.post(
+        "/post/bulk",
+        json=[
+            {"title": "Empty tag", "body": "Body", "tags": ["  "]},
+            {"title": "Long tag", "body": "Body", "tags": ["t" * 101]},
+            {"title": "Padded tag", "body": "Body", "tags": [f" {tag} "]},
+        ],
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert [item["error"] for item in result["items"][:2]] == [
+        "Tag name is required",
+        "Tag name is too long",
+    ]
+
+    post = client.get(f"/post/{result['items'][2]['id']}").json()
+    assert [t["name"] for t in post["tags"]] == [tag]
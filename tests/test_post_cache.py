@@ -0,0 +1,115 @@
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import db_manager, fastapi_app
+from app.domain.models.post import Post
+from app.storage.cache.lru import LRUCache
+from app.storage.cache.post import CachedPostRepository
+from app.storage.cache.tiers import LocalCacheTier
+from app.storage.postgres.post import PostRepository
+
+
+def _create_post(repository) -> Post:
+    now = datetime.now()
+    post = Post(uuid.uuid4(), "Cached post", "Body", "draft", now, now)
+    repository.create_post(post)
+    return post
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires():
+    now = [0.0]
+    cache = LRUCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_get_post_by_id_is_served_from_cache():
+    repository = CachedPostRepository(PostRepository(db_manager), LRUCache(100, 60))
+    post = _create_post(repository)
+
+    repository.get_post_by_id(post.id_)
+    loaded = repository.get_post_by_id(post.id_)
+    loaded.title = "Changed by caller"
+
+    assert repository.get_post_by_id(post.id_).title == "Cached post"
+    assert repository.stats()["hits"] == 2
+    assert repository.stats()["misses"] == 1
+
+
+def test_update_inside_transaction_invalidates_after_commit():
+    repository = CachedPostRepository(PostRepository(db_manager), LRUCache(100, 60))
+    post = _create_post(repository)
+    repository.get_post_by_id(post.id_)
+
+    with db_manager.transaction() as session:
+        post.title = "Updated in transaction"
+        repository.update_post(post, session=session)
+
+        assert repository.get_post_by_id(post.id_, session=session).title == post.title
+        assert repository.get_post_by_id(post.id_).title == "Cached post"
+
+    assert repository.get_post_by_id(post.id_).title == "Updated in transaction"
+
+
+def test_second_tier_is_used_on_first_tier_miss():
+    second_tier = LocalCacheTier()
+    warm = CachedPostRepository(PostRepository(db_manager), LRUCache(100, 60), second_tier)
+    post = _create_post(warm)
+    warm.get_post_by_id(post.id_)
+
+    cold = CachedPostRepository(PostRepository(db_manager), LRUCache(100, 60), second_tier)
+    cold.get_post_by_id(post.id_)
+
+    assert cold.stats()["second_tier_hits"] == 1
+
+
+def test_cache_counters_are_exposed_on_internal_api():
+    r = TestClient(fastapi_app).get("/internal/stats/post_cache")
+    assert r.status_code == 200
+    assert {"hits", "misses", "evictions"} <= r.json().keys()
+
+
+class _InterleavedReadRepository(PostRepository):
+    """Выполняет `on_read` после чтения поста, до возврата в кэш: запись между ними"""
+
+    on_read = None
+
+    def get_post_by_id(self, id_, session=None):
+        post = super().get_post_by_id(id_, session=session)
+        hook, self.on_read = self.on_read, None
+        if hook is not None:
+            hook()
+        return post
+
+
+def test_read_racing_with_update_does_not_cache_stale_post():
+    inner = _InterleavedReadRepository(db_manager)
+    second_tier = LocalCacheTier()
+    repository = CachedPostRepository(inner, LRUCache(100, 60), second_tier)
+    post = _create_post(repository)
+
+    def concurrent_update():
+        post.title = "Updated during read"
+        post.updated_at = datetime.now()
+        repository.update_post(post)
+
+    inner.on_read = concurrent_update
+    # Читатель получил версию до изменения, но в кэш ее не кладет
+    assert repository.get_post_by_id(post.id_).title == "Cached post"
+
+    assert repository.get_post_version(post.id_).updated_at == post.updated_at
+    assert repository.get_post_by_id(post.id_).title == "Updated during read"
+    assert second_tier.get(post.id_).title == "Updated during read"
+    assert repository.stats()["stale_fills_skipped"] == 1
@@ -0,0 +1,154 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, fastapi_app, post_repository
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.storage.postgres.aio import AsyncPostRepository
+from app.storage.postgres.db import AsyncDatabaseManager
+
+client = TestClient(fastapi_app)
+
+
+@pytest.fixture
+def window():
+    """Посты в собственном интервале дат в прошлом: выгрузка не видит посты других тестов,
+    а начало ленты, на которое рассчитывают другие тесты, не меняется"""
+    start = datetime(1800, 1, 1) + timedelta(days=random.randint(0, 50_000))
+    tag = PostTag(uuid.uuid4(), f"export-{uuid.uuid4().hex}")
+    posts = [
+        Post(
+            uuid.uuid4(),
+            f"Export {i}",
+            'Body, with "quotes"\nand a newline',
+            "draft" if i % 2 else "public",
+            start + timedelta(minutes=i),
+            start,
+            [tag] if i % 3 == 0 else [],
+        )
+        for i in range(7)
+    ]
+    post_repository.bulk_create_posts(posts)
+    # bulk_create_posts заменяет теги постов тегами с настоящими ID
+    tag = posts[0].tags[0]
+
+    return {
+        "created_after": start.isoformat(),
+        "created_before": (start + timedelta(days=1)).isoformat(),
+        "posts": posts,
+        "tag": tag,
+    }
+
+
+def _ndjson(params: dict) -> list[dict]:
+    r = client.get("/post/export", params=params)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def test_export_ndjson_streams_posts_from_old_to_new(window):
+    filters = {key: window[key] for key in ("created_after", "created_before")}
+    records = _ndjson(filters)
+
+    assert [record["id_"] for record in records] == [str(post.id_) for post in window["posts"]]
+    assert records[0]["tags"] == [{"id_": str(window["tag"].id_), "name": window["tag"].name}]
+    assert records[1]["body"] == window["posts"][1].body
+
+    public = _ndjson({**filters, "status": "public"})
+    assert [record["title"] for record in public] == [f"Export {i}" for i in (0, 2, 4, 6)]
+
+
+def test_export_resumes_after_cursor(window):
+    filters = {key: window[key] for key in ("created_after", "created_before")}
+    records = _ndjson(filters)
+
+    resumed = _ndjson({**filters, "cursor": records[2]["cursor"]})
+
+    assert [record["id_"] for record in resumed] == [record["id_"] for record in records[3:]]
+
+
+def test_export_csv(window):
+    filters = {key: window[key] for key in ("created_after", "created_before")}
+    r = client.get("/post/export", params={**filters, "format": "csv"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["id"] for row in rows] == [str(post.id_) for post in window["posts"]]
+    assert rows[1]["body"] == window["posts"][1].body
+    assert json.loads(rows[0]["tags"]) == [window["tag"].name]
+
+
+def test_export_csv_without_posts_has_header():
+    r = client.get(
+        "/post/export",
+        params={"format": "csv", "created_after": "2999-01-01T00:00:00", "status": "archive"},
+    )
+    assert r.text.strip() == "id,title,body,status,created_at,updated_at,tags,cursor"
+
+
+def test_export_rejects_bad_parameters():
+    assert client.get("/post/export", params={"status": "unknown"}).status_code == 400
+    assert client.get("/post/export", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/post/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_uses_server_side_cursor(window):
+    cursor_names = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "ORDER BY posts.created_at, posts.id" in statement:
+            cursor_names.append(cursor.name)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        batches = list(
+            post_repository.export_posts(
+                batch_size=2,
+                created_after=datetime.fromisoformat(window["created_after"]),
+                created_before=datetime.fromisoformat(window["created_before"]),
+            )
+        )
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert [len(batch) for batch in batches] == [2, 2, 2, 1]
+    assert len(cursor_names) == 1 and cursor_names[0] is not None
+
+
+def test_export_with_async_backend(window):
+    async def scenario():
+        async_db_manager = AsyncDatabaseManager()
+        async_db_manager.initialize(
+            os.getenv("DB_HOST", "postgres"),
+            int(os.getenv("DB_PORT", "5432")),
+            os.getenv("DB_NAME"),
+            os.getenv("DB_USER"),
+            os.getenv("DB_PASSWORD"),
+        )
+        repository = AsyncPostRepository(post_repository, async_db_manager)
+        try:
+            return [
+                post.id_
+                async for batch in repository.export_posts(
+                    batch_size=3,
+                    created_after=datetime.fromisoformat(window["created_after"]),
+                    created_before=datetime.fromisoformat(window["created_before"]),
+                )
+                for post in batch
+            ]
+        finally:
+            await async_db_manager.dispose()
+
+    assert asyncio.run(scenario()) == [post.id_ for post in window["posts"]]
@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app
+
+client = TestClient(fastapi_app)
+
+
+def test_list_posts_cursor_walks_newest_first_without_duplicates():
+    created = []
+    for i in range(3):
+        response = client.post("/post", json={"title": f"Paged post {i}", "body": "Body"})
+        assert response.status_code == 200
+        created.append(response.json()["id"])
+
+    first = client.get("/post", params={"limit": 2})
+    assert first.status_code == 200
+    assert [post["id_"] for post in first.json()] == created[::-1][:2]
+
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/post", params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    assert second.json()[0]["id_"] == created[0]
+
+
+def test_list_posts_page_size_is_capped():
+    r = client.get("/post", params={"limit": 1000})
+    assert r.status_code == 422
+
+
+def test_list_posts_invalid_cursor():
+    r = client.get("/post", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
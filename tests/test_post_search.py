@@ -0,0 +1,55 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app
+
+client = TestClient(fastapi_app)
+
+
+def _create(title: str, body: str) -> str:
+    response = client.post("/post", json={"title": title, "body": body})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_search_matches_title_and_body_and_ranks_title_higher():
+    word = f"zq{uuid.uuid4().hex[:10]}"
+    in_body = _create("Unrelated title", f"Somewhere in the body: {word}")
+    in_title = _create(f"About {word}", "Plain body")
+    _create("Other post", "Nothing to see here")
+
+    r = client.get("/post/search", params={"q": word})
+    assert r.status_code == 200
+    assert [post["id_"] for post in r.json()] == [in_title, in_body]
+
+
+def test_search_cursor_walks_all_results_once():
+    word = f"zq{uuid.uuid4().hex[:10]}"
+    created = {_create(f"Post {i}", f"{word} body {i}") for i in range(5)}
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": word, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/post/search", params=params)
+        assert r.status_code == 200
+        seen.extend(post["id_"] for post in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(created)
+    assert set(seen) == created
+
+
+def test_search_requires_query():
+    assert client.get("/post/search").status_code == 422
+    assert client.get("/post/search", params={"q": "   "}).status_code == 400
+
+
+def test_search_invalid_cursor():
+    r = client.get("/post/search", params={"q": "post", "cursor": "not-a-cursor"})
+    assert r.status_code == 400
@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app, post_repository
+from app.domain.models.post import Post
+from app.storage.postgres import post as postgres_post
+
+client = TestClient(fastapi_app)
+
+
+def _create_posts(count: int, status: str, created_at: datetime) -> list[uuid.UUID]:
+    posts = [
+        Post(uuid.uuid4(), f"Moderation {i}", "Body", status, created_at, created_at)
+        for i in range(count)
+    ]
+    post_repository.bulk_create_posts(posts)
+    return [post.id_ for post in posts]
+
+
+def test_change_status_by_ids_reports_each_id():
+    ids = _create_posts(2, "on_moderation", datetime.now())
+    missing = uuid.uuid4()
+
+    r = client.put(
+        "/post/status", json={"status": "public", "ids": [str(ids[0]), str(missing), str(ids[1])]}
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["updated"], body["failed"]) == (2, 1)
+    assert [item["error"] for item in body["items"]] == [None, "Post not found", None]
+    assert client.get(f"/post/{ids[0]}").json()["status"] == "public"
+
+
+def test_change_status_by_filter_in_chunks(monkeypatch):
+    monkeypatch.setattr(postgres_post, "BULK_UPDATE_CHUNK_SIZE", 2)
+    # Посты из далекого прошлого, чтобы фильтр не задел посты других тестов
+    created_at = datetime(1990, 1, 1, 0, 0, uuid.uuid4().int % 60)
+    ids = _create_posts(5, "on_moderation", created_at)
+    filter_ = {
+        "status": "on_moderation",
+        "created_after": created_at.isoformat(),
+        "created_before": created_at.isoformat(),
+    }
+
+    first = client.put("/post/status", json={"status": "archive", "filter": filter_, "limit": 3})
+    assert first.json()["updated"] == 3
+
+    second = client.put("/post/status", json={"status": "archive", "filter": filter_})
+    assert second.json()["updated"] == 2
+
+    changed = {item["id"] for item in first.json()["items"] + second.json()["items"]}
+    assert changed == {str(id_) for id_ in ids}
+
+
+def test_change_status_validates_request():
+    assert client.put("/post/status", json={"status": "bogus", "ids": []}).status_code == 400
+    assert client.put("/post/status", json={"status": "public"}).status_code == 400
+    assert client.put("/post/status", json={"status": "public", "ids": ["x"]}).status_code == 400
+    r = client.put("/post/status", json={"status": "public", "filter": {"title": "x"}})
+    assert r.status_code == 400
@@ -0,0 +1,71 @@
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, fastapi_app, post_repository, post_tags_repository
+
+client = TestClient(fastapi_app)
+
+
+def _create_post() -> str:
+    response = client.post("/post", json={"title": "Moderated post", "body": "Body"})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_publish_returns_updated_post():
+    id_ = _create_post()
+    tag = post_tags_repository.get_or_create_post_tag(f"moderated-{uuid.uuid4().hex}")
+    client.post(f"/post/{id_}/tags", json={"tag_ids": [str(tag.id_)]})
+
+    r = client.put(f"/post/{id_}/publish")
+    assert r.status_code == 200
+    assert r.json()["status"] == "public"
+    assert [t["name"] for t in r.json()["tags"]] == [tag.name]
+    assert client.get(f"/post/{id_}").json()["status"] == "public"
+
+
+def test_status_change_updates_without_reading_first():
+    id_ = uuid.UUID(_create_post())
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        post_repository.update_post_fields(id_, {"status": "archive", "updated_at": datetime.now()})
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+    # Пост не читается перед UPDATE; теги читаются после него
+    assert len(statements) == 2
+    assert statements[0].startswith("UPDATE posts")
+    assert "posts_tags" in statements[1]
+
+
+def test_stale_updated_at_is_a_conflict():
+    id_ = _create_post()
+    published = client.put(f"/post/{id_}/publish").json()
+
+    fresh = client.put(
+        f"/post/{id_}/archive", params={"expected_updated_at": published["updated_at"]}
+    )
+    assert fresh.status_code == 200
+
+    stale = client.put(
+        f"/post/{id_}/publish", params={"expected_updated_at": published["updated_at"]}
+    )
+    assert stale.status_code == 409
+    assert stale.json()["error"] == {
+        "code": "conflict",
+        "message": "Post was modified concurrently",
+    }
+    assert client.get(f"/post/{id_}").json()["status"] == "archive"
+
+
+def test_missing_post_is_not_found():
+    r = client.put(f"/post/{uuid.uuid4()}/archive", params={"expected_updated_at": datetime.now()})
+    assert r.status_code == 404
@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, fastapi_app, post_tags_service
+from app.domain.models.post_tag import PostTag
+from app.domain.services.post_tag import PostTagService
+from app.domain.services.tag_index import TagNameIndex
+from app.storage.memory.post_tag import PostTagRepository as MemoryPostTagRepository
+from app.storage.memory.store import MemoryStore
+from app.storage.postgres.aio import AsyncPostTagRepository
+
+client = TestClient(fastapi_app)
+
+
+def _unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex}"
+
+
+def test_post_tag_crud():
+    name = _unique("crud")
+
+    r = client.post("/post_tag", json={"name": name})
+    assert r.status_code == 200
+    tag_id = r.json()["id"]
+
+    r = client.get(f"/post_tag/{tag_id}")
+    assert r.status_code == 200
+    assert r.json()["name"] == name
+
+    renamed = _unique("renamed")
+    r = client.put(f"/post_tag/{tag_id}", json={"name": renamed})
+    assert r.status_code == 200
+    assert client.get(f"/post_tag/{tag_id}").json()["name"] == renamed
+
+    r = client.delete(f"/post_tag/{tag_id}")
+    assert r.status_code == 200
+    assert client.get(f"/post_tag/{tag_id}").status_code == 404
+
+
+def test_duplicate_name_is_conflict():
+    name = _unique("duplicate")
+    assert client.post("/post_tag", json={"name": name}).status_code == 200
+
+    r = client.post("/post_tag", json={"name": name})
+    assert r.status_code == 409
+    assert r.json()["error"] == {"code": "already_exists", "message": "PostTag already exists"}
+
+
+def test_invalid_name_is_rejected():
+    assert client.post("/post_tag", json={"name": "  "}).status_code == 400
+    assert client.post("/post_tag", json={"name": "x" * 101}).status_code == 400
+    assert client.post("/post_tag", json=["name"]).status_code == 400
+
+
+def test_suggest_follows_create_rename_and_delete():
+    prefix = _unique("suggest")
+    ids = [client.post("/post_tag", json={"name": f"{prefix}-{i}"}).json()["id"] for i in range(3)]
+
+    r = client.get("/post_tag/suggest", params={"prefix": prefix.upper(), "limit": 2})
+    assert r.status_code == 200
+    assert [tag["name"] for tag in r.json()] == [f"{prefix}-0", f"{prefix}-1"]
+
+    client.put(f"/post_tag/{ids[0]}", json={"name": _unique("moved")})
+    client.delete(f"/post_tag/{ids[1]}")
+
+    r = client.get("/post_tag/suggest", params={"prefix": prefix})
+    assert [tag["name"] for tag in r.json()] == [f"{prefix}-2"]
+
+
+def test_suggest_does_not_query_database_when_index_is_fresh():
+    client.get("/post_tag/suggest", params={"prefix": "warmup"})
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for prefix in ("a", "ab", "abc"):
+            assert client.get("/post_tag/suggest", params={"prefix": prefix}).status_code == 200
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert statements == []
+    assert not post_tags_service.tag_index.stale
+
+
+def test_tag_name_index_reloads_after_ttl():
+    now = [0.0]
+    index = TagNameIndex(ttl_seconds=10, clock=lambda: now[0])
+    assert index.stale
+
+    tags = [PostTag(uuid.uuid4(), name) for name in ("Beta", "alpha", "alphabet", "gamma")]
+    index.load(tags)
+    assert not index.stale
+    assert [tag.name for tag in index.suggest("ALP", 10)] == ["alpha", "alphabet"]
+    assert index.suggest("zeta", 10) == []
+
+    index.remove(tags[1].id_)
+    assert [tag.name for tag in index.suggest("alp", 10)] == ["alphabet"]
+    assert len(index) == 3
+
+    now[0] = 10
+    assert index.stale
+
+
+class _InterleavedListRepository(MemoryPostTagRepository):
+    """Вызывает `on_list` после чтения списка тегов, до его возврата в сервис"""
+
+    on_list = None
+
+    def list_post_tags_by_filters(self, *args, **kwargs):
+        tags = super().list_post_tags_by_filters(*args, **kwargs)
+        if self.on_list is not None:
+            self.on_list()
+        return tags
+
+
+def test_index_reload_keeps_tags_changed_during_fetch():
+    repository = _InterleavedListRepository(MemoryStore())
+    index = TagNameIndex()
+    service = PostTagService(AsyncPostTagRepository(repository), index)
+    renamed, deleted = PostTag(uuid.uuid4(), "tag-old"), PostTag(uuid.uuid4(), "tag-deleted")
+    repository.create_post_tag(renamed)
+    repository.create_post_tag(deleted)
+    created = PostTag(uuid.uuid4(), "tag-created")
+
+    def concurrent_changes():
+        # Другой запрос меняет теги после снимка: так делают методы сервиса
+        repository.on_list = None
+        repository.create_post_tag(created)
+        index.put(created)
+        repository.update_post_tag(PostTag(renamed.id_, "tag-new"))
+        index.put(PostTag(renamed.id_, "tag-new"))
+        repository.delete_post_tag_by_id(deleted.id_)
+        index.remove(deleted.id_)
+
+    repository.on_list = concurrent_changes
+    suggested = asyncio.run(service.suggest_post_tags("tag-"))
+
+    assert [tag.name for tag in suggested] == ["tag-created", "tag-new"]
+    assert not index.stale
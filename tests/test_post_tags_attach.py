@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, fastapi_app, post_repository, post_tags_repository
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+
+client = TestClient(fastapi_app)
+
+
+def _create_post_and_tags(count: int) -> tuple[Post, list[PostTag]]:
+    now = datetime.now()
+    post = Post(uuid.uuid4(), "Tagged via API", "Body", "draft", now, now)
+    post_repository.create_post(post)
+
+    tags = [PostTag(uuid.uuid4(), f"attach-{uuid.uuid4().hex}") for _ in range(count)]
+    for tag in tags:
+        post_tags_repository.create_post_tag(tag)
+
+    return post, tags
+
+
+def _tag_names(post_id) -> set:
+    return {tag["name"] for tag in client.get(f"/post/{post_id}").json()["tags"]}
+
+
+def test_attach_and_detach_tags():
+    post, tags = _create_post_and_tags(3)
+
+    r = client.post(f"/post/{post.id_}/tags", json={"tag_ids": [str(tag.id_) for tag in tags]})
+    assert r.status_code == 200
+    assert _tag_names(post.id_) == {tag.name for tag in tags}
+
+    # Повторная привязка не ошибка
+    r = client.post(f"/post/{post.id_}/tags", json={"tag_ids": [str(tags[0].id_)]})
+    assert r.status_code == 200
+
+    r = client.delete(
+        f"/post/{post.id_}/tags", params={"tag_id": [str(tags[0].id_), str(tags[1].id_)]}
+    )
+    assert r.status_code == 200
+    assert _tag_names(post.id_) == {tags[2].name}
+
+
+def test_attach_is_one_check_and_one_insert():
+    post, tags = _create_post_and_tags(5)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        post_repository.attach_tags(post.id_, [tag.id_ for tag in tags])
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(statements) == 2
+    assert statements[1].startswith("INSERT INTO posts_tags")
+
+
+def test_unknown_post_or_tag_is_not_found_and_changes_nothing():
+    post, tags = _create_post_and_tags(1)
+
+    r = client.post(
+        f"/post/{post.id_}/tags", json={"tag_ids": [str(tags[0].id_), str(uuid.uuid4())]}
+    )
+    assert r.status_code == 404
+    assert _tag_names(post.id_) == set()
+
+    r = client.post(f"/post/{uuid.uuid4()}/tags", json={"tag_ids": [str(tags[0].id_)]})
+    assert r.status_code == 404
+
+
+def test_attach_validates_body():
+    post, _ = _create_post_and_tags(0)
+
+    assert client.post(f"/post/{post.id_}/tags", json={"tag_ids": []}).status_code == 400
+    assert client.post(f"/post/{post.id_}/tags", json={"tag_ids": ["x"]}).status_code == 400
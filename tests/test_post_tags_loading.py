@@ -0,0 +1,59 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager, post_repository, post_tags_repository
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _create_tagged_post(tags: list[PostTag]) -> Post:
+    now = datetime.now()
+    post = Post(uuid.uuid4(), "Tagged post", "Body", "draft", now, now)
+    post_repository.create_post(post)
+    post_repository.add_tags(post.id_, tags)
+    return post
+
+
+def test_list_posts_loads_tags_in_one_batched_query():
+    tags = [PostTag(uuid.uuid4(), f"tag-{uuid.uuid4().hex}") for _ in range(3)]
+    for tag in tags:
+        post_tags_repository.create_post_tag(tag)
+
+    created = [_create_tagged_post(tags[: i + 1]) for i in range(3)]
+
+    with count_statements() as statements:
+        page = post_repository.list_posts_page(limit=50)
+
+    # Один запрос за постами страницы и один за тегами всех этих постов
+    assert len(statements) == 2
+
+    tags_by_post = {post.id_: {tag.name for tag in post.tags} for post in page.items}
+    for i, post in enumerate(created):
+        assert tags_by_post[post.id_] == {tag.name for tag in tags[: i + 1]}
+
+
+def test_get_post_by_id_returns_tags():
+    tag = PostTag(uuid.uuid4(), f"tag-{uuid.uuid4().hex}")
+    post_tags_repository.create_post_tag(tag)
+    post = _create_tagged_post([tag])
+
+    loaded = post_repository.get_post_by_id(post.id_)
+
+    assert [t.name for t in loaded.tags] == [tag.name]
@@ -0,0 +1,65 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cmd.public_api import fastapi_app
+from app.domain.models.post import Post
+from app.domain.models.post_tag import PostTag
+from app.transport.rest.fast_api.common.responses import DomainJSONResponse, dumps
+
+client = TestClient(fastapi_app)
+
+
+def _post(tags) -> Post:
+    return Post(
+        uuid.uuid4(),
+        "Заголовок",
+        'Текст с "кавычками"',
+        "draft",
+        datetime(2025, 1, 2, 3, 4, 5, 678901),
+        datetime(2025, 1, 2, 3, 4, 6, tzinfo=timezone.utc),
+        tags,
+    )
+
+
+def test_domain_objects_encode_with_schemas():
+    tag = PostTag(uuid.uuid4(), "тег")
+    post = _post([tag])
+    content = [post, _post(None), {"nested": _post([])}]
+
+    encoded = json.loads(DomainJSONResponse(content).body)
+
+    assert encoded[0] == {
+        "id_": str(post.id_),
+        "title": "Заголовок",
+        "body": 'Текст с "кавычками"',
+        "status": "draft",
+        "created_at": "2025-01-02T03:04:05.678901",
+        "updated_at": "2025-01-02T03:04:06+00:00",
+        "tags": [{"id_": str(tag.id_), "name": "тег"}],
+    }
+    assert encoded[1]["tags"] is None
+    assert encoded[2]["nested"]["tags"] == []
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+def test_post_endpoints_use_domain_response():
+    post_id = client.post("/post", json={"title": "Encoded", "body": "Body"}).json()["id"]
+
+    r = client.get(f"/post/{post_id}")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.json()["id_"] == post_id
+    assert r.json()["tags"] == []
+
+    r = client.get("/post", params={"limit": 1})
+    assert r.status_code == 200
+    assert "X-Next-Cursor" in r.headers
+    assert len(r.json()) == 1
@@ -0,0 +1,92 @@
+import logging
+import re
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.cmd.public_api import db_manager, fastapi_app, post_repository
+from app.domain.models.post import Post
+from app.storage.postgres.instrumentation import SQLInstrumentation, normalize_sql, track_queries
+
+
+def test_server_timing_header_reports_db_queries():
+    r = TestClient(fastapi_app).get("/post", params={"limit": 5})
+    assert r.status_code == 200
+
+    match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', r.headers["Server-Timing"])
+    assert match is not None
+    assert int(match.group(2)) >= 1
+    assert "total;dur=" in r.headers["Server-Timing"]
+
+
+def test_full_default_page_keeps_server_timing():
+    now = datetime.now()
+    post_repository.bulk_create_posts(
+        [Post(uuid.uuid4(), f"Timed {i}", "Body", "public", now, now) for i in range(50)]
+    )
+
+    r = TestClient(fastapi_app).get("/post")
+    assert r.status_code == 200
+    assert len(r.json()) == 50
+    assert "Content-Length" in r.headers
+    assert 'desc="' in r.headers["Server-Timing"]
+
+
+def test_request_log_line_uses_route_template(caplog):
+    with caplog.at_level(logging.INFO, logger="app.sql.requests"):
+        TestClient(fastapi_app).get("/post/00000000-0000-0000-0000-000000000000")
+
+    assert any("route=/post/{id_}" in record.getMessage() for record in caplog.records)
+
+
+def test_slow_queries_are_logged_with_normalized_sql_and_route(caplog):
+    engine = db_manager.engine
+    instrumentation = SQLInstrumentation(slow_query_threshold_ms=0)
+    instrumentation.attach(engine)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            with track_queries("GET /test") as stats:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT   :a,\n :b"), {"a": 1, "b": 2})
+    finally:
+        instrumentation.detach(engine)
+
+    assert stats.count >= 1
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("route=GET /test" in m and "sql=SELECT ..." in m for m in messages)
+
+
+def test_normalize_sql_collapses_parameters_and_rows():
+    assert normalize_sql("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == (
+        "SELECT * FROM t WHERE id IN (...)"
+    )
+    assert normalize_sql("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)") == (
+        "INSERT INTO t (a, b) VALUES (...), ..."
+    )
+
+
+def test_slow_queries_of_requests_are_labelled_with_route_template(caplog):
+    engine = db_manager.engine
+    instrumentation = SQLInstrumentation(slow_query_threshold_ms=0)
+    instrumentation.attach(engine)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            TestClient(fastapi_app).get("/post/00000000-0000-0000-0000-000000000000")
+    finally:
+        instrumentation.detach(engine)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.sql.slow"]
+    assert messages and all("route=GET /post/{id_} " in m for m in messages)
+
+
+def test_streaming_response_is_logged_after_body_without_server_timing(caplog):
+    with caplog.at_level(logging.INFO, logger="app.sql.requests"):
+        r = TestClient(fastapi_app).get("/post/export", params={"status": "public"})
+
+    assert r.status_code == 200
+    assert "Server-Timing" not in r.headers
+    lines = [m.getMessage() for m in caplog.records if "route=/post/export" in m.getMessage()]
+    assert len(lines) == 1
+    assert int(re.search(r"db_queries=(\d+)", lines[0]).group(1)) >= 1
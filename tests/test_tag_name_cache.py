@@ -0,0 +1,112 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.cmd.public_api import db_manager
+from app.domain.models.post_tag import PostTag
+from app.storage.cache.lru import LRUCache
+from app.storage.cache.post_tag import CachedPostTagRepository
+from app.storage.postgres.post_tag import PostTagRepository
+
+repository = PostTagRepository(db_manager)
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_manager.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _names(count: int) -> list[str]:
+    prefix = uuid.uuid4().hex
+    return [f"cache-{prefix}-{i}" for i in range(count)]
+
+
+def _cached_repository() -> CachedPostTagRepository:
+    return CachedPostTagRepository(repository, LRUCache(max_size=1000, ttl_seconds=60))
+
+
+def test_get_or_create_post_tags_is_at_most_two_statements():
+    existing = PostTag(uuid.uuid4(), _names(1)[0])
+    repository.create_post_tag(existing)
+    names = _names(20)
+
+    with count_statements() as statements:
+        tags = repository.get_or_create_post_tags([existing.name, *names, names[0]])
+
+    assert len(statements) == 2
+    assert [tag.name for tag in tags] == [existing.name, *names]
+    assert tags[0].id_ == existing.id_
+    assert repository.get_post_tag_by_name(names[5]).id_ == tags[6].id_
+
+
+def test_cached_names_cost_no_statements():
+    cached = _cached_repository()
+    names = _names(5)
+    created = cached.get_or_create_post_tags(names)
+
+    with count_statements() as statements:
+        again = cached.get_or_create_post_tags(list(reversed(names)))
+
+    assert statements == []
+    assert [tag.id_ for tag in again] == [tag.id_ for tag in reversed(created)]
+
+
+def test_concurrent_creation_returns_one_tag():
+    name = _names(1)[0]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tags = list(executor.map(lambda _: repository.get_or_create_post_tag(name), range(16)))
+
+    assert len({tag.id_ for tag in tags}) == 1
+
+
+def test_tags_created_in_rolled_back_transaction_are_not_cached():
+    cached = _cached_repository()
+    name = _names(1)[0]
+
+    with pytest.raises(RuntimeError):
+        with db_manager.transaction() as session:
+            cached.get_or_create_post_tags([name], session)
+            raise RuntimeError("rollback")
+
+    assert repository.get_post_tag_by_name(name) is None
+    tag = cached.get_or_create_post_tags([name])[0]
+    assert repository.get_post_tag_by_name(name).id_ == tag.id_
+
+
+def test_rename_and_delete_evict_old_name():
+    cached = _cached_repository()
+    renamed, deleted = _names(2)
+    renamed_tag, deleted_tag = cached.get_or_create_post_tags([renamed, deleted])
+
+    cached.update_post_tag(PostTag(renamed_tag.id_, f"{renamed}-new"))
+    cached.delete_post_tag_by_id(deleted_tag.id_)
+
+    assert cached.get_or_create_post_tags([renamed])[0].id_ != renamed_tag.id_
+    assert cached.get_or_create_post_tags([deleted])[0].id_ != deleted_tag.id_
+
+
+def test_rename_reads_old_name_in_the_write_transaction():
+    cached = _cached_repository()
+    name = _names(1)[0]
+    tag = cached.get_or_create_post_tags([name])[0]
+
+    with count_statements() as statements:
+        change = cached.update_post_tag(PostTag(tag.id_, f"{name}-new"))
+
+    # Единственное чтение тега — с блокировкой строки в транзакции записи
+    reads = [s for s in statements if s.startswith("SELECT") and "FROM post_tags" in s]
+    assert len(reads) == 1 and "FOR UPDATE" in reads[0]
+    assert change.old_name == name